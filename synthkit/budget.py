@@ -0,0 +1,232 @@
+"""Request, token and spend budgets enforced on every model call of a run."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .config import BudgetLimits, BudgetSettings, ForgeConfig, ModelRef
+from .models.client_base import ChatClient
+from .models.pricing import approx_tokens, token_cost
+from .progress import current_stage
+
+logger = logging.getLogger(__name__)
+
+SOFT_ACTIONS = ("none", "throttle", "degrade")
+
+_ACTIVE: ContextVar[Optional["BudgetLedger"]] = ContextVar("synthkit_budget", default=None)
+
+
+class BudgetExceeded(RuntimeError):
+    """Raised before a request once a hard budget is spent; stages stop at a checkpoint."""
+
+    def __init__(self, scope: str, dimension: str, limit: float, used: float):
+        self.scope = scope
+        self.dimension = dimension
+        self.limit = limit
+        self.used = used
+        super().__init__(f"{scope} budget exhausted: {dimension} {used:g} of {limit:g}")
+
+
+@dataclass
+class Usage:
+    requests: int = 0
+    tokens: int = 0
+    cost: float = 0.0
+
+    def share_of(self, limits: BudgetLimits) -> List[Tuple[str, float, float]]:
+        """Return ``(dimension, used, limit)`` for each limit that is set."""
+        pairs = [
+            ("requests", self.requests, limits.max_requests),
+            ("tokens", self.tokens, limits.max_tokens),
+            ("cost", self.cost, limits.max_cost),
+        ]
+        return [(name, used, limit) for name, used, limit in pairs if limit is not None]
+
+
+class BudgetLedger:
+    """Account usage per run and per stage and decide what the next request may do.
+
+    Usage is counted after each request from the prompt and completion
+    lengths (see :func:`approx_tokens`) and priced with the provider's
+    ``prices``, so a run can overshoot a hard limit by at most the requests in
+    flight. Past ``soft_limit`` of any limit, ``soft_action`` either delays
+    requests (``throttle``) or routes them to ``fallback_models``
+    (``degrade``). The ledger lives in one process: every ``synthkit worker``
+    keeps its own, so run limits apply per worker.
+    """
+
+    def __init__(self, cfg: ForgeConfig):
+        settings = cfg.budget
+        if settings.soft_action not in SOFT_ACTIONS:
+            raise ValueError(
+                f"Unknown budget soft_action '{settings.soft_action}'. Available: {', '.join(SOFT_ACTIONS)}"
+            )
+        if not 0 < settings.soft_limit <= 1:
+            raise ValueError(f"budget soft_limit must be in (0, 1], got {settings.soft_limit}")
+        self.cfg = cfg
+        self.settings: BudgetSettings = settings
+        self.run = Usage()
+        self.stages: Dict[str, Usage] = {}
+        self.degraded = 0
+        self.throttled_seconds = 0.0
+        self._lock = threading.Lock()
+        self._warned: set = set()
+
+    @property
+    def enabled(self) -> bool:
+        return any(
+            limits.max_requests is not None
+            or limits.max_tokens is not None
+            or limits.max_cost is not None
+            for limits in [self.settings, *self.settings.stages.values()]
+        )
+
+    def _scopes(self, stage: Optional[str]) -> List[Tuple[str, Usage, BudgetLimits]]:
+        scopes = [("run", self.run, self.settings)]
+        if stage is not None and stage in self.settings.stages:
+            scopes.append((stage, self.stages.setdefault(stage, Usage()), self.settings.stages[stage]))
+        return scopes
+
+    def _pressure(self, stage: Optional[str]) -> float:
+        """Highest share of any applicable limit used so far; raises once one is spent."""
+        pressure = 0.0
+        with self._lock:
+            for scope, usage, limits in self._scopes(stage):
+                for dimension, used, limit in usage.share_of(limits):
+                    if used >= limit:
+                        raise BudgetExceeded(scope, dimension, limit, used)
+                    pressure = max(pressure, used / limit if limit else 1.0)
+        return pressure
+
+    def before_request(self, stage: Optional[str], ref: ModelRef) -> ModelRef:
+        """Apply the soft action if needed and return the model the request should use."""
+        pressure = self._pressure(stage)
+        soft = self.settings.soft_limit
+        if pressure < soft or self.settings.soft_action == "none":
+            return ref
+        if self.settings.soft_action == "throttle":
+            span = 1 - soft
+            delay = self.settings.throttle_seconds * ((pressure - soft) / span if span else 1.0)
+            self._warn_once("throttle", "Budget %.0f%% used; throttling requests", pressure * 100)
+            with self._lock:
+                self.throttled_seconds += delay
+            time.sleep(delay)
+            return ref
+        fallback = self.settings.fallback_models.get(ref.key)
+        if fallback is None:
+            return ref
+        self._warn_once(
+            ref.key, "Budget %.0f%% used; routing %s to %s", pressure * 100, ref.key, fallback.key
+        )
+        with self._lock:
+            self.degraded += 1
+        return fallback
+
+    def record(self, stage: Optional[str], ref: ModelRef, input_tokens: int, output_tokens: int) -> None:
+        cost = token_cost(self.cfg, ref, input_tokens, output_tokens) or 0.0
+        with self._lock:
+            for _, usage, _ in self._scopes(stage):
+                usage.requests += 1
+                usage.tokens += input_tokens + output_tokens
+                usage.cost += cost
+            if stage is not None and stage not in self.settings.stages:
+                usage = self.stages.setdefault(stage, Usage())
+                usage.requests += 1
+                usage.tokens += input_tokens + output_tokens
+                usage.cost += cost
+
+    def _warn_once(self, key: str, message: str, *args: Any) -> None:
+        if key not in self._warned:
+            self._warned.add(key)
+            logger.warning(message, *args)
+
+    def log_summary(self) -> None:
+        logger.info(
+            "Model usage: %s requests, ~%s tokens, cost %.4f (%s degraded, %.1fs throttled)",
+            self.run.requests,
+            self.run.tokens,
+            self.run.cost,
+            self.degraded,
+            self.throttled_seconds,
+        )
+
+
+@contextmanager
+def budget_scope(cfg: ForgeConfig) -> Iterator[BudgetLedger]:
+    """Share one ledger across everything run inside the block, reusing an active one."""
+    active = _ACTIVE.get()
+    if active is not None:
+        yield active
+        return
+    ledger = BudgetLedger(cfg)
+    token = _ACTIVE.set(ledger)
+    try:
+        yield ledger
+    finally:
+        _ACTIVE.reset(token)
+        ledger.log_summary()
+
+
+class BudgetedClient:
+    """Check the active ledger before each request and charge it afterwards.
+
+    ``resolve`` returns the client for a fallback model when the ledger
+    degrades a request; :meth:`answered_by` tells callers such as the verdict
+    cache which model served the calling thread's last request.
+    """
+
+    def __init__(self, client: ChatClient, ref: ModelRef, resolve: Callable[[ModelRef], ChatClient]):
+        self._client = client
+        self._ref = ref
+        self._resolve = resolve
+        self._local = threading.local()
+
+    def answered_by(self) -> ModelRef:
+        """Model that answered this thread's most recent request (the configured one before any)."""
+        return getattr(self._local, "ref", self._ref)
+
+    def _call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        ledger = _ACTIVE.get()
+        if ledger is None or not ledger.enabled:
+            self._local.ref = self._ref
+            return getattr(self._client, method)(*args, **kwargs)
+        progress = current_stage()
+        stage = progress.name if progress is not None else None
+        ref = ledger.before_request(stage, self._ref)
+        client = self._client if ref is self._ref else self._resolve(ref)
+        call = getattr(client, method, None)
+        if call is None:
+            # The fallback lacks this capability; keep the configured model.
+            ref, call = self._ref, getattr(self._client, method)
+        result = call(*args, **kwargs)
+        self._local.ref = ref
+        messages = args[0] if args else kwargs.get("messages", [])
+        text = result[0] if isinstance(result, tuple) else result
+        chars_per_token = ledger.cfg.estimate.chars_per_token
+        ledger.record(
+            stage,
+            ref,
+            sum(approx_tokens(message.content, chars_per_token) for message in messages),
+            approx_tokens(text or "", chars_per_token),
+        )
+        return result
+
+    def chat(self, messages, temperature, max_tokens):
+        return self._call("chat", messages, temperature=temperature, max_tokens=max_tokens)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if name.startswith("chat") and callable(attr):
+            return lambda *args, **kwargs: self._call(name, *args, **kwargs)
+        return attr
+
+    def close(self) -> None:
+        close = getattr(self._client, "close", None)
+        if callable(close):
+            close()
@@ -2,18 +2,20 @@
 
 from __future__ import annotations
 
-from typing import Sequence
+import json
+from typing import Dict, List, Optional, Sequence
 
 import typer
 
-from .config import load_config
+# Only light modules are imported here so that ``--help`` and quick commands
+# start fast; each command imports the pipeline stages it runs.
 from .extensions import available_generator_types, available_formatter_names
 from .logging_config import configure_logging
-from .pipeline.harvest import run_harvest
-from .pipeline.mint import run_mint
-from .pipeline.audit import run_audit
-from .pipeline.package import run_package
-from .pipeline.run_all import run_pipeline
+from .export.dedup import DEDUP_MODES
+from .export.splits import parse_splits
+from .export.validation import VALIDATION_MODES
+from .export.writers import COMPRESSIONS, OUTPUT_FORMATS
+from .pipeline.workqueue import WORKER_STAGES
 
 app = typer.Typer(help="SynthForge - synthetic data generation & curation toolkit")
 
@@ -31,8 +33,32 @@ def _normalize_choice(label: str, value: str, options: Sequence[str]) -> str:
     return normalized
 
 
+def _normalize_choices(label: str, value: str, options: Sequence[str]) -> List[str]:
+    """Validate a comma-separated list of choices, preserving order."""
+    choices: List[str] = []
+    for part in value.split(","):
+        if not part.strip():
+            continue
+        normalized = _normalize_choice(label, part.strip(), options)
+        if normalized not in choices:
+            choices.append(normalized)
+    if not choices:
+        raise typer.BadParameter(f"At least one {label} is required")
+    return choices
+
+
+def _parse_splits_option(value: str) -> Dict[str, float]:
+    try:
+        return dict(parse_splits(value))
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+
+
 def _generator_help() -> str:
-    return f"Generator kind (registered: {_describe_options(available_generator_types())})."
+    return (
+        "Generator kind, or several comma-separated kinds minted in one pass "
+        f"(registered: {_describe_options(available_generator_types())})."
+    )
 
 
 def _formatter_help() -> str:
@@ -42,6 +68,26 @@ def _formatter_help() -> str:
 GENERATOR_DEFAULT = (available_generator_types()[0] if available_generator_types() else "qa")
 FORMATTER_DEFAULT = (available_formatter_names()[0] if available_formatter_names() else "alpaca")
 
+def _check_sample_fraction(value: Optional[float]) -> Optional[float]:
+    # FloatRange cannot exclude 0 on this typer version; a zero fraction samples nothing.
+    if value is not None and value <= 0.0:
+        raise typer.BadParameter(f"must be greater than 0, got {value}")
+    return value
+
+
+SAMPLE_FRACTION_OPTION = typer.Option(
+    None,
+    "--sample-fraction",
+    min=0.0,
+    max=1.0,
+    callback=_check_sample_fraction,
+    help="Mint only this fraction of chunks, stratified by file and position (preview runs).",
+)
+SAMPLE_COUNT_OPTION = typer.Option(
+    None, "--sample-count", min=1, help="Mint only this many stratified chunks (preview runs)."
+)
+SEED_OPTION = typer.Option(None, "--seed", help="Seed for chunk sampling (default: generation.sample_seed).")
+
 
 @app.callback()
 def main(
@@ -49,9 +95,13 @@ def main(
     config: str = typer.Option("config/project.yaml", "--config", "-c"),
     log_level: str = typer.Option("DEBUG", "--log-level"),
 ):
-    """Initialize logging and load the project config before running a command."""
+    """Initialize logging, load the project config and start metrics export for the command."""
+    from .config import load_config
+    from .metrics import metrics_scope
+
     configure_logging(log_level)
     ctx.obj = load_config(config)
+    ctx.with_resource(metrics_scope(ctx.obj))
 
 
 @app.command()
@@ -66,6 +116,8 @@ def system_check(ctx: typer.Context):
 @app.command()
 def harvest(ctx: typer.Context):
     """Ingest and normalize raw documents."""
+    from .pipeline.harvest import run_harvest
+
     cfg = ctx.obj
     out = run_harvest(cfg)
     typer.echo(f"Harvested {len(out)} documents.")
@@ -75,19 +127,44 @@ def harvest(ctx: typer.Context):
 def mint(
     ctx: typer.Context,
     kind: str = typer.Option(GENERATOR_DEFAULT, "--kind", help=_generator_help()),
+    target: Optional[int] = typer.Option(
+        None, "--target", min=1, help="Stop once this many curated samples per kind are expected."
+    ),
+    sample_fraction: Optional[float] = SAMPLE_FRACTION_OPTION,
+    sample_count: Optional[int] = SAMPLE_COUNT_OPTION,
+    seed: Optional[int] = SEED_OPTION,
 ):
     """Generate synthetic data from harvested documents."""
+    from .pipeline.mint import run_mint
+
     cfg = ctx.obj
-    normalized_kind = _normalize_choice("generator kind", kind, available_generator_types())
-    out = run_mint(cfg, generator_type=normalized_kind)
+    kinds = _normalize_choices("generator kind", kind, available_generator_types())
+    out = run_mint(
+        cfg,
+        generator_type=kinds,
+        target_curated=target,
+        sample_fraction=sample_fraction,
+        sample_count=sample_count,
+        sample_seed=seed,
+    )
     typer.echo(f"Minted synthetic data into {len(out)} files.")
 
 
 @app.command()
-def audit(ctx: typer.Context):
+def audit(
+    ctx: typer.Context,
+    offline: bool = typer.Option(
+        False, "--offline", help="Re-apply curation.min_score to cached verdicts without LLM calls."
+    ),
+    resume: bool = typer.Option(
+        False, "--resume", help="Skip files and samples already recorded in the audit journal."
+    ),
+):
     """Curate synthetic data using LLM-as-judge."""
+    from .pipeline.audit import run_audit
+
     cfg = ctx.obj
-    out = run_audit(cfg)
+    out = run_audit(cfg, offline=offline, resume=resume)
     typer.echo(f"Audited {len(out)} files.")
 
 
@@ -95,25 +172,247 @@ def audit(ctx: typer.Context):
 def package_cmd(
     ctx: typer.Context,
     fmt: str = typer.Option(FORMATTER_DEFAULT, "--fmt", help=_formatter_help()),
+    shard_records: Optional[int] = typer.Option(
+        None, "--shard-records", min=1, help="Write fixed-size shards of at most this many records."
+    ),
+    shard_bytes: Optional[int] = typer.Option(
+        None,
+        "--shard-bytes",
+        min=1,
+        help="Roll to a new shard once it holds this many uncompressed bytes (JSONL only).",
+    ),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", min=1, help="Processes used to format audited files (default: packaging.workers)."
+    ),
+    output_format: Optional[str] = typer.Option(
+        None,
+        "--output-format",
+        help=f"File format: {', '.join(OUTPUT_FORMATS)} (default: packaging.output_format).",
+    ),
+    compression: Optional[str] = typer.Option(
+        None,
+        "--compression",
+        help=f"Compress JSONL output: {', '.join(COMPRESSIONS)} (default: packaging.compression).",
+    ),
+    dedup: Optional[str] = typer.Option(
+        None,
+        "--dedup",
+        help=f"Corpus-wide dedup by question: {', '.join(DEDUP_MODES)} (default: packaging.dedup).",
+    ),
+    splits: Optional[str] = typer.Option(
+        None,
+        "--splits",
+        help="Deterministic splits such as 'train=0.98,val=0.01,test=0.01' (default: packaging.splits).",
+    ),
+    shuffle: Optional[bool] = typer.Option(
+        None,
+        "--shuffle/--no-shuffle",
+        help="Globally shuffle output with bounded memory (default: packaging.shuffle).",
+    ),
+    shuffle_seed: Optional[int] = typer.Option(
+        None, "--shuffle-seed", help="Seed for --shuffle (default: packaging.shuffle_seed)."
+    ),
+    validate: Optional[str] = typer.Option(
+        None,
+        "--validate",
+        help="Validation: off, schema, or full (schema + sampled LLM review) (default: packaging.validation).",
+    ),
 ):
     """Export curated data into final training formats."""
+    from .pipeline.package import run_package
+
     cfg = ctx.obj
     normalized_fmt = _normalize_choice("format", fmt, available_formatter_names())
-    out = run_package(cfg, fmt=normalized_fmt)
+    out = run_package(
+        cfg,
+        fmt=normalized_fmt,
+        shard_records=shard_records,
+        shard_bytes=shard_bytes,
+        workers=workers,
+        output_format=(
+            _normalize_choice("output format", output_format, OUTPUT_FORMATS)
+            if output_format
+            else None
+        ),
+        compression=(
+            _normalize_choice("compression", compression, COMPRESSIONS) if compression else None
+        ),
+        dedup=_normalize_choice("dedup mode", dedup, DEDUP_MODES) if dedup else None,
+        splits=_parse_splits_option(splits) if splits else None,
+        shuffle=shuffle,
+        shuffle_seed=shuffle_seed,
+        validation=_normalize_choice("validation mode", validate, VALIDATION_MODES) if validate else None,
+    )
     typer.echo(f"Packaged {len(out)} datasets.")
 
 
+@app.command()
+def estimate(
+    ctx: typer.Context,
+    kind: str = typer.Option(GENERATOR_DEFAULT, "--kind", help=_generator_help()),
+    target: Optional[int] = typer.Option(
+        None, "--target", min=1, help="Assume minting stops at this many curated samples per kind."
+    ),
+    sample_fraction: Optional[float] = SAMPLE_FRACTION_OPTION,
+    sample_count: Optional[int] = SAMPLE_COUNT_OPTION,
+    seed: Optional[int] = SEED_OPTION,
+    concurrency: Optional[int] = typer.Option(
+        None,
+        "--concurrency",
+        min=1,
+        help="Parallel workers assumed for wall time (default: estimate.concurrency).",
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print the estimate as JSON."),
+):
+    """Project requests, tokens, cost and wall time without calling any model."""
+    from .pipeline.estimate import estimate_pipeline
+
+    cfg = ctx.obj
+    kinds = _normalize_choices("generator kind", kind, available_generator_types())
+    result = estimate_pipeline(
+        cfg,
+        generator_type=kinds,
+        target_curated=target,
+        sample_fraction=sample_fraction,
+        sample_count=sample_count,
+        sample_seed=seed,
+        concurrency=concurrency,
+    )
+    if as_json:
+        typer.echo(json.dumps(result.as_dict(), indent=2))
+        return
+    typer.echo(f"Documents: {result.documents}  chunks: {result.chunks}  items: {result.items}")
+    for row in result.as_dict()["breakdown"]:
+        cost = "n/a" if row["cost"] is None else f"{row['cost']:.4f}"
+        typer.echo(
+            f"  {row['stage']:<8} {row['role']:<14} {row['model']:<32} "
+            f"{row['requests']:>8} req {row['input_tokens']:>12} in "
+            f"{row['output_tokens']:>10} out  cost {cost}"
+        )
+    if result.cost is None:
+        cost = "n/a (no prices configured)"
+    else:
+        cost = f"{result.cost:.4f}"
+        if None in result.costs:
+            cost += " (priced models only)"
+    typer.echo(
+        f"Total: {result.requests} requests, {result.input_tokens} input tokens, "
+        f"{result.output_tokens} output tokens, cost {cost}"
+    )
+    sources = ", ".join(f"{stage} {source}" for stage, source in result.latency_sources.items())
+    typer.echo(
+        f"Wall time: ~{result.wall_seconds / 3600:.2f} h with concurrency {result.concurrency} "
+        f"(latency: {sources})"
+    )
+
+
+@app.command()
+def worker(
+    ctx: typer.Context,
+    stage: str = typer.Option(..., "--stage", help=f"Stage to work on: {', '.join(WORKER_STAGES)}."),
+    kind: str = typer.Option(GENERATOR_DEFAULT, "--kind", help=_generator_help()),
+    worker_id: Optional[str] = typer.Option(
+        None, "--worker-id", help="Name recorded on leases (default: <hostname>-<pid>)."
+    ),
+    max_items: Optional[int] = typer.Option(
+        None, "--max-items", min=1, help="Stop after processing this many documents."
+    ),
+    idle_timeout: float = typer.Option(
+        0.0, "--idle-timeout", min=0.0, help="Keep polling for new inputs this many seconds once idle."
+    ),
+):
+    """Claim documents from the shared work queue; run several to scale mint or audit."""
+    from .pipeline.worker import run_worker
+
+    cfg = ctx.obj
+    normalized_stage = _normalize_choice("stage", stage, WORKER_STAGES)
+    kinds = _normalize_choices("generator kind", kind, available_generator_types())
+    result = run_worker(
+        cfg,
+        normalized_stage,
+        generator_type=kinds,
+        worker_id=worker_id,
+        max_items=max_items,
+        idle_timeout=idle_timeout,
+    )
+    typer.echo(
+        f"Worker {result.worker_id} completed {result.completed} and failed {result.failed} "
+        f"{normalized_stage} items."
+    )
+    typer.echo("Queue: " + ", ".join(f"{status} {count}" for status, count in result.queue.items()))
+
+
+@app.command(name="export-store")
+def export_store_cmd(ctx: typer.Context):
+    """Write artifacts from io.artifact_store_file back to the per-stage directories."""
+    from .pipeline.store import export_store
+
+    cfg = ctx.obj
+    counts = export_store(cfg)
+    typer.echo(
+        f"Exported {counts['harvested']} harvested, {counts['minted']} minted and "
+        f"{counts['audited']} audited files."
+    )
+
+
 @app.command(name="run-all")
 def run_all(
     ctx: typer.Context,
     kind: str = typer.Option(GENERATOR_DEFAULT, "--kind", help=_generator_help()),
     fmt: str = typer.Option(FORMATTER_DEFAULT, "--fmt", help=_formatter_help()),
+    target: Optional[int] = typer.Option(
+        None, "--target", min=1, help="Stop minting once this many curated samples per kind are expected."
+    ),
+    sample_fraction: Optional[float] = SAMPLE_FRACTION_OPTION,
+    sample_count: Optional[int] = SAMPLE_COUNT_OPTION,
+    seed: Optional[int] = SEED_OPTION,
+    streaming: Optional[bool] = typer.Option(
+        None,
+        "--streaming/--batch",
+        help="Run stages concurrently over bounded queues (default: pipeline.streaming).",
+    ),
+    incremental: Optional[bool] = typer.Option(
+        None,
+        "--incremental/--full",
+        help="Only rebuild artifacts whose inputs changed (default: pipeline.incremental).",
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="List the artifacts an incremental run would rebuild, then exit."
+    ),
 ):
     """Run the full pipeline end-to-end: harvest -> mint -> audit -> package."""
+    from .pipeline.buildgraph import plan_build
+    from .pipeline.run_all import run_pipeline
+
     cfg = ctx.obj
-    normalized_kind = _normalize_choice("generator kind", kind, available_generator_types())
+    kinds = _normalize_choices("generator kind", kind, available_generator_types())
     normalized_fmt = _normalize_choice("format", fmt, available_formatter_names())
-    run_pipeline(cfg, generator_type=normalized_kind, export_fmt=normalized_fmt)
+    if dry_run:
+        plan = plan_build(
+            cfg,
+            kinds,
+            normalized_fmt,
+            target_curated=target,
+            sample_fraction=sample_fraction,
+            sample_count=sample_count,
+            sample_seed=seed,
+        )
+        for stage, names in plan.items():
+            typer.echo(f"{stage}: {len(names)} to rebuild")
+            for name in names:
+                typer.echo(f"  {name}")
+        return
+    run_pipeline(
+        cfg,
+        generator_type=kinds,
+        export_fmt=normalized_fmt,
+        target_curated=target,
+        sample_fraction=sample_fraction,
+        sample_count=sample_count,
+        sample_seed=seed,
+        streaming=streaming,
+        incremental=incremental,
+    )
     typer.echo("Pipeline completed.")
 
 
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 import yaml
 
@@ -16,6 +16,11 @@ class ModelRef:
     name: str              # model name for that provider
     profile: str | None = None  # optional profile name (e.g. "fast", "strong")
 
+    @property
+    def key(self) -> str:
+        """Stable ``provider:name`` identifier used for caching clients and verdicts."""
+        return f"{self.provider}:{self.name}"
+
 
 @dataclass
 class StageModels:
@@ -24,6 +29,7 @@ class StageModels:
     mint_generator: ModelRef
     audit_judge: ModelRef
     package_validator: ModelRef
+    audit_screener: Optional[ModelRef] = None  # enables cascaded judging when set
 
 
 @dataclass
@@ -33,6 +39,8 @@ class PromptSet:
     cot_generation: str
     qa_rating: str
     classifier_generation: str | None = None
+    qa_score: str | None = None  # single-digit rating prompt for curation.judge_mode "score"
+    package_validation: str | None = None  # spot-check prompt for packaging.validation "full"
 
 
 @dataclass
@@ -44,6 +52,43 @@ class GenerationSettings:
     chunk_size: int = 4000
     chunk_overlap: int = 400
     max_pairs_per_doc: int = 500
+    max_items_per_request: int = 8
+    target_curated: Optional[int] = None
+    acceptance_probe_size: int = 16
+    acceptance_prior: float = 0.5
+    acceptance_probe_max_failures: int = 3
+    dedup_scope: str = "off"  # "off" | "document" | "run"
+    dedup_max_distance: int = 3
+    pack_small_docs: bool = False
+    pack_max_doc_chars: int = 1000
+    sample_fraction: Optional[float] = None
+    sample_count: Optional[int] = None
+    sample_seed: int = 0
+
+
+@dataclass
+class PrefilterSettings:
+    """Cheap rule-based checks applied before a sample reaches the LLM judge (opt-in)."""
+
+    enabled: bool = False
+    min_question_chars: int = 8
+    max_question_chars: int = 1000
+    min_answer_chars: int = 2
+    max_answer_chars: int = 8000
+    reject_truncated: bool = True
+    max_qa_similarity: float = 0.8    # word-set Jaccard above which the answer restates the question
+    min_source_overlap: float = 0.3   # share of answer content words found in the source chunk
+    overlap_min_words: int = 5        # skip the overlap rule for very short answers
+    language: Optional[str] = "en"    # None disables the language check
+    min_script_ratio: float = 0.9
+    banned_phrases: List[str] = field(
+        default_factory=lambda: [
+            "as an ai language model",
+            "i cannot answer",
+            "the text does not provide",
+            "not mentioned in the text",
+        ]
+    )
 
 
 @dataclass
@@ -52,6 +97,102 @@ class CurationSettings:
 
     min_score: float = 7.0
     max_tokens: int = 512
+    verdict_cache: bool = True
+    cascade_band: float = 1.0  # screener scores within this distance of min_score escalate
+    judge_mode: str = "full"   # "full" (JSON score/label/reason) | "score" (single digit)
+    score_max_tokens: int = 2
+    score_use_logprobs: bool = True
+    score_top_logprobs: int = 10
+    rationale_for_rejects: bool = False
+    prefilter: PrefilterSettings = field(default_factory=PrefilterSettings)
+
+
+@dataclass
+class PackagingSettings:
+    """Controls for how curated samples are laid out in the packaged directory."""
+
+    shard_max_records: Optional[int] = None  # set either cap to enable sharded output
+    shard_max_bytes: Optional[int] = None
+    shard_prefix: str = "train"
+    workers: int = 1
+    output_format: str = "jsonl"  # "jsonl" | "parquet"
+    compression: Optional[str] = None  # JSONL only: "gzip" | "zstd"
+    compression_level: Optional[int] = None
+    parquet_compression: str = "zstd"
+    parquet_row_group_size: int = 10_000
+    dedup: str = "off"  # "off" | "exact" | "near" (corpus-wide, by normalized question)
+    dedup_backend: str = "memory"  # "memory" | "bloom" | "sqlite"
+    dedup_max_distance: int = 3
+    dedup_capacity: int = 10_000_000  # expected unique samples, sizes the bloom filter
+    dedup_error_rate: float = 1e-6
+    splits: Dict[str, float] = field(default_factory=dict)  # e.g. {train: 0.98, val: 0.01, test: 0.01}
+    split_seed: int = 0
+    shuffle: bool = False  # seeded external-memory shuffle across all inputs
+    shuffle_seed: int = 0
+    shuffle_buckets: int = 64
+    shuffle_max_bucket_records: int = 1_000_000  # larger buckets are re-scattered, bounding RAM
+    validation: str = "schema"  # "off" | "schema" | "full" (adds an LLM spot-check)
+    validation_confidence: float = 0.95
+    validation_margin: float = 0.05
+    validation_workers: int = 4
+    validation_seed: int = 0
+
+
+@dataclass
+class PipelineSettings:
+    """Controls for ``run-all``."""
+
+    streaming: bool = False  # run stages concurrently, connected by bounded queues
+    queue_size: int = 8      # max items waiting between two streaming stages
+    incremental: bool = False  # rebuild only artifacts whose inputs, config or prompts changed
+    lease_seconds: float = 600.0  # a worker's claim expires unless renewed within this time
+    max_attempts: int = 3     # claims per work item before it is marked failed
+    poll_seconds: float = 5.0  # how often idle workers look for new work
+    progress_bars: bool = True  # per-stage console progress bars
+    progress_interval: float = 5.0  # seconds between snapshots appended to io.progress_file
+
+
+@dataclass
+class MetricsSettings:
+    """Prometheus exposition of request, token, item and queue metrics."""
+
+    http_port: Optional[int] = None  # serve /metrics on this port while a command runs
+    http_host: str = "127.0.0.1"
+    textfile: Optional[str] = None  # e.g. "metrics.prom" under working_root, or an absolute path
+    interval: float = 15.0  # seconds between textfile rewrites
+
+
+@dataclass
+class BudgetLimits:
+    """Hard caps on model usage; ``None`` leaves a dimension unbounded."""
+
+    max_requests: Optional[int] = None
+    max_tokens: Optional[int] = None  # approximate prompt plus completion tokens
+    max_cost: Optional[float] = None  # priced with providers.<name>.prices
+
+
+@dataclass
+class BudgetSettings(BudgetLimits):
+    """Per-run limits (the inherited fields), per-stage limits and the soft-limit action."""
+
+    stages: Dict[str, BudgetLimits] = field(default_factory=dict)  # e.g. {mint: {max_cost: 40}}
+    soft_limit: float = 0.8  # share of any limit after which soft_action applies
+    soft_action: str = "none"  # "none" | "throttle" | "degrade"
+    throttle_seconds: float = 2.0  # delay per request, ramping up to this at the hard limit
+    fallback_models: Dict[str, ModelRef] = field(default_factory=dict)  # "provider:name" -> cheaper ref
+
+
+@dataclass
+class EstimateSettings:
+    """Assumptions used by ``synthkit estimate`` for what a dry run cannot observe."""
+
+    chars_per_token: float = 4.0
+    summary_tokens: int = 120     # typical summary length fed to generation prompts
+    item_tokens: int = 120        # typical generated item (question plus answer)
+    judge_output_tokens: int = 60  # JSON verdict in curation.judge_mode "full"
+    escalation_rate: float = 0.3  # share of screened samples sent on to audit_judge
+    latency_seconds: float = 4.0  # per request, used when progress_file has no measurements
+    concurrency: int = 1          # processes working in parallel (e.g. synthkit worker)
 
 
 @dataclass
@@ -64,6 +205,12 @@ class IOSettings:
     minted_dir: str = "minted"
     audited_dir: str = "audited"
     packaged_dir: str = "packaged"
+    judge_cache_file: str = "judge_cache.sqlite"
+    audit_journal_file: str = "audit.journal.jsonl"
+    build_graph_file: str = "build_graph.json"
+    work_queue_file: str = "work_queue.sqlite"
+    progress_file: Optional[str] = "progress.jsonl"
+    artifact_store_file: Optional[str] = None  # e.g. "artifacts.sqlite" instead of per-stage directories
 
     @property
     def harvested_path(self) -> Path:
@@ -85,6 +232,36 @@ class IOSettings:
         """Directory for final export formats (.jsonl, etc.)."""
         return self.working_root / self.packaged_dir
 
+    @property
+    def judge_cache_path(self) -> Path:
+        """SQLite file holding judge verdicts reused across audit runs."""
+        return self.working_root / self.judge_cache_file
+
+    @property
+    def audit_journal_path(self) -> Path:
+        """Append-only log of audit decisions used by ``audit --resume``."""
+        return self.working_root / self.audit_journal_file
+
+    @property
+    def build_graph_path(self) -> Path:
+        """Dependency record of artifact inputs used by incremental runs."""
+        return self.working_root / self.build_graph_file
+
+    @property
+    def progress_path(self) -> Optional[Path]:
+        """JSON-lines stage progress snapshots for monitoring; ``None`` when disabled."""
+        return self.working_root / self.progress_file if self.progress_file else None
+
+    @property
+    def work_queue_path(self) -> Path:
+        """SQLite file through which ``synthkit worker`` processes claim documents."""
+        return self.working_root / self.work_queue_file
+
+    @property
+    def artifact_store_path(self) -> Optional[Path]:
+        """SQLite file holding harvested, minted and audited artifacts; ``None`` uses directories."""
+        return self.working_root / self.artifact_store_file if self.artifact_store_file else None
+
 
 @dataclass
 class ProviderConfig:
@@ -94,6 +271,8 @@ class ProviderConfig:
     api_base: str
     api_key_env: Optional[str] = None
     extra: Dict[str, Any] = field(default_factory=dict)
+    # Per model name: {"input": ..., "output": ...} in currency units per million tokens.
+    prices: Dict[str, Dict[str, float]] = field(default_factory=dict)
 
 
 @dataclass
@@ -106,6 +285,11 @@ class ForgeConfig:
     generation: GenerationSettings
     curation: CurationSettings
     providers: Dict[str, ProviderConfig]
+    packaging: PackagingSettings = field(default_factory=PackagingSettings)
+    pipeline: PipelineSettings = field(default_factory=PipelineSettings)
+    estimate: EstimateSettings = field(default_factory=EstimateSettings)
+    budget: BudgetSettings = field(default_factory=BudgetSettings)
+    metrics: MetricsSettings = field(default_factory=MetricsSettings)
 
 
 def _load_model_ref(raw: Dict[str, Any]) -> ModelRef:
@@ -124,9 +308,22 @@ def _load_stage_models(raw: Dict[str, Any]) -> StageModels:
         mint_generator=_load_model_ref(raw["mint_generator"]),
         audit_judge=_load_model_ref(raw["audit_judge"]),
         package_validator=_load_model_ref(raw["package_validator"]),
+        audit_screener=(
+            _load_model_ref(raw["audit_screener"]) if raw.get("audit_screener") else None
+        ),
     )
 
 
+def _load_budget(raw: Dict[str, Any]) -> BudgetSettings:
+    """Build budget settings, typing nested stage limits and fallback model refs."""
+    raw = dict(raw)
+    stages = {name: BudgetLimits(**limits) for name, limits in (raw.pop("stages", None) or {}).items()}
+    fallbacks = {
+        key: _load_model_ref(ref) for key, ref in (raw.pop("fallback_models", None) or {}).items()
+    }
+    return BudgetSettings(stages=stages, fallback_models=fallbacks, **raw)
+
+
 def _load_providers(raw: Dict[str, Any]) -> Dict[str, ProviderConfig]:
     """Create provider configurations while preserving arbitrary extras."""
     providers: Dict[str, ProviderConfig] = {}
@@ -136,6 +333,7 @@ def _load_providers(raw: Dict[str, Any]) -> Dict[str, ProviderConfig]:
             api_base=cfg["api_base"],
             api_key_env=cfg.get("api_key_env"),
             extra=cfg.get("extra", {}),
+            prices=cfg.get("prices", {}),
         )
     return providers
 
@@ -151,6 +349,12 @@ def load_config(path: str | Path) -> ForgeConfig:
         minted_dir=data["io"].get("minted_dir", "minted"),
         audited_dir=data["io"].get("audited_dir", "audited"),
         packaged_dir=data["io"].get("packaged_dir", "packaged"),
+        judge_cache_file=data["io"].get("judge_cache_file", "judge_cache.sqlite"),
+        audit_journal_file=data["io"].get("audit_journal_file", "audit.journal.jsonl"),
+        build_graph_file=data["io"].get("build_graph_file", "build_graph.json"),
+        work_queue_file=data["io"].get("work_queue_file", "work_queue.sqlite"),
+        progress_file=data["io"].get("progress_file", "progress.jsonl"),
+        artifact_store_file=data["io"].get("artifact_store_file"),
     )
 
     prompts = PromptSet(
@@ -158,10 +362,19 @@ def load_config(path: str | Path) -> ForgeConfig:
         cot_generation=data["prompts"]["cot_generation"],
         qa_rating=data["prompts"]["qa_rating"],
         classifier_generation=data["prompts"].get("classifier_generation"),
+        qa_score=data["prompts"].get("qa_score"),
+        package_validation=data["prompts"].get("package_validation"),
     )
 
     gen = GenerationSettings(**data.get("generation", {}))
-    cur = CurationSettings(**data.get("curation", {}))
+    cur_raw = dict(data.get("curation", {}))
+    prefilter = PrefilterSettings(**cur_raw.pop("prefilter", {}))
+    cur = CurationSettings(prefilter=prefilter, **cur_raw)
+    packaging = PackagingSettings(**data.get("packaging", {}))
+    pipeline = PipelineSettings(**data.get("pipeline", {}))
+    estimate = EstimateSettings(**data.get("estimate", {}))
+    budget = _load_budget(data.get("budget") or {})
+    metrics = MetricsSettings(**data.get("metrics", {}))
     models = _load_stage_models(data["models"])
     providers = _load_providers(data["providers"])
 
@@ -172,4 +385,9 @@ def load_config(path: str | Path) -> ForgeConfig:
         generation=gen,
         curation=cur,
         providers=providers,
+        packaging=packaging,
+        pipeline=pipeline,
+        estimate=estimate,
+        budget=budget,
+        metrics=metrics,
     )
@@ -0,0 +1,84 @@
+"""Two-tier judging: a fast screener decides clear cases, a strong judge the rest."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+from .judge_base import JudgedItem
+from .llm_judge import LLMJudge
+
+
+@dataclass
+class CascadeStats:
+    """Counters describing how the cascade routed samples."""
+
+    screened: int = 0
+    screener_accepted: int = 0
+    screener_rejected: int = 0
+    escalated: int = 0
+    escalated_agreements: int = 0
+
+    @property
+    def agreement_rate(self) -> Optional[float]:
+        """Share of escalated samples where both tiers reached the same keep decision."""
+        if not self.escalated:
+            return None
+        return self.escalated_agreements / self.escalated
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self) | {"agreement_rate": self.agreement_rate}
+
+
+class CascadeJudge:
+    """Escalate only samples scored within ``band`` of ``curation.min_score``.
+
+    Screener parse errors are always escalated rather than rejected, since they
+    say nothing about sample quality.
+    """
+
+    def __init__(self, screener: LLMJudge, strong: LLMJudge, band: float):
+        if band < 0:
+            raise ValueError(f"cascade band must be non-negative, got {band}")
+        self.screener = screener
+        self.strong = strong
+        self.band = band
+        self.stats = CascadeStats()
+
+    def _is_clear(self, screened: JudgedItem) -> bool:
+        if screened.label == "parse_error":
+            return False
+        threshold = self.screener.cfg.curation.min_score
+        return abs(screened.score - threshold) > self.band
+
+    def _finish(self, screened: JudgedItem, final: Optional[JudgedItem]) -> Optional[JudgedItem]:
+        self.stats.screened += 1
+        if final is None:
+            if screened.keep:
+                self.stats.screener_accepted += 1
+            else:
+                self.stats.screener_rejected += 1
+            return screened
+        self.stats.escalated += 1
+        if final.keep == screened.keep:
+            self.stats.escalated_agreements += 1
+        return final
+
+    def judge(self, sample: Dict[str, Any]) -> JudgedItem:
+        """Screen ``sample`` and consult the strong judge only for borderline scores."""
+        screened = self.screener.judge(sample)
+        if self._is_clear(screened):
+            return self._finish(screened, None)
+        return self._finish(screened, self.strong.judge(sample))
+
+    def cached_verdict(self, sample: Dict[str, Any]) -> Optional[JudgedItem]:
+        """Resolve ``sample`` from cached verdicts of either tier, without model calls."""
+        screened = self.screener.cached_verdict(sample)
+        if screened is None:
+            return None
+        if self._is_clear(screened):
+            return self._finish(screened, None)
+        final = self.strong.cached_verdict(sample)
+        if final is None:
+            return None
+        return self._finish(screened, final)
@@ -0,0 +1,112 @@
+"""In-memory exact and near-duplicate detection for generated question text."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import Dict, List, Set, Tuple
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_SIMHASH_BITS = 64
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase ``text`` and collapse punctuation/whitespace into single spaces."""
+    return " ".join(_TOKEN_RE.findall(text.lower()))
+
+
+def _hash64(token: str) -> int:
+    """Return a stable 64-bit hash for ``token`` (``hash()`` is salted per process)."""
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str) -> int:
+    """Compute a 64-bit SimHash over word unigrams and bigrams of ``text``."""
+    tokens = normalize_text(text).split()
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    if not features:
+        return 0
+    weights = [0] * _SIMHASH_BITS
+    for feature in features:
+        value = _hash64(feature)
+        for bit in range(_SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Return the number of differing bits between two fingerprints."""
+    return bin(a ^ b).count("1")
+
+
+class NearDuplicateIndex:
+    """Track seen texts and flag exact or SimHash near-duplicates.
+
+    Fingerprints are split into ``max_distance + 1`` bands; by the pigeonhole
+    principle any fingerprint within ``max_distance`` bits of a stored one
+    shares at least one band exactly, so only those candidates are compared.
+    """
+
+    def __init__(self, max_distance: int = 3):
+        if not 0 <= max_distance < _SIMHASH_BITS:
+            raise ValueError(f"max_distance must be in [0, {_SIMHASH_BITS}), got {max_distance}")
+        self.max_distance = max_distance
+        self.exact_hits = 0
+        self.near_hits = 0
+        self._exact: Set[bytes] = set()
+        self._bands = self._band_layout(max_distance + 1)
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in self._bands]
+
+    @staticmethod
+    def _band_layout(count: int) -> List[Tuple[int, int]]:
+        """Return ``(shift, mask)`` pairs that partition the fingerprint bits."""
+        width, extra = divmod(_SIMHASH_BITS, count)
+        layout: List[Tuple[int, int]] = []
+        shift = 0
+        for idx in range(count):
+            size = width + (1 if idx < extra else 0)
+            layout.append((shift, (1 << size) - 1))
+            shift += size
+        return layout
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    @property
+    def dropped(self) -> int:
+        """Total number of texts rejected as duplicates so far."""
+        return self.exact_hits + self.near_hits
+
+    def check_and_add(self, text: str) -> bool:
+        """Return ``True`` when ``text`` duplicates a seen entry, else record it."""
+        normalized = normalize_text(text)
+        digest = hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).digest()
+        if digest in self._exact:
+            self.exact_hits += 1
+            return True
+
+        if self.check_and_add_near(normalized):
+            return True
+        self._exact.add(digest)
+        return False
+
+    def check_and_add_near(self, normalized: str) -> bool:
+        """SimHash-only variant of :meth:`check_and_add` for already normalized text.
+
+        Used by callers that track exact hashes in their own (bounded) store.
+        """
+        fingerprint = simhash(normalized)
+        keys = [fingerprint >> shift & mask for shift, mask in self._bands]
+        for bucket, key in zip(self._buckets, keys):
+            for candidate in bucket.get(key, ()):
+                if hamming_distance(candidate, fingerprint) <= self.max_distance:
+                    self.near_hits += 1
+                    return True
+
+        for bucket, key in zip(self._buckets, keys):
+            bucket.setdefault(key, []).append(fingerprint)
+        return False
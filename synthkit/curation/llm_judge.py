@@ -3,19 +3,54 @@
 from __future__ import annotations
 
 import json
-from typing import Dict, Any
+import math
+import re
+from typing import Dict, Any, Optional
 
 from .judge_base import JudgedItem
+from .verdict_cache import Verdict, VerdictCache, verdict_key
 from ..config import ForgeConfig
-from ..models.client_base import ChatClient, ChatMessage
+from ..models.client_base import ChatClient, ChatMessage, TokenLogprobs
+
+DEFAULT_SCORE_PROMPT = """You are grading a question-answer pair from a synthetic dataset.
+
+Question:
+{question}
+
+Answer:
+{answer}
+
+Considering accuracy, relevance, clarity and usefulness, rate the pair with a
+single digit from 0 (unusable) to 9 (excellent). Respond with the digit only."""
+
+_DIGIT_RE = re.compile(r"^\s*(\d)\s*\.?\s*$")
+_JUDGE_MODES = ("full", "score")
 
 
 class LLMJudge:
-    """Query an LLM with a rating prompt and normalize the response."""
+    """Query an LLM with a rating prompt and normalize the response.
 
-    def __init__(self, client: ChatClient, cfg: ForgeConfig):
+    When a ``cache`` is supplied, verdicts are looked up by sample content,
+    rating template and ``model_id`` before calling the model, and fresh
+    verdicts are stored for later runs under the model that actually answered
+    (a budget fallback's verdicts never pass for the configured judge's). ``keep`` is always recomputed from the
+    current ``curation.min_score`` so threshold changes need no LLM calls.
+    ``client`` may be ``None`` when only ``cached_verdict`` is used (offline audits).
+    """
+
+    def __init__(
+        self,
+        client: Optional[ChatClient],
+        cfg: ForgeConfig,
+        *,
+        cache: Optional[VerdictCache] = None,
+        model_id: str = "",
+    ):
         self.client = client
         self.cfg = cfg
+        self.cache = cache
+        self.model_id = model_id
+        self.calls = 0
 
     def _build_prompt(self, sample: Dict[str, Any]) -> str:
         """Render the rating template using the common QA fields."""
@@ -26,10 +61,43 @@ class LLMJudge:
         tmpl = self.cfg.prompts.qa_rating
         return tmpl.format(question=question, answer=answer)
 
+    def _to_judged(self, verdict: Verdict, sample: Dict[str, Any]) -> JudgedItem:
+        return JudgedItem(
+            score=verdict.score,
+            keep=verdict.score >= self.cfg.curation.min_score,
+            label=verdict.label,
+            rationale=verdict.rationale,
+            original=sample,
+        )
+
+    def _cache_key(self, sample: Dict[str, Any], model_id: Optional[str] = None) -> str:
+        return verdict_key(sample, self.cfg.prompts.qa_rating, model_id or self.model_id)
+
+    def _answered_model_id(self) -> str:
+        """Key of the model behind the client's last answer, e.g. a budget fallback."""
+        answered_by = getattr(self.client, "answered_by", None)
+        return answered_by().key if callable(answered_by) else self.model_id
+
+    def _store(self, sample: Dict[str, Any], verdict: Verdict, model_id: str) -> None:
+        if self.cache is not None:
+            self.cache.put(self._cache_key(sample, model_id), verdict, model_id)
+
+    def cached_verdict(self, sample: Dict[str, Any]) -> Optional[JudgedItem]:
+        """Return a previously stored verdict for ``sample`` without calling the model."""
+        if self.cache is None:
+            return None
+        verdict = self.cache.get(self._cache_key(sample))
+        return self._to_judged(verdict, sample) if verdict is not None else None
+
     def judge(self, sample: Dict[str, Any]) -> JudgedItem:
         """Score a sample and convert the JSON payload into ``JudgedItem``."""
+        cached = self.cached_verdict(sample)
+        if cached is not None:
+            return cached
+
         prompt = self._build_prompt(sample)
         messages = [ChatMessage(role="user", content=prompt)]
+        self.calls += 1
         raw = self.client.chat(
             messages,
             temperature=0.0,
@@ -50,12 +118,136 @@ class LLMJudge:
         score = float(data.get("score", 0.0))
         label = data.get("label", "ok" if score >= self.cfg.curation.min_score else "bad")
         rationale = data.get("reason", "")
-        keep = score >= self.cfg.curation.min_score
+        verdict = Verdict(score=score, label=label, rationale=rationale)
+        self._store(sample, verdict, self._answered_model_id())
+        return self._to_judged(verdict, sample)
+
+
+class ScoreOnlyJudge(LLMJudge):
+    """Low-token judge that asks for a single 0-9 digit instead of a JSON verdict.
+
+    The digit ``d`` maps to ``d + 1`` on the 1-10 scale used by
+    ``curation.min_score``. Clients exposing ``chat_logprobs`` (OpenAI-compatible
+    backends) yield an expected score over the digit distribution of the first
+    token; other clients get ``curation.score_max_tokens`` and a strict parser.
+    With ``curation.rationale_for_rejects`` the full rating prompt is sent for
+    rejected samples only, to record why they failed.
 
+    Cached verdicts hold the score (and any rationale fetched so far); the
+    ``ok``/``bad`` label is derived from the current ``min_score`` on every
+    lookup, and a sample that a raised threshold now rejects has its rationale
+    fetched the next time it is judged online.
+    """
+
+    def _to_judged(self, verdict: Verdict, sample: Dict[str, Any]) -> JudgedItem:
+        keep = verdict.score >= self.cfg.curation.min_score
         return JudgedItem(
-            score=score,
+            score=verdict.score,
             keep=keep,
-            label=label,
-            rationale=rationale,
+            label="ok" if keep else "bad",
+            rationale="" if keep else verdict.rationale,
             original=sample,
         )
+
+    def _score_template(self) -> str:
+        return self.cfg.prompts.qa_score or DEFAULT_SCORE_PROMPT
+
+    def _cache_key(self, sample: Dict[str, Any], model_id: Optional[str] = None) -> str:
+        return verdict_key(sample, self._score_template(), model_id or self.model_id)
+
+    @staticmethod
+    def _expected_digit(positions: TokenLogprobs) -> Optional[float]:
+        """Return the probability-weighted digit at the first position, if any."""
+        if not positions:
+            return None
+        weights: Dict[int, float] = {}
+        for token, logprob in positions[0].items():
+            stripped = token.strip()
+            if len(stripped) == 1 and stripped.isdigit():
+                weights[int(stripped)] = weights.get(int(stripped), 0.0) + math.exp(logprob)
+        total = sum(weights.values())
+        if total <= 0:
+            return None
+        return sum(digit * weight for digit, weight in weights.items()) / total
+
+    def _request_digit(self, messages: list[ChatMessage]) -> Optional[float]:
+        chat_logprobs = getattr(self.client, "chat_logprobs", None)
+        self.calls += 1
+        if self.cfg.curation.score_use_logprobs and callable(chat_logprobs):
+            text, positions = chat_logprobs(
+                messages,
+                temperature=0.0,
+                max_tokens=1,
+                top_logprobs=self.cfg.curation.score_top_logprobs,
+            )
+            expected = self._expected_digit(positions)
+            if expected is not None:
+                return expected
+        else:
+            text = self.client.chat(
+                messages,
+                temperature=0.0,
+                max_tokens=self.cfg.curation.score_max_tokens,
+            )
+        match = _DIGIT_RE.match(text or "")
+        return float(match.group(1)) if match else None
+
+    def _reject_rationale(self, sample: Dict[str, Any]) -> str:
+        """Ask the full rating prompt for its explanation of a rejected sample."""
+        messages = [ChatMessage(role="user", content=self._build_prompt(sample))]
+        self.calls += 1
+        raw = self.client.chat(messages, temperature=0.0, max_tokens=self.cfg.curation.max_tokens)
+        try:
+            return str(json.loads(raw).get("reason", ""))
+        except (json.JSONDecodeError, AttributeError):
+            return raw.strip()
+
+    def judge(self, sample: Dict[str, Any]) -> JudgedItem:
+        """Score ``sample`` with a single-digit request, consulting the cache first."""
+        model_id = self.model_id
+        verdict = self.cache.get(self._cache_key(sample)) if self.cache is not None else None
+        changed = verdict is None
+        if verdict is None:
+            prompt = self._score_template().format(
+                question=sample.get("question", ""),
+                answer=sample.get("answer", sample.get("response", "")),
+            )
+            digit = self._request_digit([ChatMessage(role="user", content=prompt)])
+            if digit is None:
+                # Fail closed exactly like the full judge does on unparsable output.
+                return JudgedItem(
+                    score=0.0,
+                    keep=False,
+                    label="parse_error",
+                    rationale="Could not parse judge score",
+                    original=sample,
+                )
+            verdict = Verdict(score=digit + 1.0, label="", rationale="")
+            model_id = self._answered_model_id()
+
+        rejected = verdict.score < self.cfg.curation.min_score
+        if rejected and self.cfg.curation.rationale_for_rejects and not verdict.rationale:
+            verdict = Verdict(
+                score=verdict.score, label=verdict.label, rationale=self._reject_rationale(sample)
+            )
+            changed = True
+        if changed:
+            self._store(sample, verdict, model_id)
+        return self._to_judged(verdict, sample)
+
+
+def create_judge(
+    client: Optional[ChatClient],
+    cfg: ForgeConfig,
+    *,
+    cache: Optional[VerdictCache] = None,
+    model_id: str = "",
+) -> LLMJudge:
+    """Build the judge selected by ``curation.judge_mode``."""
+    mode = cfg.curation.judge_mode.lower()
+    if mode not in _JUDGE_MODES:
+        raise ValueError(
+            f"Unknown judge_mode '{cfg.curation.judge_mode}'. Available: {', '.join(_JUDGE_MODES)}"
+        )
+    judge_cls = ScoreOnlyJudge if mode == "score" else LLMJudge
+    return judge_cls(client, cfg, cache=cache, model_id=model_id)
@@ -0,0 +1,149 @@
+"""Rule-based checks that reject implausible samples before the LLM judge."""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections import Counter
+from typing import Any, Dict, Optional, Set
+
+from ..config import PrefilterSettings
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_LETTER_RE = re.compile(r"[^\W\d_]", re.UNICODE)
+_LATIN_RE = re.compile(r"[A-Za-zÀ-ɏ]")
+# Tokens with call/indexing punctuation, operators or dotted/snake_case names.
+_CODE_TOKEN_RE = re.compile(r"[(){}\[\];=<>]|\w[._]\w")
+
+# Function words used both to ignore filler when measuring overlap and as a
+# cheap signal that longer text is written in the expected language.
+_STOPWORDS: Dict[str, Set[str]] = {
+    "en": {
+        "a", "an", "and", "are", "as", "at", "be", "by", "can", "for", "from", "has",
+        "have", "how", "in", "is", "it", "its", "of", "on", "or", "that", "the", "this",
+        "to", "was", "were", "what", "when", "which", "who", "why", "will", "with",
+    },
+}
+_DANGLING_WORDS = {"and", "or", "but", "the", "a", "an", "of", "to", "with", "for", "because"}
+_BRACKETS = {"(": ")", "[": "]", "{": "}"}
+
+
+def _words(text: str) -> list[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _looks_like_code(text: str) -> bool:
+    """Whether ``text`` is mostly source code, which carries no natural-language stopwords."""
+    if "```" in text:
+        return True
+    tokens = text.split()
+    if not tokens:
+        return False
+    code_tokens = sum(1 for token in tokens if _CODE_TOKEN_RE.search(token))
+    return code_tokens / len(tokens) >= 0.3
+
+
+def _looks_truncated(text: str) -> bool:
+    """Detect answers cut off mid-structure or mid-sentence."""
+    stripped = text.rstrip()
+    if not stripped:
+        return True
+    if stripped.count("```") % 2:
+        return True
+    for opener, closer in _BRACKETS.items():
+        if stripped.count(opener) > stripped.count(closer):
+            return True
+    if stripped[-1] in ",;:-(":
+        return True
+    words = _words(stripped[-40:])
+    return bool(words) and words[-1] in _DANGLING_WORDS and stripped[-1].isalpha()
+
+
+class HeuristicPrefilter:
+    """Apply cheap in-process rules and count rejections per rule."""
+
+    def __init__(self, settings: PrefilterSettings):
+        language = settings.language.lower() if settings.language else None
+        if language is not None and language not in _STOPWORDS:
+            raise ValueError(
+                f"Unsupported prefilter language '{settings.language}'. "
+                f"Available: {', '.join(sorted(_STOPWORDS))}"
+            )
+        self.settings = settings
+        self.language = language
+        self._stopwords = _STOPWORDS.get(language or "en", set())
+        self._banned = [phrase.lower() for phrase in settings.banned_phrases]
+        self.rejections: Counter[str] = Counter()
+        self.checked = 0
+
+    def _wrong_language(self, text: str) -> bool:
+        letters = _LETTER_RE.findall(text)
+        if not letters:
+            return False
+        latin = sum(1 for char in letters if _LATIN_RE.match(char))
+        if latin / len(letters) < self.settings.min_script_ratio:
+            return True
+        if _looks_like_code(text):
+            return False
+        words = _words(text)
+        if len(words) >= 8 and not any(word in self._stopwords for word in words):
+            return True
+        return False
+
+    def _reject_reason(self, question: str, answer: str, source: Optional[str]) -> Optional[str]:
+        cfg = self.settings
+        if not cfg.min_question_chars <= len(question.strip()) <= cfg.max_question_chars:
+            return "question_length"
+        if not cfg.min_answer_chars <= len(answer.strip()) <= cfg.max_answer_chars:
+            return "answer_length"
+        if cfg.reject_truncated and _looks_truncated(answer):
+            return "truncated"
+
+        lowered = f"{question}\n{answer}".lower()
+        if any(phrase in lowered for phrase in self._banned):
+            return "banned_phrase"
+
+        question_words = set(_words(question)) - self._stopwords
+        answer_words = set(_words(answer)) - self._stopwords
+        if _jaccard(question_words, answer_words) > cfg.max_qa_similarity:
+            return "restates_question"
+
+        if self.language is not None and (
+            self._wrong_language(question) or self._wrong_language(answer)
+        ):
+            return "language"
+
+        if source and cfg.min_source_overlap > 0 and len(answer_words) >= cfg.overlap_min_words:
+            source_words = set(_words(source))
+            overlap = len(answer_words & source_words) / len(answer_words)
+            if overlap < cfg.min_source_overlap:
+                return "source_overlap"
+        return None
+
+    def check(self, sample: Dict[str, Any], source: Optional[str] = None) -> Optional[str]:
+        """Return the name of the first failing rule, or ``None`` if ``sample`` passes."""
+        self.checked += 1
+        question = str(sample.get("question", ""))
+        answer = str(sample.get("answer", sample.get("response", "")))
+        reason = self._reject_reason(question, answer, source)
+        if reason is not None:
+            self.rejections[reason] += 1
+        return reason
+
+    def log_summary(self) -> None:
+        """Log how many samples each rule rejected."""
+        rejected = sum(self.rejections.values())
+        logger.info(
+            "Prefilter rejected %s of %s samples before judging%s",
+            rejected,
+            self.checked,
+            "".join(f"; {rule}={count}" for rule, count in self.rejections.most_common()),
+        )
@@ -0,0 +1,89 @@
+"""SQLite-backed store of judge verdicts keyed by sample, rubric and model."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..config import ForgeConfig
+
+# Fields added by audit or mint bookkeeping that do not change what the judge sees.
+_IGNORED_FIELDS = {"meta", "score", "label", "judge_rationale"}
+
+
+@dataclass
+class Verdict:
+    """Raw judge output; ``keep`` is derived later from the current threshold."""
+
+    score: float
+    label: str
+    rationale: str
+
+
+def verdict_key(sample: Dict[str, Any], template: str, model: str) -> str:
+    """Hash the judged sample content together with the prompt template and model."""
+    content = {key: value for key, value in sample.items() if key not in _IGNORED_FIELDS}
+    blob = json.dumps(
+        {"sample": content, "template": template, "model": model},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class VerdictCache:
+    """Persist verdicts so reruns only pay for new or changed samples."""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS verdicts ("
+            " key TEXT PRIMARY KEY,"
+            " score REAL NOT NULL,"
+            " label TEXT NOT NULL,"
+            " rationale TEXT NOT NULL,"
+            " model TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Verdict]:
+        """Return the stored verdict for ``key`` or ``None`` on a miss."""
+        row = self._conn.execute(
+            "SELECT score, label, rationale FROM verdicts WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return Verdict(score=row[0], label=row[1], rationale=row[2])
+
+    def put(self, key: str, verdict: Verdict, model: str) -> None:
+        """Insert or replace the verdict for ``key``; committed immediately for crash safety."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO verdicts (key, score, label, rationale, model, created_at)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (key, verdict.score, verdict.label, verdict.rationale, model, time.time()),
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def open_verdict_cache(cfg: ForgeConfig) -> Optional[VerdictCache]:
+    """Return the project's verdict cache, or ``None`` when caching is disabled."""
+    if not cfg.curation.verdict_cache:
+        return None
+    return VerdictCache(cfg.io.judge_cache_path)
@@ -0,0 +1,169 @@
+"""Corpus-wide duplicate removal for packaging, with bounded-memory hash stores."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+from ..curation.dedup import NearDuplicateIndex, normalize_text
+
+DEDUP_MODES = ("off", "exact", "near")
+DEDUP_BACKENDS = ("memory", "bloom", "sqlite")
+
+
+def sample_text_key(sample: Dict[str, Any]) -> str:
+    """Return the normalized question that identifies a sample for dedup and splits."""
+    question = sample.get("question")
+    if isinstance(question, str) and question.strip():
+        return normalize_text(question)
+    return json.dumps(sample, sort_keys=True, ensure_ascii=False)
+
+
+class MemoryHashSet:
+    """Exact digest set held in memory (16 bytes plus overhead per entry)."""
+
+    def __init__(self) -> None:
+        self._seen: Set[bytes] = set()
+
+    def add(self, digest: bytes) -> bool:
+        """Record ``digest``; return ``True`` when it was already present."""
+        if digest in self._seen:
+            return True
+        self._seen.add(digest)
+        return False
+
+    def close(self) -> None:
+        self._seen.clear()
+
+
+class BloomFilter:
+    """Fixed-size probabilistic set sized for ``capacity`` items at ``error_rate``.
+
+    A false positive drops a unique sample as a duplicate; it never lets a
+    duplicate through.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 1e-6):
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        if not 0 < error_rate < 1:
+            raise ValueError(f"error_rate must be in (0, 1), got {error_rate}")
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_bits = max(bits, 8)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, digest: bytes):
+        # Double hashing: k positions derived from two independent 64-bit halves.
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:16], "big") | 1
+        for index in range(self.num_hashes):
+            yield (first + index * second) % self.num_bits
+
+    def add(self, digest: bytes) -> bool:
+        """Record ``digest``; return ``True`` when it was (probably) already present."""
+        present = True
+        for position in self._positions(digest):
+            byte, bit = divmod(position, 8)
+            if not self._bits[byte] >> bit & 1:
+                present = False
+                self._bits[byte] |= 1 << bit
+        return present
+
+    def close(self) -> None:
+        self._bits = bytearray()
+
+
+class DiskHashSet:
+    """Exact digest set stored in SQLite so memory stays flat for huge corpora."""
+
+    def __init__(self, path: Path, batch_size: int = 10_000):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            path.unlink()
+        self.path = path
+        self._batch_size = batch_size
+        self._pending = 0
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute("PRAGMA journal_mode=OFF")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute("CREATE TABLE seen (digest BLOB PRIMARY KEY) WITHOUT ROWID")
+
+    def add(self, digest: bytes) -> bool:
+        """Record ``digest``; return ``True`` when it was already present."""
+        cursor = self._conn.execute("INSERT OR IGNORE INTO seen (digest) VALUES (?)", (digest,))
+        self._pending += 1
+        if self._pending >= self._batch_size:
+            self._conn.commit()
+            self._pending = 0
+        return cursor.rowcount == 0
+
+    def close(self) -> None:
+        self._conn.close()
+        self.path.unlink(missing_ok=True)
+
+
+class CorpusDeduplicator:
+    """Drop samples whose question was already packaged, across all audited files.
+
+    ``mode`` is ``exact`` (normalized question hash) or ``near`` (additionally
+    SimHash within ``max_distance`` bits). The exact store is chosen by
+    ``backend``; near-duplicate fingerprints are always kept in memory
+    (8 bytes per unique sample).
+    """
+
+    def __init__(
+        self,
+        mode: str = "exact",
+        *,
+        backend: str = "memory",
+        max_distance: int = 3,
+        capacity: int = 10_000_000,
+        error_rate: float = 1e-6,
+        spill_path: Optional[Path] = None,
+    ):
+        if mode not in DEDUP_MODES or mode == "off":
+            raise ValueError(f"Unknown dedup mode '{mode}'. Available: exact, near")
+        if backend == "memory":
+            self._exact: Any = MemoryHashSet()
+        elif backend == "bloom":
+            self._exact = BloomFilter(capacity, error_rate)
+        elif backend == "sqlite":
+            if spill_path is None:
+                raise ValueError("The sqlite dedup backend requires a spill_path")
+            self._exact = DiskHashSet(spill_path)
+        else:
+            raise ValueError(
+                f"Unknown dedup backend '{backend}'. Available: {', '.join(DEDUP_BACKENDS)}"
+            )
+        self.mode = mode
+        self.backend = backend
+        self._near = NearDuplicateIndex(max_distance) if mode == "near" else None
+        self.exact_hits = 0
+        self.near_hits = 0
+
+    def is_duplicate(self, key: str) -> bool:
+        """Return ``True`` when ``key`` repeats a seen sample, else remember it."""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        if self._exact.add(digest):
+            self.exact_hits += 1
+            return True
+        if self._near is not None and self._near.check_and_add_near(key):
+            self.near_hits += 1
+            return True
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "backend": self.backend,
+            "exact_duplicates": self.exact_hits,
+            "near_duplicates": self.near_hits,
+        }
+
+    def close(self) -> None:
+        self._exact.close()
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Mapping
 
 from ..extensions import register_formatter
 
@@ -36,6 +36,42 @@ def to_openai_ft(sample: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-register_formatter("alpaca", to_alpaca)
-register_formatter("chatml", to_chatml)
-register_formatter("openai-ft", to_openai_ft)
+def validate_alpaca(record: Mapping[str, Any]) -> List[str]:
+    """Check an Alpaca record: string fields and a non-empty instruction and output."""
+    problems = [
+        f"'{field}' must be a string"
+        for field in ("instruction", "input", "output")
+        if not isinstance(record.get(field), str)
+    ]
+    if not problems:
+        problems += [
+            f"'{field}' is empty"
+            for field in ("instruction", "output")
+            if not record[field].strip()
+        ]
+    return problems
+
+
+def validate_messages(record: Mapping[str, Any]) -> List[str]:
+    """Check a chat record: non-empty role/content turns ending with the assistant."""
+    messages = record.get("messages")
+    if not isinstance(messages, list) or not messages:
+        return ["'messages' must be a non-empty list"]
+    problems: List[str] = []
+    for index, message in enumerate(messages):
+        if not isinstance(message, Mapping):
+            problems.append(f"message {index} is not an object")
+            continue
+        if message.get("role") not in ("system", "user", "assistant"):
+            problems.append(f"message {index} has invalid role {message.get('role')!r}")
+        content = message.get("content")
+        if not isinstance(content, str) or not content.strip():
+            problems.append(f"message {index} has empty content")
+    if not problems and messages[-1].get("role") != "assistant":
+        problems.append("last message must come from the assistant")
+    return problems
+
+
+register_formatter("alpaca", to_alpaca, validator=validate_alpaca)
+register_formatter("chatml", to_chatml, validator=validate_messages)
+register_formatter("openai-ft", to_openai_ft, validator=validate_messages)
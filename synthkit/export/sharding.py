@@ -0,0 +1,130 @@
+"""Size-capped shard writer producing ``<prefix>-00000-of-00042`` style outputs."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from .writers import JsonlSink, OutputInfo, SinkFactory
+
+# Shards are described exactly like any other packaged output.
+ShardInfo = OutputInfo
+
+
+class ShardWriter:
+    """Spread records over shards capped by record count and/or bytes.
+
+    Shards are written under temporary names and renamed once the total shard
+    count is known. A shard is closed as soon as it reaches a cap. ``max_bytes``
+    is measured on the uncompressed JSONL written to a shard, so it is exceeded
+    by at most one record before compression and compressed shards end up
+    smaller on disk. Parquet sinks only learn their size when a row group is
+    flushed, so a byte cap needs a sink with ``uncompressed_bytes`` (JSONL) and
+    is rejected otherwise; cap Parquet shards with ``max_records``.
+    """
+
+    def __init__(
+        self,
+        out_dir: Path,
+        prefix: str,
+        *,
+        max_records: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        sink_factory: SinkFactory = JsonlSink,
+        suffix: Optional[str] = None,
+    ):
+        if max_records is not None and max_records <= 0:
+            raise ValueError(f"max_records must be positive, got {max_records}")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+        self.out_dir = out_dir
+        self.prefix = prefix
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.sink_factory = sink_factory
+        self.suffix = suffix or getattr(sink_factory, "suffix", ".jsonl")
+        self._sink: Any = None
+        self._finished: List[Any] = []
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+    def _full(self, sink: Any) -> bool:
+        if self.max_records is not None and sink.records >= self.max_records:
+            return True
+        return self.max_bytes is not None and sink.uncompressed_bytes >= self.max_bytes
+
+    def _roll(self) -> None:
+        if self._sink is not None:
+            self._sink.close()
+            self._finished.append(self._sink)
+        index = len(self._finished)
+        sink = self.sink_factory(self.out_dir / f".{self.prefix}-{index:05d}{self.suffix}.partial")
+        if self.max_bytes is not None and not hasattr(sink, "uncompressed_bytes"):
+            sink.close()
+            Path(sink.path).unlink()
+            raise ValueError(
+                f"max_bytes needs JSONL shards; cap {self.suffix} shards with max_records instead"
+            )
+        self._sink = sink
+
+    def write(self, record: Mapping[str, Any]) -> None:
+        if self._sink is None or self._full(self._sink):
+            self._roll()
+        self._sink.write(record)
+
+    def close(self) -> List[ShardInfo]:
+        """Finish the last shard, give every shard its final name and describe them."""
+        if self._sink is not None:
+            self._sink.close()
+            self._finished.append(self._sink)
+            self._sink = None
+        total = len(self._finished)
+        shards: List[ShardInfo] = []
+        for index, sink in enumerate(self._finished):
+            final = self.out_dir / f"{self.prefix}-{index:05d}-of-{total:05d}{self.suffix}"
+            Path(sink.path).replace(final)
+            sink.path = final
+            shards.append(sink.info())
+        return shards
+
+    def abort(self) -> None:
+        """Close the open shard and delete every shard not yet given its final name."""
+        sinks = self._finished + ([self._sink] if self._sink is not None else [])
+        if self._sink is not None:
+            with contextlib.suppress(Exception):
+                self._sink.close()
+            self._sink = None
+        self._finished = []
+        for sink in sinks:
+            path = Path(sink.path)
+            if path.name.endswith(".partial"):
+                path.unlink(missing_ok=True)
+
+
+def remove_stale_shards(out_dir: Path, prefix: str) -> None:
+    """Delete shards of a previous run so old and new shard sets never mix."""
+    for pattern in (f"{prefix}-*-of-*", f".{prefix}-*.partial"):
+        for stale in out_dir.glob(pattern):
+            stale.unlink()
+
+
+def write_shard_index(
+    out_dir: Path,
+    shards: Mapping[str, Sequence[ShardInfo]],
+    **extra: Any,
+) -> Path:
+    """Write ``index.json`` listing shards, record counts and checksums per output split."""
+    payload: Dict[str, Any] = dict(extra)
+    payload["total_records"] = sum(shard.records for group in shards.values() for shard in group)
+    payload["splits"] = {
+        name: {
+            "records": sum(shard.records for shard in group),
+            "shards": [asdict(shard) for shard in group],
+        }
+        for name, group in shards.items()
+    }
+    index_path = out_dir / "index.json"
+    index_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    return index_path
@@ -0,0 +1,97 @@
+"""Seeded external-memory shuffle: scatter records to spill buckets, shuffle each bucket."""
+
+from __future__ import annotations
+
+import json
+import random
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, TextIO, Union
+
+Seed = Union[int, str]
+
+
+class ExternalShuffler:
+    """Globally shuffle more records than fit in memory.
+
+    Records are appended to ``num_buckets`` spill files chosen by a seeded RNG.
+    Iteration visits buckets in a seeded random order and shuffles each one in
+    memory, so at most one bucket is held at a time. A bucket larger than
+    ``max_bucket_records`` is shuffled recursively through its own spill files
+    instead of being loaded whole. The same seed and input order always yield
+    the same output order.
+    """
+
+    def __init__(
+        self,
+        work_dir: Path,
+        *,
+        seed: Seed = 0,
+        num_buckets: int = 64,
+        max_bucket_records: int = 1_000_000,
+    ):
+        if num_buckets <= 0:
+            raise ValueError(f"num_buckets must be positive, got {num_buckets}")
+        if max_bucket_records <= 0:
+            raise ValueError(f"max_bucket_records must be positive, got {max_bucket_records}")
+        work_dir.mkdir(parents=True, exist_ok=True)
+        self.seed = seed
+        self.num_buckets = num_buckets
+        self.max_bucket_records = max_bucket_records
+        self.records = 0
+        self._dir = Path(tempfile.mkdtemp(prefix=".shuffle-", dir=work_dir))
+        self._rng = random.Random(f"{seed}:scatter")
+        self._counts = [0] * num_buckets
+        self._handles: List[TextIO] = [
+            (self._dir / f"bucket-{index:05d}.jsonl").open("w", encoding="utf-8")
+            for index in range(num_buckets)
+        ]
+
+    def add(self, record: Mapping[str, Any]) -> None:
+        bucket = self._rng.randrange(self.num_buckets)
+        self._handles[bucket].write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._counts[bucket] += 1
+        self.records += 1
+
+    def _close_handles(self) -> None:
+        for handle in self._handles:
+            handle.close()
+        self._handles = []
+
+    def _iter_bucket(self, index: int) -> Iterator[Dict[str, Any]]:
+        path = self._dir / f"bucket-{index:05d}.jsonl"
+        if self._counts[index] > self.max_bucket_records and self.num_buckets > 1:
+            nested = ExternalShuffler(
+                self._dir,
+                seed=f"{self.seed}:{index}",
+                num_buckets=self.num_buckets,
+                max_bucket_records=self.max_bucket_records,
+            )
+            try:
+                with path.open("r", encoding="utf-8") as handle:
+                    for line in handle:
+                        nested.add(json.loads(line))
+                path.unlink()
+                yield from nested
+            finally:
+                nested.close()
+            return
+        with path.open("r", encoding="utf-8") as handle:
+            records = [json.loads(line) for line in handle]
+        path.unlink()
+        random.Random(f"{self.seed}:{index}").shuffle(records)
+        yield from records
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Yield every added record once, in shuffled order. Consumes the spill files."""
+        self._close_handles()
+        order = list(range(self.num_buckets))
+        random.Random(f"{self.seed}:order").shuffle(order)
+        for index in order:
+            yield from self._iter_bucket(index)
+
+    def close(self) -> None:
+        """Remove spill files; safe to call more than once."""
+        self._close_handles()
+        shutil.rmtree(self._dir, ignore_errors=True)
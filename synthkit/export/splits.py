@@ -0,0 +1,57 @@
+"""Deterministic hash-based assignment of samples to train/val/test splits."""
+
+from __future__ import annotations
+
+import hashlib
+from typing import List, Mapping, Tuple
+
+_SCALE = float(1 << 64)
+
+
+def parse_splits(value: str) -> List[Tuple[str, float]]:
+    """Parse ``"train=0.98,val=0.01,test=0.01"`` into ``(name, ratio)`` pairs."""
+    splits: List[Tuple[str, float]] = []
+    for part in value.split(","):
+        if not part.strip():
+            continue
+        name, sep, ratio = part.partition("=")
+        if not sep:
+            raise ValueError(f"Expected name=ratio in split spec, got '{part.strip()}'")
+        try:
+            splits.append((name.strip(), float(ratio)))
+        except ValueError as exc:
+            raise ValueError(f"Invalid ratio for split '{name.strip()}': {ratio!r}") from exc
+    return splits
+
+
+class SplitAssigner:
+    """Map a sample key to a split from a seeded hash, independent of input order.
+
+    Ratios are normalized to sum to one. Because the split depends only on the
+    key, identical samples always fall into the same split.
+    """
+
+    def __init__(self, splits: Mapping[str, float], seed: int = 0):
+        if not splits:
+            raise ValueError("At least one split is required")
+        for name, ratio in splits.items():
+            if not name or ratio < 0:
+                raise ValueError(f"Invalid split '{name}' with ratio {ratio}")
+        total = sum(splits.values())
+        if total <= 0:
+            raise ValueError("Split ratios must sum to a positive value")
+        self.names = list(splits)
+        self.seed = seed
+        self._bounds: List[Tuple[float, str]] = []
+        cumulative = 0.0
+        for name, ratio in splits.items():
+            cumulative += ratio / total
+            self._bounds.append((cumulative, name))
+
+    def assign(self, key: str) -> str:
+        digest = hashlib.blake2b(f"{self.seed}:{key}".encode("utf-8"), digest_size=8).digest()
+        point = int.from_bytes(digest, "big") / _SCALE
+        for bound, name in self._bounds:
+            if point < bound:
+                return name
+        return self._bounds[-1][1]
@@ -0,0 +1,253 @@
+"""Validation of packaged records: per-formatter schema checks plus a sampled LLM review."""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import logging
+import math
+import random
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from statistics import NormalDist
+from typing import Any, Dict, List, Mapping, Optional
+
+from ..extensions import get_formatter_validator
+from ..models.client_base import ChatClient, ChatClientError, ChatMessage
+
+logger = logging.getLogger(__name__)
+
+VALIDATION_MODES = ("off", "schema", "full")
+
+DEFAULT_VALIDATION_PROMPT = """You are reviewing one record of a fine-tuning dataset in the "{format}" format.
+
+Record:
+{record}
+
+Check that the record is well-formed, that the request is clear and that the
+response correctly and completely answers it. Respond with JSON only:
+{{"pass": true or false, "reason": "<one short sentence>"}}"""
+
+
+def _z_score(confidence: float) -> float:
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence must be in (0, 1), got {confidence}")
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+
+def cochran_sample_size(
+    population: Optional[int] = None,
+    *,
+    confidence: float = 0.95,
+    margin: float = 0.05,
+    proportion: float = 0.5,
+) -> int:
+    """Return the sample size that estimates a pass rate within ``margin``.
+
+    Uses Cochran's formula with the finite population correction when
+    ``population`` is known; ``proportion=0.5`` is the worst case.
+    """
+    if not 0 < margin < 1:
+        raise ValueError(f"margin must be in (0, 1), got {margin}")
+    z = _z_score(confidence)
+    n0 = z * z * proportion * (1 - proportion) / (margin * margin)
+    if population is None:
+        return math.ceil(n0)
+    if population <= 0:
+        return 0
+    return min(population, math.ceil(n0 / (1 + (n0 - 1) / population)))
+
+
+class Reservoir:
+    """Uniform random sample of fixed size from a stream of unknown length."""
+
+    def __init__(self, size: int, seed: int = 0):
+        self.size = size
+        self.seen = 0
+        self.items: List[Mapping[str, Any]] = []
+        self._rng = random.Random(seed)
+
+    def add(self, item: Mapping[str, Any]) -> None:
+        self.seen += 1
+        if len(self.items) < self.size:
+            self.items.append(item)
+            return
+        slot = self._rng.randrange(self.seen)
+        if slot < self.size:
+            self.items[slot] = item
+
+
+@dataclass
+class SpotCheck:
+    """Outcome of the LLM review of one record; ``passed`` is ``None`` on errors."""
+
+    passed: Optional[bool]
+    reason: str
+
+
+class PackageValidator:
+    """Observe packaged records as they are written and summarize their quality.
+
+    Every record is checked against the schema validator registered with its
+    formatter. A reservoir keeps a uniform sample large enough for the worst
+    case; :meth:`spot_check` shrinks it with the finite population correction
+    once the record count is known and reviews it with an LLM in parallel.
+    """
+
+    def __init__(
+        self,
+        fmt: str,
+        *,
+        confidence: float = 0.95,
+        margin: float = 0.05,
+        seed: int = 0,
+        max_examples: int = 5,
+    ):
+        self.fmt = fmt
+        self.confidence = confidence
+        self.margin = margin
+        self.records = 0
+        self.schema_failures = 0
+        self.problems: Counter = Counter()
+        self.examples: List[Dict[str, Any]] = []
+        self.max_examples = max_examples
+        self.spot_checks: List[SpotCheck] = []
+        self._validator = get_formatter_validator(fmt)
+        self._seed = seed
+        self._reservoir = Reservoir(
+            cochran_sample_size(confidence=confidence, margin=margin), seed=seed
+        )
+
+    def observe(self, record: Mapping[str, Any]) -> None:
+        self.records += 1
+        self._reservoir.add(record)
+        if self._validator is None:
+            return
+        problems = self._validator(record)
+        if problems:
+            self.schema_failures += 1
+            self.problems.update(problems)
+            if len(self.examples) < self.max_examples:
+                self.examples.append({"record": dict(record), "problems": problems})
+
+    def sample(self) -> List[Mapping[str, Any]]:
+        """Return the spot-check sample sized for the observed population."""
+        size = cochran_sample_size(self.records, confidence=self.confidence, margin=self.margin)
+        items = self._reservoir.items
+        if size >= len(items):
+            return list(items)
+        return random.Random(f"{self._seed}:sample").sample(items, size)
+
+    def _review(
+        self, client: ChatClient, template: str, max_tokens: int, record: Mapping[str, Any]
+    ) -> SpotCheck:
+        prompt = template.format(
+            format=self.fmt, record=json.dumps(record, ensure_ascii=False, indent=2)
+        )
+        try:
+            raw = client.chat(
+                [ChatMessage(role="user", content=prompt)], temperature=0.0, max_tokens=max_tokens
+            )
+        except ChatClientError as exc:
+            logger.warning("Validator request failed: %s", exc)
+            return SpotCheck(passed=None, reason=str(exc))
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError:
+            return SpotCheck(passed=None, reason="Could not parse validator JSON")
+        if not isinstance(data, dict) or not isinstance(data.get("pass"), bool):
+            return SpotCheck(passed=None, reason="Validator JSON lacks a boolean 'pass'")
+        return SpotCheck(passed=data["pass"], reason=str(data.get("reason", "")))
+
+    def spot_check(
+        self,
+        client: ChatClient,
+        *,
+        template: Optional[str] = None,
+        workers: int = 4,
+        max_tokens: int = 256,
+    ) -> List[SpotCheck]:
+        """Review the sample with ``client`` using ``workers`` concurrent requests."""
+        sample = self.sample()
+        template = template or DEFAULT_VALIDATION_PROMPT
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            # Copy the caller's context so requests count towards its stage progress.
+            futures = [
+                pool.submit(
+                    contextvars.copy_context().run,
+                    self._review,
+                    client,
+                    template,
+                    max_tokens,
+                    record,
+                )
+                for record in sample
+            ]
+            self.spot_checks = [future.result() for future in futures]
+        return self.spot_checks
+
+    def _spot_check_summary(self) -> Dict[str, Any]:
+        passed = sum(1 for check in self.spot_checks if check.passed is True)
+        failed = sum(1 for check in self.spot_checks if check.passed is False)
+        judged = passed + failed
+        summary: Dict[str, Any] = {
+            "population": self.records,
+            "sample_size": len(self.spot_checks),
+            "confidence": self.confidence,
+            "target_margin": self.margin,
+            "passed": passed,
+            "failed": failed,
+            "errors": len(self.spot_checks) - judged,
+            "pass_rate": None,
+            "margin_of_error": None,
+            "failure_reasons": [
+                check.reason for check in self.spot_checks if check.passed is False
+            ][: self.max_examples],
+        }
+        if judged:
+            rate = passed / judged
+            fpc = math.sqrt((self.records - judged) / (self.records - 1)) if self.records > 1 else 0.0
+            summary["pass_rate"] = rate
+            summary["margin_of_error"] = (
+                _z_score(self.confidence) * math.sqrt(rate * (1 - rate) / judged) * fpc
+            )
+        return summary
+
+    def report(self) -> Dict[str, Any]:
+        report: Dict[str, Any] = {
+            "format": self.fmt,
+            "records": self.records,
+            "schema": {
+                "checked": self._validator is not None,
+                "failures": self.schema_failures,
+                "problems": dict(self.problems),
+                "examples": self.examples,
+            },
+        }
+        if self.spot_checks:
+            report["spot_check"] = self._spot_check_summary()
+        return report
+
+    def write_report(self, out_dir: Path) -> Path:
+        """Log a summary and persist the report as ``validation_report.json``."""
+        report = self.report()
+        if self.schema_failures:
+            logger.warning(
+                "%s of %s packaged records fail the %s schema",
+                self.schema_failures,
+                self.records,
+                self.fmt,
+            )
+        spot = report.get("spot_check")
+        if spot and spot["pass_rate"] is not None:
+            logger.info(
+                "Validator spot-check: pass rate %.3f +/- %.3f over %s sampled records",
+                spot["pass_rate"],
+                spot["margin_of_error"],
+                spot["sample_size"],
+            )
+        path = out_dir / "validation_report.json"
+        path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        return path
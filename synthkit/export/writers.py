@@ -1,37 +1,387 @@
-﻿"""Writers that persist curated samples in a streaming-friendly JSONL format."""
+﻿"""Writers that persist curated samples as streaming JSONL or columnar Parquet.
+
+JSONL output can be gzip- or zstd-compressed on the fly. Every sink counts
+records, bytes on disk and a SHA-256 of the written stream in the same pass,
+so manifests never need to re-read outputs.
+"""
 
 from __future__ import annotations
 
+import functools
+import gzip
+import hashlib
+import io
 import json
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Iterable, Dict, Any
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
 
 from ..extensions import get_formatter
-# Import formatter definitions for their registration side-effects.
-from . import formats as _formats  # noqa: F401
+
+
+COMPRESSIONS = ("gzip", "zstd")
+_COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+_DEFAULT_LEVELS = {"gzip": 6, "zstd": 3}
+
+
+@dataclass
+class OutputInfo:
+    """Summary of one finished output file, as listed in manifests and indexes."""
+
+    file: str
+    records: int
+    bytes: int
+    sha256: str
+
+
+class _DigestWriter(io.RawIOBase):
+    """Write-through file wrapper that counts and hashes the bytes reaching disk."""
+
+    def __init__(self, handle: BinaryIO):
+        super().__init__()
+        self._handle = handle
+        self._sha = hashlib.sha256()
+        self.bytes_written = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        view = memoryview(data).cast("B")
+        self._handle.write(view)
+        self._sha.update(view)
+        self.bytes_written += view.nbytes
+        return view.nbytes
+
+    def tell(self) -> int:
+        return self.bytes_written
+
+    def flush(self) -> None:
+        self._handle.flush()
+
+    def close(self) -> None:
+        if not self.closed:
+            super().close()  # flushes through to the underlying handle
+            self._handle.close()
+
+    def hexdigest(self) -> str:
+        return self._sha.hexdigest()
+
+
+def compression_for_path(path: Path) -> Optional[str]:
+    """Infer the compression codec from a ``.gz``/``.zst`` file extension."""
+    name = path.name.lower()
+    if name.endswith(".gz"):
+        return "gzip"
+    if name.endswith((".zst", ".zstd")):
+        return "zstd"
+    return None
+
+
+def _open_compressed(raw: BinaryIO, compression: Optional[str], level: Optional[int]) -> Any:
+    if compression is None:
+        return raw
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression '{compression}'. Available: {', '.join(COMPRESSIONS)}")
+    level = _DEFAULT_LEVELS[compression] if level is None else level
+    if compression == "gzip":
+        # mtime=0 keeps the output, and therefore its checksum, reproducible.
+        return gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=level, mtime=0)
+    try:
+        import zstandard
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise RuntimeError(
+            "zstd compression requires zstandard; install it with `pip install synthkit[zstd]`"
+        ) from exc
+    return zstandard.ZstdCompressor(level=level).stream_writer(raw, closefd=False)
+
+
+class JsonlSink:
+    """Incremental JSONL writer that tracks record counts, bytes on disk and a checksum.
+
+    ``compression`` (``gzip`` or ``zstd``) defaults to what the file extension
+    implies. With compression, ``bytes_written`` trails the data handed to the
+    compressor until it flushes a block.
+    """
+
+    suffix = ".jsonl"
+
+    def __init__(
+        self,
+        out_path: Path,
+        *,
+        compression: Optional[str] = None,
+        level: Optional[int] = None,
+    ):
+        # Ensure parent directories exist before streaming out the file.
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = out_path
+        self.records = 0
+        self.uncompressed_bytes = 0
+        self.compression = compression or compression_for_path(out_path)
+        self._raw = _DigestWriter(out_path.open("wb"))
+        try:
+            self._handle: Any = _open_compressed(self._raw, self.compression, level)
+        except Exception:
+            self._raw.close()
+            raise
+
+    @property
+    def bytes_written(self) -> int:
+        return self._raw.bytes_written
+
+    @property
+    def sha256(self) -> str:
+        return self._raw.hexdigest()
+
+    def write(self, record: Mapping[str, Any]) -> None:
+        data = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        self._handle.write(data)
+        self.records += 1
+        self.uncompressed_bytes += len(data)
+
+    def close(self) -> None:
+        if self._handle is not self._raw:
+            self._handle.close()
+        self._raw.close()
+
+    def info(self) -> OutputInfo:
+        return OutputInfo(
+            file=Path(self.path).name,
+            records=self.records,
+            bytes=self.bytes_written,
+            sha256=self.sha256,
+        )
+
+
+class ParquetSink:
+    """Columnar writer that streams records into Parquet row groups.
+
+    The schema is inferred from the first row group, with a column for every
+    key any of its records has; later rows are coerced to it, and missing
+    fields become nulls. While a column holds only nulls its type is unknown,
+    so rows stay buffered (up to ``max_deferred_row_groups`` row groups) until
+    a value types it; a column still all-null past that point is written as
+    ``null`` and a later value for it raises ``ValueError``, as does a later
+    record with a field outside the schema. ``bytes_written`` only grows as
+    row groups are flushed. Requires the optional ``pyarrow`` dependency
+    (``pip install synthkit[parquet]``).
+    """
+
+    suffix = ".parquet"
+
+    def __init__(
+        self,
+        out_path: Path,
+        *,
+        compression: str = "zstd",
+        row_group_size: int = 10_000,
+        max_deferred_row_groups: int = 16,
+    ):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:  # pragma: no cover - depends on environment
+            raise RuntimeError(
+                "Parquet output requires pyarrow; install it with `pip install synthkit[parquet]`"
+            ) from exc
+        if row_group_size <= 0:
+            raise ValueError(f"row_group_size must be positive, got {row_group_size}")
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = out_path
+        self.records = 0
+        self._raw = _DigestWriter(out_path.open("wb"))
+        self._pa = pa
+        self._pq = pq
+        self._compression = compression
+        self._row_group_size = row_group_size
+        self._max_deferred = row_group_size * max(1, max_deferred_row_groups)
+        self._flush_at = row_group_size
+        self._rows: List[Mapping[str, Any]] = []
+        self._writer: Any = None
+
+    def _flush(self, *, final: bool = False) -> None:
+        if not self._rows:
+            return
+        if self._writer is None:
+            # from_pylist alone would infer columns from the first record only.
+            columns = dict.fromkeys(key for row in self._rows for key in row)
+            table = self._pa.Table.from_pydict(
+                {name: [row.get(name) for row in self._rows] for name in columns}
+            )
+            untyped = any(self._pa.types.is_null(field.type) for field in table.schema)
+            if untyped and not final and len(self._rows) < self._max_deferred:
+                self._flush_at = len(self._rows) + self._row_group_size
+                return
+            self._writer = self._pq.ParquetWriter(
+                self._raw, table.schema, compression=self._compression
+            )
+        else:
+            schema = self._writer.schema
+            unknown = sorted({key for row in self._rows for key in row} - set(schema.names))
+            if unknown:
+                raise ValueError(
+                    f"Records for {Path(self.path).name} have fields {unknown} outside the Parquet "
+                    f"schema inferred from the first row group ({', '.join(schema.names)})"
+                )
+            untyped = sorted(
+                field.name
+                for field in schema
+                if self._pa.types.is_null(field.type)
+                and any(row.get(field.name) is not None for row in self._rows)
+            )
+            if untyped:
+                raise ValueError(
+                    f"Records for {Path(self.path).name} have values for fields {untyped} that were "
+                    f"null in the first {self._max_deferred} records, so their Parquet type is unknown"
+                )
+            table = self._pa.Table.from_pylist(self._rows, schema=schema)
+        self._writer.write_table(table, row_group_size=self._row_group_size)
+        self._rows = []
+        self._flush_at = self._row_group_size
+
+    @property
+    def bytes_written(self) -> int:
+        return self._raw.bytes_written
+
+    @property
+    def sha256(self) -> str:
+        return self._raw.hexdigest()
+
+    def write(self, record: Mapping[str, Any]) -> None:
+        self._rows.append(record)
+        self.records += 1
+        if len(self._rows) >= self._flush_at:
+            self._flush()
+
+    def close(self) -> None:
+        try:
+            self._flush(final=True)
+            if self._writer is not None:
+                self._writer.close()
+        finally:
+            self._raw.close()
+
+    def info(self) -> OutputInfo:
+        return OutputInfo(
+            file=Path(self.path).name,
+            records=self.records,
+            bytes=self.bytes_written,
+            sha256=self.sha256,
+        )
+
+
+OUTPUT_FORMATS = ("jsonl", "parquet")
+SinkFactory = Callable[[Path], Any]
+
+
+def make_sink_factory(
+    output_format: str = "jsonl",
+    *,
+    compression: Optional[str] = None,
+    compression_level: Optional[int] = None,
+    parquet_compression: str = "zstd",
+    parquet_row_group_size: int = 10_000,
+) -> SinkFactory:
+    """Return a callable that opens a sink of ``output_format`` for a path.
+
+    ``compression`` applies to JSONL only and extends the factory's ``suffix``
+    (``.jsonl.gz``/``.jsonl.zst``); Parquet uses ``parquet_compression``.
+    """
+    key = output_format.lower()
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression '{compression}'. Available: {', '.join(COMPRESSIONS)}")
+    if key == "jsonl":
+        if compression is None:
+            return JsonlSink
+        factory = functools.partial(JsonlSink, compression=compression, level=compression_level)
+        factory.suffix = JsonlSink.suffix + _COMPRESSION_SUFFIXES[compression]  # type: ignore[attr-defined]
+        return factory
+    if compression is not None:
+        raise ValueError(
+            "compression applies to jsonl output; use parquet_compression for parquet"
+        )
+    if key == "parquet":
+        factory = functools.partial(
+            ParquetSink,
+            compression=parquet_compression,
+            row_group_size=parquet_row_group_size,
+        )
+        factory.suffix = ParquetSink.suffix  # type: ignore[attr-defined]
+        return factory
+    raise ValueError(f"Unknown output format '{output_format}'. Available: {', '.join(OUTPUT_FORMATS)}")
+
+
+def write_records(records: Iterable[Mapping[str, Any]], sink: Any) -> OutputInfo:
+    """Stream ``records`` into an open sink, close it and describe the result."""
+    try:
+        for record in records:
+            sink.write(record)
+    finally:
+        sink.close()
+    return sink.info()
 
 
 def write_jsonl(
     samples: Iterable[Dict[str, Any]],
     out_path: Path,
-) -> None:
-    """Write iterable samples to ``out_path`` as JSON lines."""
-    # Ensure parent directories exist before streaming out the file.
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    with out_path.open("w", encoding="utf-8") as f:
-        for sample in samples:
-            f.write(json.dumps(sample, ensure_ascii=False) + "\n")
+    compression: Optional[str] = None,
+) -> OutputInfo:
+    """Write iterable samples to ``out_path`` as JSON lines.
+
+    ``compression`` defaults to the extension: ``.jsonl.gz`` is gzip,
+    ``.jsonl.zst`` is zstd, anything else is plain text.
+    """
+    return write_records(samples, JsonlSink(out_path, compression=compression))
+
+
+def write_parquet(
+    samples: Iterable[Dict[str, Any]],
+    out_path: Path,
+    *,
+    compression: str = "zstd",
+    row_group_size: int = 10_000,
+) -> OutputInfo:
+    """Write iterable samples to ``out_path`` as Parquet, one row group at a time."""
+    return write_records(
+        samples,
+        ParquetSink(out_path, compression=compression, row_group_size=row_group_size),
+    )
 
 
 def reformat_and_write(
     samples: Iterable[Dict[str, Any]],
     fmt: str,
     out_path: Path,
-) -> None:
-    """Convert records to the requested format then persist as JSONL."""
+    sink_factory: Optional[SinkFactory] = None,
+    compression: Optional[str] = None,
+) -> OutputInfo:
+    """Convert records to the requested format then persist them.
+
+    Without ``sink_factory`` output is JSONL, compressed with ``compression``
+    (``gzip`` or ``zstd``) or, by default, as the ``.gz``/``.zst`` extension
+    of ``out_path`` implies.
+    """
+    if sink_factory is not None and compression is not None:
+        raise ValueError("Pass compression through sink_factory or the compression flag, not both")
     try:
         formatter = get_formatter(fmt)
     except KeyError as exc:
         raise ValueError(str(exc)) from exc
+    sink = sink_factory(out_path) if sink_factory else JsonlSink(out_path, compression=compression)
     formatted = (formatter(sample) for sample in samples)
-    write_jsonl(formatted, out_path)
+    return write_records(formatted, sink)
+
+
+def write_manifest(
+    out_dir: Path,
+    outputs: Sequence[OutputInfo],
+    **extra: Any,
+) -> Path:
+    """Write ``manifest.json`` with record counts, sizes and checksums per output."""
+    payload: Dict[str, Any] = dict(extra)
+    payload["total_records"] = sum(output.records for output in outputs)
+    payload["files"] = [asdict(output) for output in outputs]
+    manifest_path = out_dir / "manifest.json"
+    manifest_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    return manifest_path
@@ -1,18 +1,82 @@
-"""Lightweight plugin registries for generators and formatters."""
+"""Lightweight plugin registries for generators and formatters.
+
+Registries fill lazily: built-in generators and formatters are imported the
+first time one of them is looked up, and third-party plugins are discovered
+through the ``synthkit.generators`` and ``synthkit.formatters`` entry point
+groups. An entry point may load a factory (or formatter) to register under its
+name, or a module that registers itself on import.
+"""
 
 from __future__ import annotations
 
-from typing import Callable, Mapping, MutableMapping, Sequence
+import importlib
+import logging
+from importlib.metadata import EntryPoint, entry_points
+from typing import TYPE_CHECKING, Callable, Dict, List, Mapping, MutableMapping, Optional, Sequence
+
+if TYPE_CHECKING:
+    from .config import ForgeConfig
+    from .generation.base import BaseGenerator
+    from .models.client_base import ChatClient
 
-from .config import ForgeConfig
-from .generation.base import BaseGenerator
-from .models.client_base import ChatClient
+logger = logging.getLogger(__name__)
 
-GeneratorFactory = Callable[[ChatClient, ForgeConfig], BaseGenerator]
+GeneratorFactory = Callable[["ChatClient", "ForgeConfig"], "BaseGenerator"]
 Formatter = Callable[[Mapping[str, object]], Mapping[str, object]]
+# Returns human-readable problems with a formatted record; empty when it conforms.
+RecordValidator = Callable[[Mapping[str, object]], List[str]]
+
+GENERATOR_ENTRY_POINTS = "synthkit.generators"
+FORMATTER_ENTRY_POINTS = "synthkit.formatters"
+
+# Modules that register the built-in plugins, by plugin name.
+_BUILTIN_GENERATORS: Mapping[str, str] = {
+    "cot": "synthkit.generation.cot_pairs",
+    "qa": "synthkit.generation.qa_pairs",
+}
+_BUILTIN_FORMATTERS: Mapping[str, str] = {
+    "alpaca": "synthkit.export.formats",
+    "chatml": "synthkit.export.formats",
+    "openai-ft": "synthkit.export.formats",
+}
 
 _generator_registry: MutableMapping[str, GeneratorFactory] = {}
 _formatter_registry: MutableMapping[str, Formatter] = {}
+_validator_registry: MutableMapping[str, RecordValidator] = {}
+_entry_point_cache: Dict[str, Dict[str, EntryPoint]] = {}
+
+
+def _entry_points(group: str) -> Dict[str, EntryPoint]:
+    """Installed entry points of ``group`` by lower-cased name, scanned once per process."""
+    if group not in _entry_point_cache:
+        _entry_point_cache[group] = {ep.name.lower(): ep for ep in entry_points(group=group)}
+    return _entry_point_cache[group]
+
+
+def _resolve(
+    key: str,
+    registry: Mapping[str, Callable],
+    builtins: Mapping[str, str],
+    group: str,
+    register: Callable[[str, Callable], None],
+) -> None:
+    """Import the built-in module or load the entry point providing plugin ``key``."""
+    if key in registry:
+        return
+    if key in builtins:
+        importlib.import_module(builtins[key])
+        return
+    ep = _entry_points(group).get(key)
+    if ep is None:
+        return
+    logger.debug("Loading %s plugin '%s' from %s", group, key, ep.value)
+    loaded = ep.load()
+    if key not in registry and callable(loaded):
+        register(key, loaded)
+
+
+def _names(registry: Mapping[str, Callable], builtins: Mapping[str, str], group: str) -> Sequence[str]:
+    return tuple(sorted({*registry, *builtins, *_entry_points(group)}))
 
 
 def register_generator(name: str, factory: GeneratorFactory, *, override: bool = False) -> None:
@@ -24,34 +88,59 @@ def register_generator(name: str, factory: GeneratorFactory, *, override: bool =
 
 
 def get_generator_factory(name: str) -> GeneratorFactory:
-    """Retrieve a generator factory by name."""
+    """Retrieve a generator factory by name, importing its plugin on first use."""
+    key = name.lower()
+    _resolve(key, _generator_registry, _BUILTIN_GENERATORS, GENERATOR_ENTRY_POINTS, register_generator)
     try:
-        return _generator_registry[name.lower()]
-    except KeyError as exc:  # pragma: no cover - simple accessor
+        return _generator_registry[key]
+    except KeyError as exc:
         raise KeyError(f"Unknown generator '{name}'. Available: {available_generator_types()}") from exc
 
 
 def available_generator_types() -> Sequence[str]:
-    """Return registered generator keys sorted alphabetically."""
-    return tuple(sorted(_generator_registry.keys()))
-
-
-def register_formatter(name: str, formatter: Formatter, *, override: bool = False) -> None:
-    """Register a sample formatter under ``name``."""
+    """Return known generator keys sorted alphabetically, without importing any plugin."""
+    return _names(_generator_registry, _BUILTIN_GENERATORS, GENERATOR_ENTRY_POINTS)
+
+
+def register_formatter(
+    name: str,
+    formatter: Formatter,
+    *,
+    validator: Optional[RecordValidator] = None,
+    override: bool = False,
+) -> None:
+    """Register a sample formatter under ``name``, optionally with a schema validator."""
     key = name.lower()
     if not override and key in _formatter_registry:
         raise ValueError(f"Formatter '{name}' already registered")
     _formatter_registry[key] = formatter
+    if validator is not None:
+        _validator_registry[key] = validator
+    else:
+        _validator_registry.pop(key, None)
+
+
+def _resolve_formatter(key: str) -> None:
+    _resolve(key, _formatter_registry, _BUILTIN_FORMATTERS, FORMATTER_ENTRY_POINTS, register_formatter)
 
 
 def get_formatter(name: str) -> Formatter:
-    """Retrieve a formatter by name."""
+    """Retrieve a formatter by name, importing its plugin on first use."""
+    key = name.lower()
+    _resolve_formatter(key)
     try:
-        return _formatter_registry[name.lower()]
-    except KeyError as exc:  # pragma: no cover - simple accessor
+        return _formatter_registry[key]
+    except KeyError as exc:
         raise KeyError(f"Unknown formatter '{name}'. Available: {available_formatter_names()}") from exc
 
 
+def get_formatter_validator(name: str) -> Optional[RecordValidator]:
+    """Return the schema validator registered with formatter ``name``, if any."""
+    key = name.lower()
+    _resolve_formatter(key)
+    return _validator_registry.get(key)
+
+
 def available_formatter_names() -> Sequence[str]:
-    """Return registered formatter keys sorted alphabetically."""
-    return tuple(sorted(_formatter_registry.keys()))
+    """Return known formatter keys sorted alphabetically, without importing any plugin."""
+    return _names(_formatter_registry, _BUILTIN_FORMATTERS, FORMATTER_ENTRY_POINTS)
@@ -18,6 +18,12 @@ class GeneratedItem:
     meta: Dict[str, Any]
 
 
+def source_id_meta(datum: Dict[str, Any]) -> Dict[str, Any]:
+    """Carry the ``source_id`` of a packed-request item into its metadata."""
+    source_id = datum.get("source_id")
+    return {} if source_id is None else {"source_id": str(source_id)}
+
+
 class BaseGenerator:
     """Abstract generator that turns a text chunk into structured examples."""
 
@@ -6,7 +6,7 @@ import json
 import logging
 from typing import List, Optional, Dict, Any
 
-from .base import BaseGenerator, GeneratedItem
+from .base import BaseGenerator, GeneratedItem, source_id_meta
 from ..models.client_base import ChatMessage
 from ..extensions import register_generator
 
@@ -53,6 +53,7 @@ class CoTGenerator(BaseGenerator):
                         **chunk_meta,
                         "index": idx,
                         "source": "cot_generation",
+                        **source_id_meta(datum),
                     },
                 )
             )
@@ -0,0 +1,56 @@
+"""Helpers for packing several short sources into one generation request."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence
+
+PACKING_INSTRUCTION = (
+    "The text below combines several independent sources, each introduced by a "
+    "[source_id: ...] line. Every item you produce must include a \"source_id\" "
+    "field naming the single source it is drawn from."
+)
+
+
+@dataclass
+class PackedSource:
+    """Short text that shares a generation request with other sources."""
+
+    source_id: str
+    text: str
+    meta: Dict[str, Any]
+
+
+def _header(source_id: str) -> str:
+    return f"[source_id: {source_id}]"
+
+
+def packed_length(source: PackedSource) -> int:
+    """Return the characters ``source`` occupies inside a packed request."""
+    return len(_header(source.source_id)) + len(source.text) + 2
+
+
+def pack_sources(sources: Sequence[PackedSource], budget: int) -> List[List[PackedSource]]:
+    """Greedily group ``sources`` in order so each group fits within ``budget`` chars."""
+    groups: List[List[PackedSource]] = []
+    current: List[PackedSource] = []
+    used = len(PACKING_INSTRUCTION)
+    for source in sources:
+        size = packed_length(source)
+        if current and used + size > budget:
+            groups.append(current)
+            current = []
+            used = len(PACKING_INSTRUCTION)
+        current.append(source)
+        used += size
+    if current:
+        groups.append(current)
+    return groups
+
+
+def render_packed_text(group: Sequence[PackedSource]) -> str:
+    """Concatenate a packed group into prompt text with per-source headers."""
+    blocks = [PACKING_INSTRUCTION]
+    for source in group:
+        blocks.append(f"{_header(source.source_id)}\n{source.text.strip()}")
+    return "\n\n".join(blocks)
@@ -0,0 +1,93 @@
+"""Acceptance-rate tracking that sizes mint requests toward a curated target."""
+
+from __future__ import annotations
+
+import math
+
+
+class AcceptanceTargeter:
+    """Estimate judge acceptance from a probe and decide how much more to mint.
+
+    The acceptance rate is a Beta-smoothed ratio of probe items the judge kept,
+    so early estimates are pulled toward ``prior`` until enough items are seen.
+    After ``max_probe_failures`` failed judge calls the probe is abandoned and
+    the estimate stays at whatever has been judged so far (``prior`` if nothing).
+    Minting stops once the expected number of accepted items reaches ``target``.
+    """
+
+    def __init__(
+        self,
+        target: int,
+        max_items_per_request: int = 8,
+        probe_size: int = 16,
+        prior: float = 0.5,
+        prior_weight: float = 2.0,
+        max_probe_failures: int = 3,
+    ):
+        if target <= 0:
+            raise ValueError(f"target must be positive, got {target}")
+        if not 0.0 < prior <= 1.0:
+            raise ValueError(f"prior must be in (0, 1], got {prior}")
+        self.target = target
+        self.max_items_per_request = max(1, max_items_per_request)
+        self.probe_size = probe_size
+        self.prior = prior
+        self.prior_weight = prior_weight
+        self.max_probe_failures = max_probe_failures
+        self.probe_failures = 0
+        self.minted = 0
+        self.judged = 0
+        self.accepted = 0
+
+    @property
+    def acceptance_rate(self) -> float:
+        """Smoothed fraction of judged items that passed the judge."""
+        rate = (self.accepted + self.prior * self.prior_weight) / (self.judged + self.prior_weight)
+        # Never divide by zero when projecting; a fully rejecting probe still mints slowly.
+        return max(rate, 1e-3)
+
+    @property
+    def probe_pending(self) -> int:
+        """Number of freshly minted items that should still be judged for the probe."""
+        if self.probe_abandoned:
+            return 0
+        return max(self.probe_size - self.judged, 0)
+
+    @property
+    def probe_abandoned(self) -> bool:
+        """Whether the probe stopped early because judge calls kept failing."""
+        return self.probe_failures >= self.max_probe_failures
+
+    @property
+    def expected_accepted(self) -> float:
+        """Projected curated yield of everything minted so far."""
+        return self.minted * self.acceptance_rate
+
+    @property
+    def done(self) -> bool:
+        """Whether minting can stop because the target is expected to be met."""
+        return self.probe_pending == 0 and self.expected_accepted >= self.target
+
+    def record_minted(self, count: int) -> None:
+        self.minted += count
+
+    def record_judged(self, accepted: int, total: int) -> None:
+        self.accepted += accepted
+        self.judged += total
+
+    def record_probe_failure(self, count: int = 1) -> None:
+        self.probe_failures += count
+
+    def needed_raw(self) -> int:
+        """Raw items still required to reach ``target`` at the current rate."""
+        missing = self.target - self.expected_accepted
+        return max(math.ceil(missing / self.acceptance_rate), 0)
+
+    def items_for_request(self, budget: int) -> int:
+        """Items to request next: as many as one call allows, but no more than needed."""
+        needed = self.needed_raw() if self.probe_pending == 0 else self.max_items_per_request
+        return max(1, min(self.max_items_per_request, budget, needed))
+
+    def projected_requests(self) -> int:
+        """Generation requests still expected before the target is reached."""
+        return math.ceil(self.needed_raw() / self.max_items_per_request)
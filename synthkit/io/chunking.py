@@ -2,26 +2,34 @@
 
 from __future__ import annotations
 
-from typing import List
+from typing import List, Tuple
 
 
-def chunk_text(
-    text: str,
+def chunk_spans(
+    length: int,
     chunk_size: int,
     overlap: int,
-) -> List[str]:
-    """Return sliding-window chunks with ``overlap`` characters between slices."""
-    if len(text) <= chunk_size:
-        return [text]
+) -> List[Tuple[int, int]]:
+    """Return ``(start, end)`` offsets of the chunks ``chunk_text`` would produce."""
+    if length <= chunk_size:
+        return [(0, length)]
 
-    chunks: List[str] = []
+    spans: List[Tuple[int, int]] = []
     start = 0
-    total_len = len(text)
-    while start < total_len:
-        end = min(total_len, start + chunk_size)
-        chunks.append(text[start:end])
-        if end == total_len:
+    while start < length:
+        end = min(length, start + chunk_size)
+        spans.append((start, end))
+        if end == length:
             break
         # Step forward while rewinding ``overlap`` chars to preserve context.
         start = max(0, end - overlap)
-    return chunks
+    return spans
+
+
+def chunk_text(
+    text: str,
+    chunk_size: int,
+    overlap: int,
+) -> List[str]:
+    """Return sliding-window chunks with ``overlap`` characters between slices."""
+    return [text[start:end] for start, end in chunk_spans(len(text), chunk_size, overlap)]
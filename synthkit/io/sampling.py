@@ -0,0 +1,64 @@
+"""Seeded stratified sampling used for quick preview runs."""
+
+from __future__ import annotations
+
+import math
+import random
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+def position_bucket(index: int, total: int, buckets: int = 3) -> int:
+    """Map a chunk index to its coarse position (start, middle, end) in a document."""
+    if total <= 1:
+        return 0
+    return min(index * buckets // total, buckets - 1)
+
+
+def sample_size(population: int, fraction: Optional[float], count: Optional[int]) -> int:
+    """Resolve a fraction or fixed count into a sample size within ``population``."""
+    if fraction is not None and count is not None:
+        raise ValueError("Specify either a sample fraction or a sample count, not both")
+    if fraction is not None:
+        if not 0.0 < fraction <= 1.0:
+            raise ValueError(f"sample fraction must be in (0, 1], got {fraction}")
+        return min(population, max(1, math.ceil(population * fraction))) if population else 0
+    if count is not None:
+        if count <= 0:
+            raise ValueError(f"sample count must be positive, got {count}")
+        return min(population, count)
+    return population
+
+
+def stratified_sample(
+    units: Sequence[T],
+    size: int,
+    stratum: Callable[[T], Hashable],
+    seed: int = 0,
+) -> List[T]:
+    """Pick ``size`` units spread proportionally across strata.
+
+    Units are grouped by ``stratum``, shuffled within each stratum, laid out
+    stratum by stratum, and then picked systematically from a seeded random
+    offset. Every stratum therefore receives its proportional share (within one
+    unit) and the result is reproducible for a given ``seed``. The selection is
+    returned in the original order of ``units``.
+    """
+    if size >= len(units):
+        return list(units)
+    if size <= 0:
+        return []
+    rng = random.Random(seed)
+    groups: Dict[Hashable, List[int]] = {}
+    for position, unit in enumerate(units):
+        groups.setdefault(stratum(unit), []).append(position)
+    ordered: List[int] = []
+    for key in groups:
+        members = groups[key]
+        rng.shuffle(members)
+        ordered.extend(members)
+    step = len(ordered) / size
+    offset = rng.random() * step
+    picked = sorted(ordered[int(offset + i * step)] for i in range(size))
+    return [units[position] for position in picked]
@@ -0,0 +1,381 @@
+"""Prometheus metrics for model requests, stage throughput and queue depths."""
+
+from __future__ import annotations
+
+import abc
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from .config import ForgeConfig, ModelRef
+from .models.client_base import ChatClient, ChatClientError
+from .models.pricing import approx_tokens
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(abc.ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Mapping[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            expected = ", ".join(self.labelnames) or "none"
+            raise ValueError(f"{self.name} expects labels {expected}, got {', '.join(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _pairs(self, key: Tuple[str, ...]) -> List[Tuple[str, str]]:
+        return list(zip(self.labelnames, key))
+
+    @abc.abstractmethod
+    def samples(self) -> List[str]:
+        """Exposition lines for every labelled series of this metric."""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonic total per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        if amount < 0:
+            raise ValueError(f"{self.name} can only increase, got {amount}")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self._pairs(key))} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Gauge(Counter):
+    """Current value per label combination."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative ``le`` buckets, with their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._series.get(key, ([0] * len(self.buckets), 0.0))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            self._series[key] = (counts, total + value)
+
+    def count(self, **labels: Any) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+        return series[0][-1] if series else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            series = sorted(
+                (key, (list(counts), total)) for key, (counts, total) in self._series.items()
+            )
+        lines = []
+        for key, (counts, total) in series:
+            pairs = self._pairs(key)
+            for bound, count in zip(self.buckets, counts):
+                labels = _format_labels(pairs + [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(pairs)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(pairs)} {counts[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics rendered together in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+REQUESTS = REGISTRY.counter(
+    "synthkit_requests_total",
+    "Model requests by provider, model and outcome.",
+    ("provider", "model", "status"),
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "synthkit_request_duration_seconds", "Model request latency.", ("provider", "model")
+)
+TOKENS = REGISTRY.counter(
+    "synthkit_tokens_total",
+    "Approximate prompt (input) and completion (output) tokens.",
+    ("provider", "model", "direction"),
+)
+IN_FLIGHT = REGISTRY.gauge(
+    "synthkit_requests_in_flight", "Model requests awaiting a reply.", ("stage",)
+)
+STAGE_DONE = REGISTRY.counter(
+    "synthkit_stage_done_total", "Documents or files a stage has finished.", ("stage",)
+)
+STAGE_ITEMS = REGISTRY.counter(
+    "synthkit_stage_items_total",
+    "Per-stage tallies such as chunks, items minted, kept, rejected or duplicates.",
+    ("stage", "outcome"),
+)
+STAGE_ERRORS = REGISTRY.counter(
+    "synthkit_stage_errors_total", "Errors recorded by a stage.", ("stage",)
+)
+QUEUE_DEPTH = REGISTRY.gauge(
+    "synthkit_queue_depth", "Items in work and streaming queues by status.", ("queue", "status")
+)
+
+
+class MeteredClient:
+    """Chat client wrapper that records request outcome, latency and tokens for ``ref``."""
+
+    def __init__(self, client: ChatClient, ref: ModelRef, chars_per_token: float = 4.0):
+        self._client = client
+        self._labels = {"provider": ref.provider, "model": ref.name}
+        self._chars_per_token = chars_per_token
+
+    def _call(self, call: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        started = time.monotonic()
+        try:
+            result = call(*args, **kwargs)
+        except ChatClientError:
+            REQUESTS.inc(status="error", **self._labels)
+            raise
+        finally:
+            REQUEST_SECONDS.observe(time.monotonic() - started, **self._labels)
+        REQUESTS.inc(status="ok", **self._labels)
+        messages = args[0] if args else kwargs.get("messages", [])
+        text = result[0] if isinstance(result, tuple) else result
+        prompt = sum(approx_tokens(message.content, self._chars_per_token) for message in messages)
+        TOKENS.inc(prompt, direction="input", **self._labels)
+        completion = approx_tokens(text or "", self._chars_per_token)
+        TOKENS.inc(completion, direction="output", **self._labels)
+        return result
+
+    def chat(self, messages, temperature, max_tokens):
+        return self._call(self._client.chat, messages, temperature=temperature, max_tokens=max_tokens)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if name.startswith("chat") and callable(attr):
+            return lambda *args, **kwargs: self._call(attr, *args, **kwargs)
+        return attr
+
+    def close(self) -> None:
+        close = getattr(self._client, "close", None)
+        if callable(close):
+            close()
+
+
+def record_queue_depth(queue: str, counts: Mapping[str, int]) -> None:
+    """Publish the number of items per status in ``queue``."""
+    for status, count in counts.items():
+        QUEUE_DEPTH.set(count, queue=queue, status=status)
+
+
+def _handler_class(registry: MetricsRegistry) -> type:
+    """Build the ``/metrics`` request handler; http.server is only imported when serving."""
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - signature from base
+            logger.debug("metrics %s - " + format, self.address_string(), *args)
+
+    return MetricsHandler
+
+
+class MetricsExporter:
+    """Serve ``/metrics`` over HTTP and/or rewrite a Prometheus textfile periodically.
+
+    The textfile is replaced atomically, as node_exporter's textfile collector
+    expects, every ``interval`` seconds and once more on :meth:`close`.
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: Optional[int] = None,
+        textfile: Optional[Path] = None,
+        interval: float = 15.0,
+        registry: MetricsRegistry = REGISTRY,
+    ):
+        if interval <= 0:
+            raise ValueError(f"metrics interval must be positive, got {interval}")
+        self.registry = registry
+        self.textfile = textfile
+        self.interval = interval
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._server: Optional[ThreadingHTTPServer] = None
+        if port is not None:
+            from http.server import ThreadingHTTPServer
+
+            self._server = ThreadingHTTPServer((host, port), _handler_class(registry))
+            self._server.daemon_threads = True
+            self._spawn(self._server.serve_forever, "synthkit-metrics-http")
+            logger.info("Serving metrics on http://%s:%s/metrics", host, self.port)
+        if textfile is not None:
+            textfile.parent.mkdir(parents=True, exist_ok=True)
+            self._spawn(self._write_loop, "synthkit-metrics-textfile")
+
+    def _spawn(self, target: Callable[[], None], name: str) -> None:
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    @property
+    def port(self) -> Optional[int]:
+        return self._server.server_address[1] if self._server is not None else None
+
+    def write_textfile(self) -> None:
+        if self.textfile is None:
+            return
+        tmp = self.textfile.with_name(self.textfile.name + ".tmp")
+        tmp.write_text(self.registry.render(), encoding="utf-8")
+        tmp.replace(self.textfile)
+
+    def _write_loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.write_textfile()
+            except OSError as exc:
+                logger.warning("Could not write metrics textfile %s: %s", self.textfile, exc)
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        for thread in self._threads:
+            thread.join()
+        self.write_textfile()
+
+
+@contextmanager
+def metrics_scope(cfg: ForgeConfig) -> Iterator[Optional[MetricsExporter]]:
+    """Export metrics as configured in ``metrics`` while the block runs; ``None`` if disabled."""
+    settings = cfg.metrics
+    textfile = cfg.io.working_root / settings.textfile if settings.textfile else None
+    if settings.http_port is None and textfile is None:
+        yield None
+        return
+    exporter = MetricsExporter(
+        host=settings.http_host,
+        port=settings.http_port,
+        textfile=textfile,
+        interval=settings.interval,
+    )
+    try:
+        yield exporter
+    finally:
+        exporter.close()
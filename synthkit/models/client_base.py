@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Protocol
+from typing import Any, Dict, List, Protocol, Tuple
 
 
 @dataclass
@@ -50,3 +50,18 @@ class ChatClient(Protocol):
     def close(self) -> None:  # pragma: no cover - optional hook
         """Close any open resources (sockets, sessions)."""
         ...
+
+
+TokenLogprobs = List[Dict[str, float]]
+
+
+def parse_openai_logprobs(data: Dict[str, Any]) -> Tuple[str, TokenLogprobs]:
+    """Extract text plus per-position ``{token: logprob}`` maps from a completion."""
+    choice = data["choices"][0]
+    content = choice["message"]["content"] or ""
+    positions: TokenLogprobs = []
+    for entry in (choice.get("logprobs") or {}).get("content") or []:
+        top = {item["token"]: item["logprob"] for item in entry.get("top_logprobs") or []}
+        top.setdefault(entry["token"], entry["logprob"])
+        positions.append(top)
+    return content, positions
@@ -2,13 +2,19 @@
 
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 from requests import Session
 from requests.exceptions import RequestException
 
-from .client_base import ChatClient, ChatMessage, ChatClientError
+from .client_base import (
+    ChatClient,
+    ChatMessage,
+    ChatClientError,
+    TokenLogprobs,
+    parse_openai_logprobs,
+)
 from ..config import ProviderConfig
 from .session import create_retry_session
 
@@ -27,24 +33,13 @@ class HTTPChatClient(ChatClient):
         self._model_name = model_name
         self._session = session or create_retry_session()
 
-    def chat(
-        self,
-        messages: List[ChatMessage],
-        temperature: float,
-        max_tokens: int,
-    ) -> str:
-        """Send the request to the configured base URL."""
+    def _complete(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST ``payload`` to /chat/completions and return the decoded JSON body."""
         url = self._cfg.api_base.rstrip("/") + "/chat/completions"
         headers = {
             "Authorization": "Bearer my-secret-key",
             "Content-Type": "application/json",
         }
-        payload = {
-            "model": self._model_name,
-            "messages": [message.__dict__ for message in messages],
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-        }
         try:
             resp = self._session.post(url, json=payload, headers=headers, timeout=60)
             resp.raise_for_status()
@@ -56,8 +51,44 @@ class HTTPChatClient(ChatClient):
                 message=str(exc),
                 status_code=status,
             ) from exc
-        data = resp.json()
+        return resp.json()
+
+    def chat(
+        self,
+        messages: List[ChatMessage],
+        temperature: float,
+        max_tokens: int,
+    ) -> str:
+        """Send the request to the configured base URL."""
+        data = self._complete(
+            {
+                "model": self._model_name,
+                "messages": [message.__dict__ for message in messages],
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+            }
+        )
         return data["choices"][0]["message"]["content"]
 
+    def chat_logprobs(
+        self,
+        messages: List[ChatMessage],
+        temperature: float,
+        max_tokens: int,
+        top_logprobs: int = 10,
+    ) -> Tuple[str, TokenLogprobs]:
+        """Like ``chat`` but also return the top token logprobs for each position."""
+        data = self._complete(
+            {
+                "model": self._model_name,
+                "messages": [message.__dict__ for message in messages],
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "logprobs": True,
+                "top_logprobs": top_logprobs,
+            }
+        )
+        return parse_openai_logprobs(data)
+
     def close(self) -> None:
         self._session.close()
@@ -3,13 +3,19 @@
 from __future__ import annotations
 
 import os
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 from requests import Session
 from requests.exceptions import RequestException
 
-from .client_base import ChatClient, ChatMessage, ChatClientError
+from .client_base import (
+    ChatClient,
+    ChatMessage,
+    ChatClientError,
+    TokenLogprobs,
+    parse_openai_logprobs,
+)
 from ..config import ProviderConfig
 from .session import create_retry_session
 
@@ -32,24 +38,13 @@ class OpenAIChatClient(ChatClient):
             raise RuntimeError(f"Missing API key env var: {api_key_env}")
         self._session = session or create_retry_session()
 
-    def chat(
-        self,
-        messages: List[ChatMessage],
-        temperature: float,
-        max_tokens: int,
-    ) -> str:
-        """Perform a chat completion request using the configured credentials."""
+    def _complete(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST ``payload`` to /chat/completions and return the decoded JSON body."""
         url = self._cfg.api_base.rstrip("/") + "/chat/completions"
         headers = {
             "Authorization": f"Bearer {self._api_key}",
             "Content-Type": "application/json",
         }
-        payload = {
-            "model": self._model_name,
-            "messages": [message.__dict__ for message in messages],
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-        }
         try:
             resp = self._session.post(url, json=payload, headers=headers, timeout=60)
             resp.raise_for_status()
@@ -63,8 +58,44 @@ class OpenAIChatClient(ChatClient):
                 message=detail,
                 status_code=status,
             ) from exc
-        data = resp.json()
+        return resp.json()
+
+    def chat(
+        self,
+        messages: List[ChatMessage],
+        temperature: float,
+        max_tokens: int,
+    ) -> str:
+        """Perform a chat completion request using the configured credentials."""
+        data = self._complete(
+            {
+                "model": self._model_name,
+                "messages": [message.__dict__ for message in messages],
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+            }
+        )
         return data["choices"][0]["message"]["content"]
 
+    def chat_logprobs(
+        self,
+        messages: List[ChatMessage],
+        temperature: float,
+        max_tokens: int,
+        top_logprobs: int = 10,
+    ) -> Tuple[str, TokenLogprobs]:
+        """Like ``chat`` but also return the top token logprobs for each position."""
+        data = self._complete(
+            {
+                "model": self._model_name,
+                "messages": [message.__dict__ for message in messages],
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "logprobs": True,
+                "top_logprobs": top_logprobs,
+            }
+        )
+        return parse_openai_logprobs(data)
+
     def close(self) -> None:
         self._session.close()
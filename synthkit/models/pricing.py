@@ -0,0 +1,28 @@
+"""Approximate token counts and per-model request prices."""
+
+from __future__ import annotations
+
+import math
+from typing import Optional
+
+from ..config import ForgeConfig, ModelRef
+
+
+def approx_tokens(text: str, chars_per_token: float = 4.0) -> int:
+    """Estimate the token count of ``text`` from its length; exact tokenizers vary by model."""
+    if not text:
+        return 0
+    return math.ceil(len(text) / chars_per_token)
+
+
+def token_cost(
+    cfg: ForgeConfig, ref: ModelRef, input_tokens: int, output_tokens: int
+) -> Optional[float]:
+    """Return the price of the given tokens on ``ref``, or ``None`` if it has no price."""
+    provider = cfg.providers.get(ref.provider)
+    price = provider.prices.get(ref.name) if provider is not None else None
+    if price is None:
+        return None
+    return (
+        input_tokens * price.get("input", 0.0) + output_tokens * price.get("output", 0.0)
+    ) / 1_000_000
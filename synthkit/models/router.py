@@ -10,6 +10,9 @@ from .anthropic_client import AnthropicChatClient
 from .http_client import HTTPChatClient
 from .ollama_client import OllamaChatClient
 from ..config import ForgeConfig, ModelRef, ProviderConfig
+from ..budget import BudgetedClient
+from ..metrics import MeteredClient
+from ..progress import TrackedClient
 
 
 def _build_client(provider_cfg: ProviderConfig, model_name: str) -> ChatClient:
@@ -31,22 +34,37 @@ class ModelRouter:
     def __init__(self, cfg: ForgeConfig):
         self._cfg = cfg
         self._cache: Dict[str, ChatClient] = {}
+        self._tracked: Dict[str, ChatClient] = {}
 
     def for_stage(self, ref: ModelRef) -> ChatClient:
         """Return (and memoize) the client for the requested model reference."""
-        key = f"{ref.provider}:{ref.name}"
+        key = ref.key
         if key in self._cache:
             return self._cache[key]
 
-        provider_cfg = self._cfg.providers[ref.provider]
-        client = _build_client(provider_cfg, ref.name)
+        # Requests are charged to the run's budget, which may reroute them to a fallback.
+        client = BudgetedClient(self._tracked_client(ref), ref, self._tracked_client)
         self._cache[key] = client
         return client
 
+    def _tracked_client(self, ref: ModelRef) -> ChatClient:
+        key = ref.key
+        if key not in self._tracked:
+            provider_cfg = self._cfg.providers[ref.provider]
+            client = MeteredClient(
+                _build_client(provider_cfg, ref.name),
+                ref,
+                chars_per_token=self._cfg.estimate.chars_per_token,
+            )
+            # Requests are counted against whichever stage is running when they are made.
+            self._tracked[key] = TrackedClient(client)
+        return self._tracked[key]
+
     def close_all(self) -> None:
         """Close all cached clients and clear the memoized map."""
-        for client in self._cache.values():
+        for client in self._tracked.values():
             close = getattr(client, "close", None)
             if callable(close):
                 close()
         self._cache.clear()
+        self._tracked.clear()
@@ -4,12 +4,23 @@ from __future__ import annotations
 
 import json
 import logging
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
 
-from ..config import ForgeConfig
+from ..budget import BudgetExceeded, budget_scope
+from ..config import ForgeConfig, ModelRef
 from ..models.router import ModelRouter
-from ..curation.llm_judge import LLMJudge
+from ..curation.llm_judge import LLMJudge, create_judge
+from ..curation.prefilter import HeuristicPrefilter
+from ..curation.cascade import CascadeJudge
+from ..curation.judge_base import JudgedItem
+from ..curation.verdict_cache import VerdictCache, open_verdict_cache
+from ..io.chunking import chunk_spans
+from ..progress import advance, note, track_stage
+from .buildgraph import BuildGraph, stage_fingerprint
+from .journal import AuditJournal, file_digest, sample_digest
+from .store import ArtifactStore, list_minted, open_artifact_store, read_harvested, read_minted
 
 logger = logging.getLogger(__name__)
 
@@ -23,46 +34,308 @@ def _is_valid_sample(sample: Dict[str, Any]) -> bool:
     return isinstance(question, str) and isinstance(answer, str)
 
 
-def run_audit(cfg: ForgeConfig) -> List[Path]:
-    """Run the LLM judge across all minted files and save curated outputs."""
-    router = ModelRouter(cfg)
-    judge_client = router.for_stage(cfg.models.audit_judge)
-    judge = LLMJudge(judge_client, cfg)
+class _SourceChunks:
+    """Resolve a sample's source chunk from its mint metadata, caching the last file."""
 
-    audited_dir = cfg.io.audited_path
-    audited_dir.mkdir(parents=True, exist_ok=True)
+    def __init__(self, cfg: ForgeConfig, store: Optional[ArtifactStore] = None):
+        self._cfg = cfg
+        self._store = store
+        self._path: Optional[str] = None
+        self._text: Optional[str] = None
 
-    outputs: List[Path] = []
-    try:
-        for minted_file in cfg.io.minted_path.glob("*.json"):
-            raw = json.loads(minted_file.read_text(encoding="utf-8"))
-            if not isinstance(raw, list):
-                logger.warning("Skipping %s; expected list payload", minted_file.name)
-                continue
-            curated = []
-            for sample in raw:
-                if not _is_valid_sample(sample):
-                    logger.warning("Dropping malformed sample from %s", minted_file.name)
-                    continue
-                judged = judge.judge(sample)
-                if judged.keep:
-                    curated.append(
-                        sample
-                        | {
-                            "score": judged.score,
-                            "label": judged.label,
-                            "judge_rationale": judged.rationale,
-                        }
+    def lookup(self, sample: Dict[str, Any]) -> Optional[str]:
+        meta = sample.get("meta")
+        if not isinstance(meta, dict) or not meta.get("source_file"):
+            return None
+        path = str(meta["source_file"])
+        if path != self._path:
+            self._path = path
+            try:
+                self._text = read_harvested(self._store, Path(path))
+            except OSError:
+                logger.debug("Source file %s unavailable for prefilter", path)
+                self._text = None
+        if self._text is None:
+            return None
+        start, end = meta.get("chunk_start"), meta.get("chunk_end")
+        if start is None or end is None:
+            # Older minted files only record the chunk index; recompute its span.
+            spans = chunk_spans(
+                len(self._text), self._cfg.generation.chunk_size, self._cfg.generation.chunk_overlap
+            )
+            index = meta.get("chunk_index")
+            if not isinstance(index, int) or not 0 <= index < len(spans):
+                return None
+            start, end = spans[index]
+        return self._text[start:end]
+
+
+def _build_judge(
+    cfg: ForgeConfig,
+    router: ModelRouter,
+    cache: Optional[VerdictCache],
+    offline: bool,
+) -> Tuple[Union[LLMJudge, CascadeJudge], Dict[str, LLMJudge]]:
+    """Return the judge used for audit plus its per-tier ``LLMJudge`` instances."""
+
+    def tier(ref: ModelRef) -> LLMJudge:
+        client = None if offline else router.for_stage(ref)
+        return create_judge(client, cfg, cache=cache, model_id=ref.key)
+
+    strong = tier(cfg.models.audit_judge)
+    if cfg.models.audit_screener is None:
+        return strong, {"judge": strong}
+    screener = tier(cfg.models.audit_screener)
+    cascade = CascadeJudge(screener, strong, band=cfg.curation.cascade_band)
+    return cascade, {"screener": screener, "judge": strong}
+
+
+class _Auditor:
+    """Judge minted files one at a time while accumulating run statistics."""
+
+    def __init__(
+        self,
+        cfg: ForgeConfig,
+        judge: Union[LLMJudge, CascadeJudge],
+        tiers: Dict[str, LLMJudge],
+        cache: Optional[VerdictCache],
+        journal: Optional[AuditJournal] = None,
+        offline: bool = False,
+        store: Optional[ArtifactStore] = None,
+    ):
+        self.cfg = cfg
+        self.store = store
+        self.judge = judge
+        self.tiers = tiers
+        self.cache = cache
+        self.journal = journal
+        self.offline = offline
+        self.prefilter = (
+            HeuristicPrefilter(cfg.curation.prefilter) if cfg.curation.prefilter.enabled else None
+        )
+        self.sources = _SourceChunks(cfg, store)
+        self.counts = {
+            "files": 0,
+            "samples": 0,
+            "malformed": 0,
+            "prefiltered": 0,
+            "uncached": 0,
+            "rejected": 0,
+            "kept": 0,
+            "resumed_files": 0,
+            "resumed_samples": 0,
+        }
+
+    def _decide(self, name: str, sample: Any) -> Tuple[str, Optional[JudgedItem]]:
+        """Return the status of one sample and its verdict when it was judged."""
+        if not _is_valid_sample(sample):
+            logger.warning("Dropping malformed sample from %s", name)
+            return "malformed", None
+        if self.prefilter is not None:
+            reason = self.prefilter.check(sample, self.sources.lookup(sample))
+            if reason is not None:
+                logger.debug("Prefilter dropped sample from %s (%s)", name, reason)
+                return "prefiltered", None
+        if self.offline:
+            judged = self.judge.cached_verdict(sample)
+            if judged is None:
+                return "uncached", None
+        else:
+            judged = self.judge.judge(sample)
+        return ("kept" if judged.keep else "rejected"), judged
+
+    def audit_file(self, minted_file: Path) -> Optional[Path]:
+        """Audit one minted file and return the curated output path."""
+        digest = ""
+        if self.journal is not None:
+            digest = (
+                self.store.minted_digest(minted_file.name) or ""
+                if self.store is not None
+                else file_digest(minted_file)
+            )
+            done = self.journal.completed_output(
+                minted_file.name,
+                digest,
+                exists=self.store.is_audited if self.store is not None else None,
+            )
+            if done is not None:
+                logger.info("Skipping %s; already audited", minted_file.name)
+                self.counts["resumed_files"] += 1
+                advance()
+                return done
+
+        raw = read_minted(self.store, minted_file)
+        if not isinstance(raw, list):
+            logger.warning("Skipping %s; expected list payload", minted_file.name)
+            advance()
+            return None
+        self.counts["files"] += 1
+        curated = []
+        decisions = []
+        for index, sample in enumerate(raw):
+            self.counts["samples"] += 1
+            entry = None
+            sample_key = ""
+            if self.journal is not None:
+                sample_key = sample_digest(sample)
+                entry = self.journal.sample_decision(minted_file.name, index, sample_key)
+            if entry is not None:
+                self.counts["resumed_samples"] += 1
+                status = entry["status"]
+                verdict = {key: entry.get(key) for key in ("score", "label", "judge_rationale")}
+            else:
+                status, judged = self._decide(minted_file.name, sample)
+                verdict = {}
+                if judged is not None:
+                    verdict = {
+                        "score": judged.score,
+                        "label": judged.label,
+                        "judge_rationale": judged.rationale,
+                    }
+                # Offline misses are not decisions; a later online resume must judge them.
+                if self.journal is not None and status != "uncached":
+                    self.journal.record_sample(
+                        minted_file.name, index, sample_key, status, **verdict
                     )
+            self.counts[status] += 1
+            note(status)
+            if status != "uncached":
+                decisions.append((index, status, verdict))
+            if status == "kept":
+                curated.append(sample | verdict)
 
-            out_path = audited_dir / minted_file.name.replace(".json", ".audited.json")
+        out_path = self.cfg.io.audited_path / minted_file.name.replace(".json", ".audited.json")
+        if self.store is not None:
+            # Curated samples are the store's kept rows; decisions update them in place.
+            self.store.record_audit(minted_file.name, decisions)
+        else:
             # Persist curated payloads with deterministic formatting for diff-friendly review.
             out_path.write_text(
                 json.dumps(curated, ensure_ascii=False, indent=2),
                 encoding="utf-8",
             )
-            outputs.append(out_path)
+        if self.journal is not None:
+            self.journal.record_file(minted_file.name, digest, out_path)
+        advance()
+        return out_path
+
+    def write_report(self, name: str = "audit_report.json") -> Dict[str, Any]:
+        """Log run statistics and persist them as ``name`` in the audited directory."""
+        report: Dict[str, Any] = dict(self.counts)
+        report["judge_calls"] = {name: tier.calls for name, tier in self.tiers.items()}
+        if self.prefilter is not None:
+            self.prefilter.log_summary()
+            report["prefilter_rejections"] = dict(self.prefilter.rejections)
+        if self.cache is not None:
+            logger.info("Verdict cache: %s hits, %s misses", self.cache.hits, self.cache.misses)
+            report["verdict_cache"] = {"hits": self.cache.hits, "misses": self.cache.misses}
+        if isinstance(self.judge, CascadeJudge):
+            stats = self.judge.stats
+            report["cascade"] = stats.as_dict() | {"band": self.judge.band}
+            logger.info(
+                "Cascade: %s screened, %s escalated, agreement on escalations %s",
+                stats.screened,
+                stats.escalated,
+                stats.agreement_rate,
+            )
+        if self.counts["uncached"]:
+            logger.warning(
+                "Offline audit skipped %s samples without cached verdicts", self.counts["uncached"]
+            )
+        (self.cfg.io.audited_path / name).write_text(
+            json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        return report
+
+
+@contextmanager
+def _auditor_session(
+    cfg: ForgeConfig,
+    offline: bool = False,
+    resume: bool = False,
+    journal_path: Optional[Path] = None,
+) -> Iterator[_Auditor]:
+    """Build an ``_Auditor`` with its judge, cache and journal and close them afterwards.
+
+    ``journal_path`` defaults to ``io.audit_journal_path``; concurrent workers
+    each pass their own.
+    """
+    cache = open_verdict_cache(cfg)
+    if offline and cache is None:
+        raise ValueError("Offline audit requires curation.verdict_cache to be enabled")
+    router = ModelRouter(cfg)
+    journal: Optional[AuditJournal] = None
+    store: Optional[ArtifactStore] = None
+    try:
+        judge, tiers = _build_judge(cfg, router, cache, offline)
+        journal = AuditJournal(
+            journal_path or cfg.io.audit_journal_path,
+            resume=resume,
+            fingerprint=stage_fingerprint(cfg, "audit"),
+        )
+        store = open_artifact_store(cfg)
+        cfg.io.audited_path.mkdir(parents=True, exist_ok=True)
+        with budget_scope(cfg):
+            yield _Auditor(cfg, judge, tiers, cache, journal, offline, store)
     finally:
         router.close_all()
+        if store is not None:
+            store.close()
+        if journal is not None:
+            journal.close()
+        if cache is not None:
+            cache.close()
 
+
+def run_audit(
+    cfg: ForgeConfig,
+    offline: bool = False,
+    resume: bool = False,
+    graph: Optional[BuildGraph] = None,
+) -> List[Path]:
+    """Run the LLM judge across all minted files and save curated outputs.
+
+    Verdicts are cached in ``io.judge_cache_path`` (unless
+    ``curation.verdict_cache`` is off), so reruns only judge new or changed
+    samples. With ``offline=True`` no model is called at all: cached verdicts
+    are re-thresholded against the current ``curation.min_score`` and uncached
+    samples are left out.
+
+    When ``models.audit_screener`` is configured the audit cascades: the
+    screener scores every sample and only scores within ``curation.cascade_band``
+    of ``curation.min_score`` are escalated to ``models.audit_judge``.
+    Run statistics are written to ``audit_report.json`` in the audited directory.
+
+    Every decision is appended to ``io.audit_journal_path``. With ``resume=True``
+    files finished by an earlier run are skipped and samples already decided in
+    an interrupted file are not judged again.
+
+    With a build ``graph``, minted files whose curated output is up to date for
+    the current curation settings, prompts and judge models are skipped.
+
+    With ``io.artifact_store_file`` set, decisions are stored on the minted
+    items in the artifact store instead of writing curated files.
+    """
+    fingerprint = stage_fingerprint(cfg, "audit", offline=offline)
+    outputs: List[Path] = []
+    with _auditor_session(cfg, offline=offline, resume=resume) as auditor:
+        inputs = list_minted(cfg, auditor.store)
+        with track_stage(cfg, "audit", total=len(inputs), unit="file") as progress:
+            try:
+                for minted_file in inputs:
+                    node = BuildGraph.node_id("audit", minted_file)
+                    if graph is not None and graph.is_current(node, [minted_file], fingerprint):
+                        outputs.extend(graph.reuse(node))
+                        progress.add("reused")
+                        progress.advance()
+                        continue
+                    out_path = auditor.audit_file(minted_file)
+                    if out_path is not None:
+                        outputs.append(out_path)
+                        if graph is not None:
+                            graph.record(node, [minted_file], fingerprint, [out_path])
+            except BudgetExceeded as exc:
+                # Decisions so far are journaled; ``--resume`` picks up from here.
+                logger.warning("Stopping audit: %s", exc)
+        auditor.write_report()
     return outputs
@@ -0,0 +1,281 @@
+"""Content-hash dependency records that let runs skip artifacts whose inputs are unchanged."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from collections import Counter
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from ..config import ForgeConfig
+from ..io.loaders import discover_source_files
+from .journal import file_digest
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("harvest", "mint", "audit", "package")
+
+
+def _hash_json(payload: Any) -> str:
+    blob = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def stage_fingerprint(cfg: ForgeConfig, stage: str, **extra: Any) -> str:
+    """Hash the config sections, prompts and model refs that shape ``stage`` outputs.
+
+    ``extra`` carries run arguments such as generator kinds or export format.
+    """
+    models = cfg.models
+    prompts = cfg.prompts
+    if stage == "harvest":
+        payload: Dict[str, Any] = {}
+    elif stage == "mint":
+        payload = {
+            "generation": asdict(cfg.generation),
+            "prompts": [prompts.qa_generation, prompts.cot_generation, prompts.classifier_generation],
+            "models": [asdict(models.harvest_summarizer), asdict(models.mint_generator)],
+        }
+    elif stage == "audit":
+        payload = {
+            "curation": asdict(cfg.curation),
+            "prompts": [prompts.qa_rating, prompts.qa_score],
+            "models": [
+                asdict(models.audit_judge),
+                asdict(models.audit_screener) if models.audit_screener else None,
+            ],
+        }
+    elif stage == "package":
+        payload = {
+            "packaging": asdict(cfg.packaging),
+            "prompts": [prompts.package_validation],
+            "models": [asdict(models.package_validator)],
+        }
+    else:
+        raise ValueError(f"Unknown stage '{stage}'. Available: {', '.join(STAGES)}")
+    return _hash_json({"stage": stage, "config": payload, "extra": extra})
+
+
+def mint_fingerprint(
+    cfg: ForgeConfig,
+    kinds: Sequence[str],
+    target_curated: Optional[int] = None,
+    sample_fraction: Optional[float] = None,
+    sample_count: Optional[int] = None,
+    sample_seed: Optional[int] = None,
+) -> str:
+    """Fingerprint of a mint run, with sampling defaults resolved like ``run_mint``."""
+    gen_cfg = cfg.generation
+    if sample_fraction is None and sample_count is None:
+        sample_fraction, sample_count = gen_cfg.sample_fraction, gen_cfg.sample_count
+    if sample_seed is None:
+        sample_seed = gen_cfg.sample_seed
+    return stage_fingerprint(
+        cfg,
+        "mint",
+        kinds=sorted(kinds),
+        target_curated=target_curated,
+        sample=[sample_fraction, sample_count, sample_seed],
+    )
+
+
+def harvested_name(cfg: ForgeConfig, source: Path) -> Path:
+    """Return where harvest stores the normalized copy of ``source``."""
+    rel = source.relative_to(cfg.io.input_root)
+    # Flatten nested directories into filename-safe tokens for reproducibility.
+    return cfg.io.harvested_path / (rel.as_posix().replace("/", "__") + ".txt")
+
+
+def minted_names(cfg: ForgeConfig, txt_file: Path, kinds: Sequence[str]) -> List[Path]:
+    """Return the minted files produced for ``txt_file``, one per kind."""
+    return [cfg.io.minted_path / (txt_file.stem + f".{kind}.json") for kind in kinds]
+
+
+def audited_name(cfg: ForgeConfig, minted_file: Path) -> Path:
+    """Return the curated output written for ``minted_file``."""
+    return cfg.io.audited_path / minted_file.name.replace(".json", ".audited.json")
+
+
+class BuildGraph:
+    """Record, per artifact node, the digests of its inputs and outputs and a config fingerprint.
+
+    A node is current when its fingerprint matches and every recorded input
+    and output still exists with the same content. Digests are cached by file
+    size and modification time so unchanged files are not re-read.
+    """
+
+    def __init__(self, path: Path, root: Path):
+        self.path = path
+        self.root = root
+        self._nodes: Dict[str, Dict[str, Any]] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self.rebuilt: Counter = Counter()
+        self.reused: Counter = Counter()
+        if path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                self._nodes = data.get("nodes", {})
+                self._stats = data.get("files", {})
+            except (json.JSONDecodeError, AttributeError):
+                logger.warning("Ignoring unreadable build graph %s; rebuilding everything", path)
+
+    @classmethod
+    def for_config(cls, cfg: ForgeConfig) -> "BuildGraph":
+        if cfg.io.artifact_store_path is not None:
+            # Digests are taken from files on disk, which the store does not write.
+            raise ValueError("Incremental builds are not supported with io.artifact_store_file")
+        return cls(cfg.io.build_graph_path, cfg.io.working_root)
+
+    def _rel(self, path: Path) -> str:
+        try:
+            return path.resolve().relative_to(self.root.resolve()).as_posix()
+        except ValueError:
+            return str(path.resolve())
+
+    def _abs(self, rel: str) -> Path:
+        path = Path(rel)
+        return path if path.is_absolute() else self.root / path
+
+    def digest(self, path: Path) -> Optional[str]:
+        """Return the SHA-256 of ``path`` (``None`` if missing), reusing cached stat matches."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        rel = self._rel(path)
+        cached = self._stats.get(rel)
+        if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+            return cached["sha256"]
+        sha = file_digest(path)
+        self._stats[rel] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha}
+        return sha
+
+    def _digests(self, paths: Iterable[Path]) -> Dict[str, Optional[str]]:
+        return {self._rel(path): self.digest(path) for path in paths}
+
+    @staticmethod
+    def node_id(stage: str, path: Optional[Path] = None) -> str:
+        return stage if path is None else f"{stage}:{path.name}"
+
+    def is_current(
+        self,
+        node: str,
+        inputs: Sequence[Path],
+        fingerprint: str,
+        dirty: Iterable[Path] = (),
+    ) -> bool:
+        """Whether ``node`` can be reused; ``dirty`` inputs are about to change (dry runs)."""
+        entry = self._nodes.get(node)
+        if entry is None or entry.get("fingerprint") != fingerprint:
+            return False
+        dirty_keys = {self._rel(path) for path in dirty}
+        current = self._digests(inputs)
+        if set(current) != set(entry.get("inputs", {})) or dirty_keys & set(current):
+            return False
+        if any(entry["inputs"][key] != digest for key, digest in current.items()):
+            return False
+        return all(
+            self.digest(self._abs(rel)) == digest for rel, digest in entry.get("outputs", {}).items()
+        )
+
+    def reuse(self, node: str) -> List[Path]:
+        """Count ``node`` as reused and return its recorded outputs."""
+        self.reused[node.split(":", 1)[0]] += 1
+        return [self._abs(rel) for rel in self._nodes[node].get("outputs", {})]
+
+    def record(
+        self,
+        node: str,
+        inputs: Sequence[Path],
+        fingerprint: str,
+        outputs: Sequence[Path],
+    ) -> None:
+        """Store the digests a freshly built ``node`` was produced from."""
+        self.rebuilt[node.split(":", 1)[0]] += 1
+        self._nodes[node] = {
+            "fingerprint": fingerprint,
+            "inputs": self._digests(inputs),
+            "outputs": self._digests(path for path in outputs if path.exists()),
+        }
+
+    def save(self) -> None:
+        """Atomically persist the graph next to the artifacts it describes."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(
+            json.dumps({"nodes": self._nodes, "files": self._stats}, indent=2, sort_keys=True),
+            encoding="utf-8",
+        )
+        tmp.replace(self.path)
+
+    def log_summary(self) -> None:
+        for stage in STAGES:
+            if self.rebuilt[stage] or self.reused[stage]:
+                logger.info(
+                    "Incremental %s: rebuilt %s, reused %s",
+                    stage,
+                    self.rebuilt[stage],
+                    self.reused[stage],
+                )
+
+
+def plan_build(
+    cfg: ForgeConfig,
+    kinds: Sequence[str],
+    export_fmt: str,
+    *,
+    target_curated: Optional[int] = None,
+    sample_fraction: Optional[float] = None,
+    sample_count: Optional[int] = None,
+    sample_seed: Optional[int] = None,
+    graph: Optional[BuildGraph] = None,
+) -> Dict[str, List[str]]:
+    """List, per stage, the artifacts an incremental ``run-all`` would rebuild.
+
+    Changes propagate: an artifact whose input is itself due for rebuilding is
+    listed even if that input currently looks unchanged.
+    """
+    graph = graph or BuildGraph.for_config(cfg)
+    plan: Dict[str, List[str]] = {stage: [] for stage in STAGES}
+
+    fingerprint = stage_fingerprint(cfg, "harvest")
+    dirty_harvested: List[Path] = []
+    harvested = set(cfg.io.harvested_path.glob("*.txt"))
+    for source in discover_source_files(cfg.io.input_root):
+        out_path = harvested_name(cfg, source)
+        harvested.add(out_path)
+        if not graph.is_current(graph.node_id("harvest", out_path), [source], fingerprint):
+            dirty_harvested.append(out_path)
+            plan["harvest"].append(out_path.name)
+
+    fingerprint = mint_fingerprint(
+        cfg, kinds, target_curated, sample_fraction, sample_count, sample_seed
+    )
+    dirty_minted: List[Path] = []
+    minted = set(cfg.io.minted_path.glob("*.json"))
+    for txt_file in sorted(harvested):
+        outputs = minted_names(cfg, txt_file, kinds)
+        minted.update(outputs)
+        node = graph.node_id("mint", txt_file)
+        if not graph.is_current(node, [txt_file], fingerprint, dirty_harvested):
+            dirty_minted.extend(outputs)
+            plan["mint"].append(txt_file.name)
+
+    fingerprint = stage_fingerprint(cfg, "audit", offline=False)
+    dirty_audited: List[Path] = []
+    audited = set(cfg.io.audited_path.glob("*.audited.json"))
+    for minted_file in sorted(minted):
+        out_path = audited_name(cfg, minted_file)
+        audited.add(out_path)
+        node = graph.node_id("audit", minted_file)
+        if not graph.is_current(node, [minted_file], fingerprint, dirty_minted):
+            dirty_audited.append(out_path)
+            plan["audit"].append(minted_file.name)
+
+    fingerprint = stage_fingerprint(cfg, "package", fmt=export_fmt, overrides={})
+    if not graph.is_current(graph.node_id("package"), sorted(audited), fingerprint, dirty_audited):
+        plan["package"].append(export_fmt)
+    return plan
@@ -0,0 +1,348 @@
+"""Dry-run projection of requests, tokens, cost and wall time for a configured pipeline."""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Union
+
+from ..config import ForgeConfig, ModelRef
+from ..curation.llm_judge import DEFAULT_SCORE_PROMPT
+from ..export.validation import DEFAULT_VALIDATION_PROMPT, cochran_sample_size
+from ..extensions import get_generator_factory
+from ..generation.base import BaseGenerator
+from ..generation.packing import PackedSource, pack_sources, render_packed_text
+from ..io.chunking import chunk_spans
+from ..io.sampling import sample_size
+from ..models.pricing import approx_tokens, token_cost
+from .mint import SUMMARY_MAX_TOKENS, SUMMARY_PROMPT, _normalize_kinds, _plan_sample
+from .store import list_harvested, read_harvested, store_session
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RequestEstimate:
+    """Projected traffic for one kind of request sent to one model."""
+
+    stage: str
+    role: str
+    model: ModelRef
+    latency_seconds: float
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+    def add(self, input_tokens: int, output_tokens: int, requests: int = 1) -> None:
+        self.requests += requests
+        self.input_tokens += input_tokens * requests
+        self.output_tokens += output_tokens * requests
+
+    @property
+    def seconds(self) -> float:
+        return self.requests * self.latency_seconds
+
+
+@dataclass
+class PipelineEstimate:
+    """Totals of a dry run; costs are ``None`` for models without configured prices."""
+
+    documents: int
+    chunks: int
+    items: Dict[str, int]
+    concurrency: int
+    latency_sources: Dict[str, str]
+    rows: List[RequestEstimate] = field(default_factory=list)
+    costs: List[Optional[float]] = field(default_factory=list)
+
+    @property
+    def requests(self) -> int:
+        return sum(row.requests for row in self.rows)
+
+    @property
+    def input_tokens(self) -> int:
+        return sum(row.input_tokens for row in self.rows)
+
+    @property
+    def output_tokens(self) -> int:
+        return sum(row.output_tokens for row in self.rows)
+
+    @property
+    def cost(self) -> Optional[float]:
+        """Total cost of priced requests, or ``None`` when no model has a price."""
+        priced = [cost for cost in self.costs if cost is not None]
+        return sum(priced) if priced else None
+
+    @property
+    def wall_seconds(self) -> float:
+        return sum(row.seconds for row in self.rows) / max(self.concurrency, 1)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "documents": self.documents,
+            "chunks": self.chunks,
+            "items": self.items,
+            "requests": self.requests,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cost": self.cost,
+            "wall_seconds": self.wall_seconds,
+            "concurrency": self.concurrency,
+            "latency_sources": self.latency_sources,
+            "breakdown": [
+                {
+                    "stage": row.stage,
+                    "role": row.role,
+                    "model": row.model.key,
+                    "requests": row.requests,
+                    "input_tokens": row.input_tokens,
+                    "output_tokens": row.output_tokens,
+                    "cost": cost,
+                    "latency_seconds": row.latency_seconds,
+                }
+                for row, cost in zip(self.rows, self.costs)
+            ],
+        }
+
+
+def measured_latencies(progress_path: Optional[Path]) -> Dict[str, float]:
+    """Return seconds per request by stage from the latest finished runs in the progress file.
+
+    Latency is the summed duration of individual requests divided by their
+    count, so it is independent of the measured run's concurrency and of time
+    the stage spent outside model calls. Snapshots without ``request_seconds``
+    (older progress files) are ignored.
+    """
+    latencies: Dict[str, float] = {}
+    if progress_path is None or not progress_path.exists():
+        return latencies
+    with progress_path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if event.get("event") != "finish" or not event.get("requests"):
+                continue
+            if event.get("request_seconds") is not None:
+                latencies[event["stage"]] = event["request_seconds"] / event["requests"]
+    return latencies
+
+
+class _Projector:
+    """Replay mint's request plan over the corpus without calling any model."""
+
+    def __init__(
+        self,
+        cfg: ForgeConfig,
+        kinds: Sequence[str],
+        target_curated: Optional[int],
+        latencies: Dict[str, float],
+    ):
+        self.cfg = cfg
+        self.kinds = list(kinds)
+        self.settings = cfg.estimate
+        self.latencies = latencies
+        self.rows: Dict[str, RequestEstimate] = {}
+        self.items = {kind: 0 for kind in kinds}
+        self.chunks = 0
+        self.generators: Dict[str, BaseGenerator] = {
+            kind: get_generator_factory(kind)(None, cfg) for kind in kinds
+        }
+        # Only the length of the summary matters for prompt size.
+        self.summary = "x" * int(self.settings.summary_tokens * self.settings.chars_per_token)
+        if target_curated is None:
+            target_curated = cfg.generation.target_curated
+        self.raw_needed: Optional[int] = None
+        if target_curated is not None:
+            self.raw_needed = math.ceil(target_curated / max(cfg.generation.acceptance_prior, 1e-6))
+
+    def tokens(self, text: str) -> int:
+        return approx_tokens(text, self.settings.chars_per_token)
+
+    def row(self, stage: str, role: str, model: ModelRef) -> RequestEstimate:
+        key = f"{stage}:{role}:{model.key}"
+        if key not in self.rows:
+            latency = self.latencies.get(stage, self.settings.latency_seconds)
+            self.rows[key] = RequestEstimate(stage, role, model, latency)
+        return self.rows[key]
+
+    def budget(self, kind: str, remaining: int) -> int:
+        size = min(remaining, self.cfg.generation.max_items_per_request)
+        if self.raw_needed is not None:
+            size = min(size, self.raw_needed - self.items[kind])
+        return max(size, 0)
+
+    def mint_request(self, text: str, remaining: Dict[str, int]) -> None:
+        """Count one summary plus one generation request per kind that still needs items."""
+        sizes = {kind: self.budget(kind, remaining[kind]) for kind in self.kinds}
+        if not any(sizes.values()):
+            return
+        self.chunks += 1
+        models = self.cfg.models
+        self.row("mint", "summarize", models.harvest_summarizer).add(
+            self.tokens(SUMMARY_PROMPT + text),
+            min(self.settings.summary_tokens, SUMMARY_MAX_TOKENS),
+        )
+        for kind, size in sizes.items():
+            if not size:
+                continue
+            messages = self.generators[kind].build_messages(text, self.summary, size)
+            self.row("mint", f"generate:{kind}", models.mint_generator).add(
+                sum(self.tokens(message.content) for message in messages),
+                min(size * self.settings.item_tokens, self.cfg.generation.max_tokens),
+            )
+            remaining[kind] -= size
+            self.items[kind] += size
+
+    def mint_document(self, text: str, spans: Sequence[tuple]) -> None:
+        remaining = {kind: self.cfg.generation.max_pairs_per_doc for kind in self.kinds}
+        for _, start, end in spans:
+            self.mint_request(text[start:end], remaining)
+
+    def mint_packed(self, packable: Sequence[PackedSource]) -> None:
+        for group in pack_sources(packable, self.cfg.generation.chunk_size):
+            budget = self.cfg.generation.max_pairs_per_doc * len(group)
+            self.mint_request(render_packed_text(group), {kind: budget for kind in self.kinds})
+
+    def judge_requests(self) -> None:
+        """Count acceptance probes, audit verdicts and the packaging spot-check."""
+        cfg = self.cfg
+        models = cfg.models
+        settings = self.settings
+        items = sum(self.items.values())
+        probes = 0
+        if self.raw_needed is not None:
+            probes = sum(min(cfg.generation.acceptance_probe_size, count) for count in self.items.values())
+        full_prompt = self.tokens(cfg.prompts.qa_rating.format(question="", answer=""))
+        full_prompt += settings.item_tokens
+        if cfg.curation.judge_mode == "score":
+            template = cfg.prompts.qa_score or DEFAULT_SCORE_PROMPT
+            prompt = self.tokens(template.format(question="", answer="")) + settings.item_tokens
+            output = cfg.curation.score_max_tokens
+        else:
+            prompt, output = full_prompt, settings.judge_output_tokens
+        if probes:
+            # Probe verdicts are cached, so audit does not judge those items again.
+            self.row("mint", "probe", models.audit_judge).add(prompt, output, probes)
+        judged = items - probes
+        if models.audit_screener is not None:
+            self.row("audit", "screen", models.audit_screener).add(prompt, output, judged)
+            judged = math.ceil(judged * settings.escalation_rate)
+        self.row("audit", "judge", models.audit_judge).add(prompt, output, judged)
+        kept = int(items * cfg.generation.acceptance_prior)
+        if cfg.curation.judge_mode == "score" and cfg.curation.rationale_for_rejects:
+            self.row("audit", "rationale", models.audit_judge).add(
+                full_prompt, settings.judge_output_tokens, items - kept
+            )
+        if cfg.packaging.validation == "full" and kept:
+            template = cfg.prompts.package_validation or DEFAULT_VALIDATION_PROMPT
+            self.row("package", "validate", models.package_validator).add(
+                self.tokens(template.format(format="", record="")) + settings.item_tokens,
+                cfg.curation.max_tokens,
+                cochran_sample_size(
+                    kept,
+                    confidence=cfg.packaging.validation_confidence,
+                    margin=cfg.packaging.validation_margin,
+                ),
+            )
+
+
+def estimate_pipeline(
+    cfg: ForgeConfig,
+    generator_type: Union[str, Sequence[str]] = "qa",
+    target_curated: Optional[int] = None,
+    sample_fraction: Optional[float] = None,
+    sample_count: Optional[int] = None,
+    sample_seed: Optional[int] = None,
+    concurrency: Optional[int] = None,
+) -> PipelineEstimate:
+    """Project the requests, tokens, cost and wall time of mint, audit and package.
+
+    The harvested corpus is chunked, sampled and packed exactly as ``run_mint``
+    would, and every summarize, generate and judge prompt is rendered from the
+    configured templates and sized with an approximate tokenizer
+    (``estimate.chars_per_token``). Generators are assumed to return every
+    requested item, so item counts are upper bounds before dedup and verdict
+    cache hits. Latency per request comes from the request timings of the last
+    finished runs recorded in ``io.progress_file`` when available and ``estimate.latency_seconds``
+    otherwise; wall time divides the total by ``concurrency`` (default
+    ``estimate.concurrency``). Costs use ``providers.<name>.prices``.
+    """
+    gen_cfg = cfg.generation
+    if sample_fraction is None and sample_count is None:
+        sample_fraction, sample_count = gen_cfg.sample_fraction, gen_cfg.sample_count
+    if sample_seed is None:
+        sample_seed = gen_cfg.sample_seed
+    sample_size(0, sample_fraction, sample_count)
+    concurrency = cfg.estimate.concurrency if concurrency is None else concurrency
+    if concurrency <= 0:
+        raise ValueError(f"concurrency must be positive, got {concurrency}")
+
+    with store_session(cfg) as store:
+        files = list_harvested(cfg, store)
+        if not files:
+            raise ValueError(
+                f"No harvested documents under {cfg.io.harvested_path}; run `synthkit harvest` first"
+            )
+        selection: Optional[Dict[Path, Set[int]]] = None
+        if sample_fraction is not None or sample_count is not None:
+            selection = _plan_sample(
+                cfg, files, sample_fraction, sample_count, sample_seed, store
+            )
+            files = [txt_file for txt_file in files if txt_file in selection]
+
+        kinds = _normalize_kinds(generator_type)
+        try:
+            for kind in kinds:
+                get_generator_factory(kind)
+        except KeyError as exc:
+            raise ValueError(str(exc)) from exc
+        measured = measured_latencies(cfg.io.progress_path)
+        projector = _Projector(cfg, kinds, target_curated, measured)
+        packable: List[PackedSource] = []
+        for txt_file in files:
+            text = read_harvested(store, txt_file)
+            spans = [
+                (idx, start, end)
+                for idx, (start, end) in enumerate(
+                    chunk_spans(len(text), gen_cfg.chunk_size, gen_cfg.chunk_overlap)
+                )
+            ]
+            if selection is not None:
+                spans = [span for span in spans if span[0] in selection[txt_file]]
+            if (
+                gen_cfg.pack_small_docs
+                and len(spans) == 1
+                and len(text) <= gen_cfg.pack_max_doc_chars
+            ):
+                packable.append(PackedSource(source_id=f"s{len(packable)}", text=text, meta={}))
+                continue
+            projector.mint_document(text, spans)
+        projector.mint_packed(packable)
+        projector.judge_requests()
+
+    rows = [row for row in projector.rows.values() if row.requests]
+    estimate = PipelineEstimate(
+        documents=len(files),
+        chunks=projector.chunks,
+        items=projector.items,
+        concurrency=concurrency,
+        latency_sources={
+            stage: "measured" if stage in measured else "assumed"
+            for stage in dict.fromkeys(row.stage for row in rows)
+        },
+        rows=rows,
+        costs=[token_cost(cfg, row.model, row.input_tokens, row.output_tokens) for row in rows],
+    )
+    logger.info(
+        "Estimated %s requests, %s input and %s output tokens over %s documents",
+        estimate.requests,
+        estimate.input_tokens,
+        estimate.output_tokens,
+        estimate.documents,
+    )
+    return estimate
@@ -4,16 +4,38 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from ..config import ForgeConfig
-from ..io.loaders import iter_harvested
+from ..io.loaders import HarvestedDoc, discover_source_files, load_and_normalize
+from ..progress import track_stage
+from .buildgraph import BuildGraph, harvested_name, stage_fingerprint
+from .store import ArtifactStore, store_session
 
 logger = logging.getLogger(__name__)
 
 
-def run_harvest(cfg: ForgeConfig) -> List[Path]:
-    """Normalize supported source files and store them under ``harvested_path``."""
+def _write_harvested(
+    cfg: ForgeConfig, doc: HarvestedDoc, store: Optional[ArtifactStore] = None
+) -> Path:
+    """Store one normalized document under ``harvested_path`` (or ``store``) and return its path."""
+    out_path = harvested_name(cfg, doc.source_path)
+    if store is not None:
+        store.put_document(out_path.name, doc.text, source=str(doc.source_path))
+        return out_path
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(doc.text, encoding="utf-8")
+    logger.debug("Wrote harvested copy: %s", out_path)
+    return out_path
+
+
+def run_harvest(cfg: ForgeConfig, graph: Optional[BuildGraph] = None) -> List[Path]:
+    """Normalize supported source files and store them under ``harvested_path``.
+
+    With ``io.artifact_store_file`` set the text goes to the artifact store instead.
+
+    With a build ``graph``, sources whose harvested copy is up to date are skipped.
+    """
     out_dir = cfg.io.harvested_path
     out_dir.mkdir(parents=True, exist_ok=True)
     written: List[Path] = []
@@ -23,14 +45,21 @@ def run_harvest(cfg: ForgeConfig) -> List[Path]:
         out_dir,
     )
 
-    for doc in iter_harvested(cfg.io.input_root):
-        rel = doc.source_path.relative_to(cfg.io.input_root)
-        # Flatten nested directories into filename-safe tokens for reproducibility.
-        out_path = out_dir / (rel.as_posix().replace("/", "__") + ".txt")
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        out_path.write_text(doc.text, encoding="utf-8")
-        written.append(out_path)
-        logger.debug("Wrote harvested copy: %s", out_path)
+    fingerprint = stage_fingerprint(cfg, "harvest")
+    sources = discover_source_files(cfg.io.input_root)
+    with store_session(cfg) as store, track_stage(cfg, "harvest", total=len(sources)) as progress:
+        for source in sources:
+            node = BuildGraph.node_id("harvest", harvested_name(cfg, source))
+            if graph is not None and graph.is_current(node, [source], fingerprint):
+                written.extend(graph.reuse(node))
+                progress.add("reused")
+                progress.advance()
+                continue
+            out_path = _write_harvested(cfg, load_and_normalize(source), store)
+            written.append(out_path)
+            if graph is not None:
+                graph.record(node, [source], fingerprint, [out_path])
+            progress.advance()
 
     if written:
         logger.info("Harvested %d documents.", len(written))
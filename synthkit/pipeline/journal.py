@@ -0,0 +1,130 @@
+"""Append-only progress journal that lets an interrupted audit resume."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TextIO, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def file_digest(path: Path) -> str:
+    """Return the SHA-256 of ``path`` so edited inputs are never treated as done."""
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def sample_digest(sample: Any) -> str:
+    """Return a stable hash of a sample's JSON content."""
+    blob = json.dumps(sample, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class AuditJournal:
+    """Record per-sample decisions and finished files as JSON lines.
+
+    Without ``resume`` the journal is started afresh. With ``resume`` existing
+    entries are loaded so finished files (same input digest, output present) are
+    skipped and already decided samples of a partially audited file are reused.
+    Entries carry the ``fingerprint`` of the curation settings, prompts and
+    judge models they were decided under (see ``stage_fingerprint``); entries
+    from a different fingerprint are ignored, so changing ``min_score``, the
+    judge mode or a judge model re-audits instead of reusing stale decisions.
+    A torn final line from a crash is ignored.
+    """
+
+    def __init__(self, path: Path, resume: bool = False, fingerprint: Optional[str] = None):
+        self.path = path
+        self.fingerprint = fingerprint
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._samples: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if resume and path.exists():
+            self._load()
+        self._handle: TextIO = path.open("a" if resume else "w", encoding="utf-8")
+
+    def _load(self) -> None:
+        with self.path.open("r", encoding="utf-8") as handle:
+            for line_no, line in enumerate(handle, start=1):
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("Ignoring unreadable journal line %s in %s", line_no, self.path)
+                    continue
+                if entry.get("type") == "file":
+                    self._files[entry["file"]] = entry
+                elif entry.get("type") == "sample":
+                    self._samples[(entry["file"], entry["index"])] = entry
+        logger.info(
+            "Loaded audit journal: %s finished files, %s sample decisions",
+            len(self._files),
+            len(self._samples),
+        )
+
+    def _matches(self, entry: Optional[Dict[str, Any]], digest: str) -> bool:
+        return (
+            entry is not None
+            and entry.get("digest") == digest
+            and entry.get("fingerprint") == self.fingerprint
+        )
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        self._handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._handle.flush()
+
+    def completed_output(
+        self,
+        name: str,
+        digest: str,
+        exists: Optional[Callable[[str], bool]] = None,
+    ) -> Optional[Path]:
+        """Return the audited output for ``name`` if it finished with the same input.
+
+        ``exists`` checks the output by name when it is not a file on disk.
+        """
+        entry = self._files.get(name)
+        if not self._matches(entry, digest):
+            return None
+        output = Path(entry["output"])
+        present = exists(name) if exists is not None else output.exists()
+        return output if present else None
+
+    def sample_decision(self, name: str, index: int, digest: str) -> Optional[Dict[str, Any]]:
+        """Return the journaled decision for a sample whose content is unchanged."""
+        entry = self._samples.get((name, index))
+        return entry if self._matches(entry, digest) else None
+
+    def record_sample(self, name: str, index: int, digest: str, status: str, **verdict: Any) -> None:
+        """Append the decision (``kept``, ``rejected``, ``prefiltered``...) for one sample."""
+        entry = {
+            "type": "sample",
+            "file": name,
+            "index": index,
+            "digest": digest,
+            "fingerprint": self.fingerprint,
+            "status": status,
+        }
+        entry.update(verdict)
+        self._samples[(name, index)] = entry
+        self._append(entry)
+
+    def record_file(self, name: str, digest: str, output: Path) -> None:
+        """Mark ``name`` as fully audited into ``output``."""
+        entry = {
+            "type": "file",
+            "file": name,
+            "digest": digest,
+            "fingerprint": self.fingerprint,
+            "output": str(output),
+        }
+        self._files[name] = entry
+        self._append(entry)
+
+    def close(self) -> None:
+        self._handle.close()
@@ -4,20 +4,43 @@ from __future__ import annotations
 
 import json
 import logging
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
 
+from ..budget import BudgetExceeded, budget_scope
 from ..config import ForgeConfig
+from ..curation.dedup import NearDuplicateIndex
 from ..models.router import ModelRouter
-from ..io.chunking import chunk_text
-# Import generator modules for their registration side effects.
-from ..generation import qa_pairs as _qa_pairs  # noqa: F401
-from ..generation import cot_pairs as _cot_pairs  # noqa: F401
+from ..io.chunking import chunk_spans
+from ..io.sampling import position_bucket, sample_size, stratified_sample
 from ..models.client_base import ChatMessage, ChatClient, ChatClientError
 from ..extensions import get_generator_factory
+from ..generation.base import BaseGenerator, GeneratedItem
+from ..generation.targeting import AcceptanceTargeter
+from ..curation.llm_judge import LLMJudge, create_judge
+from ..curation.verdict_cache import open_verdict_cache
+from ..generation.packing import PackedSource, pack_sources, render_packed_text
+from ..progress import advance, note, note_error, track_stage
+from .buildgraph import BuildGraph, mint_fingerprint, minted_names
+from .store import (
+    ArtifactStore,
+    harvested_size,
+    list_harvested,
+    open_artifact_store,
+    read_harvested,
+    read_minted,
+)
 
 logger = logging.getLogger(__name__)
 
+_DEDUP_SCOPES = ("off", "document", "run")
+SUMMARY_PROMPT = (
+    "Summarize the following text in 3-5 sentences, preserving key technical details:\n\n"
+)
+SUMMARY_MAX_TOKENS = 256
+
 
 def _build_summarizer(router: ModelRouter, cfg: ForgeConfig) -> ChatClient:
     """Return the chat client responsible for chunk summarization."""
@@ -31,89 +54,614 @@ def _summarize_chunk(
     max_tokens: int,
 ) -> str:
     """Generate a concise chunk summary to steer downstream prompts."""
-    prompt = (
-        "Summarize the following text in 3-5 sentences, preserving key technical details:\n\n"
-        + chunk
-    )
-    messages = [ChatMessage(role="user", content=prompt)]
+    messages = [ChatMessage(role="user", content=SUMMARY_PROMPT + chunk)]
     return client.chat(messages, temperature=0.2, max_tokens=max_tokens)
 
 
-def run_mint(
-    cfg: ForgeConfig,
-    generator_type: str = "qa",
-) -> List[Path]:
-    """Generate synthetic data for each harvested document."""
-    router = ModelRouter(cfg)
-    gen_client = router.for_stage(cfg.models.mint_generator)
-    summarizer = _build_summarizer(router, cfg)
+def _drop_duplicates(
+    items: List[GeneratedItem],
+    index: Optional[NearDuplicateIndex],
+    limit: int,
+) -> Tuple[List[GeneratedItem], int]:
+    """Keep up to ``limit`` items whose question was not already emitted within the dedup scope.
 
-    try:
-        factory = get_generator_factory(generator_type)
-    except KeyError as exc:
-        raise ValueError(str(exc)) from exc
-    generator = factory(gen_client, cfg)
+    Returns the kept items and the number of duplicates seen before the limit
+    was reached. Only kept questions enter ``index``; items past the limit are
+    neither checked nor recorded, so they never block later questions.
+    """
+    kept: List[GeneratedItem] = []
+    duplicates = 0
+    for item in items:
+        if len(kept) >= limit:
+            break
+        question = item.payload.get("question")
+        if index is not None and isinstance(question, str) and question:
+            if index.check_and_add(question):
+                duplicates += 1
+                continue
+        kept.append(item)
+    return kept, duplicates
 
-    minted_dir = cfg.io.minted_path
-    minted_dir.mkdir(parents=True, exist_ok=True)
 
-    outputs: List[Path] = []
-    try:
-        for txt_file in cfg.io.harvested_path.glob("*.txt"):
-            text = txt_file.read_text(encoding="utf-8")
-            chunks = chunk_text(
-                text,
-                chunk_size=cfg.generation.chunk_size,
-                overlap=cfg.generation.chunk_overlap,
-            )
+@dataclass
+class _DocState:
+    """Items collected so far for one harvested document, keyed by kind."""
 
-            all_items = []
-            remaining = cfg.generation.max_pairs_per_doc
-            for idx, chunk in enumerate(chunks):
-                if remaining <= 0:
-                    break
-                try:
-                    summary = _summarize_chunk(summarizer, chunk, max_tokens=256)
-                except ChatClientError as exc:
-                    logger.error(
-                        "Summarizer failed for %s chunk %s: %s",
-                        txt_file.name,
-                        idx,
-                        exc,
-                    )
+    txt_file: Path
+    items: Dict[str, List[GeneratedItem]]
+    indices: Dict[str, Optional[NearDuplicateIndex]]
+    dropped: Dict[str, int]
+    over_budget: Dict[str, int]
+
+    def remaining(self, kind: str, max_items: int) -> int:
+        return max_items - len(self.items[kind])
+
+
+def _normalize_kinds(generator_type: Union[str, Sequence[str]]) -> List[str]:
+    """Accept a single kind, a comma-separated string, or a sequence of kinds."""
+    raw = generator_type.split(",") if isinstance(generator_type, str) else generator_type
+    kinds: List[str] = []
+    for kind in raw:
+        key = kind.strip().lower()
+        if key and key not in kinds:
+            kinds.append(key)
+    if not kinds:
+        raise ValueError("At least one generator kind is required")
+    return kinds
+
+
+class _Minter:
+    """Shared generators, summarizer and duplicate filters for one mint run."""
+
+    def __init__(
+        self,
+        cfg: ForgeConfig,
+        generators: Dict[str, BaseGenerator],
+        summarizer: ChatClient,
+        dedup_scope: str,
+        judge: Optional[LLMJudge] = None,
+        target_curated: Optional[int] = None,
+        store: Optional[ArtifactStore] = None,
+    ):
+        self.cfg = cfg
+        self.store = store
+        self.generators = generators
+        self.summarizer = summarizer
+        self.dedup_scope = dedup_scope
+        self.max_items = cfg.generation.max_pairs_per_doc
+        self.judge = judge
+        self.targets: Dict[str, AcceptanceTargeter] = {}
+        if target_curated is not None:
+            self.targets = {
+                kind: AcceptanceTargeter(
+                    target_curated,
+                    max_items_per_request=cfg.generation.max_items_per_request,
+                    probe_size=cfg.generation.acceptance_probe_size,
+                    prior=cfg.generation.acceptance_prior,
+                    max_probe_failures=cfg.generation.acceptance_probe_max_failures,
+                )
+                for kind in generators
+            }
+        self.run_indices: Dict[str, Optional[NearDuplicateIndex]] = {
+            kind: self._new_index() if dedup_scope == "run" else None for kind in generators
+        }
+        self.dropped: Dict[str, int] = {kind: 0 for kind in generators}
+
+    def _new_index(self) -> NearDuplicateIndex:
+        return NearDuplicateIndex(self.cfg.generation.dedup_max_distance)
+
+    def open_document(self, txt_file: Path) -> _DocState:
+        """Start collecting items for ``txt_file`` with scope-appropriate filters."""
+        indices = {
+            kind: self._new_index() if self.dedup_scope == "document" else self.run_indices[kind]
+            for kind in self.generators
+        }
+        return _DocState(
+            txt_file=txt_file,
+            items={kind: [] for kind in self.generators},
+            indices=indices,
+            dropped={kind: 0 for kind in self.generators},
+            over_budget={kind: 0 for kind in self.generators},
+        )
+
+    @property
+    def targets_met(self) -> bool:
+        """Whether every kind has reached its curated target (target mode only)."""
+        return bool(self.targets) and all(target.done for target in self.targets.values())
+
+    def active_kinds(self, docs: Sequence[_DocState]) -> List[str]:
+        """Return kinds that still need items and have budget left in ``docs``."""
+        return [
+            kind
+            for kind in self.generators
+            if not (kind in self.targets and self.targets[kind].done)
+            and any(doc.remaining(kind, self.max_items) > 0 for doc in docs)
+        ]
+
+    def request_size(self, kind: str, budget: int) -> int:
+        """Items to ask for in the next request for ``kind``."""
+        if kind in self.targets:
+            return self.targets[kind].items_for_request(budget)
+        return min(budget, self.cfg.generation.max_items_per_request)
+
+    def _probe(self, kind: str, items: List[GeneratedItem]) -> None:
+        """Judge up to the pending probe size of ``items`` to refine acceptance."""
+        target = self.targets[kind]
+        sample = items[: target.probe_pending]
+        if not sample or self.judge is None:
+            return
+        accepted = judged = 0
+        for item in sample:
+            try:
+                verdict = self.judge.judge(item.payload)
+            except ChatClientError as exc:
+                logger.warning("Acceptance probe judge call failed: %s", exc)
+                target.record_probe_failure()
+                if target.probe_abandoned:
                     break
-                logger.debug(
-                    "Requesting up to %s %s items for %s chunk %s (remaining=%s)",
-                    min(remaining, 8),
-                    generator_type,
-                    txt_file.name,
-                    idx,
-                    remaining,
+                continue
+            judged += 1
+            accepted += int(verdict.keep)
+        target.record_judged(accepted, judged)
+        if target.probe_abandoned:
+            logger.warning(
+                "Acceptance probe for %s abandoned after %s failed judge calls; "
+                "assuming acceptance rate %.2f",
+                kind,
+                target.probe_failures,
+                target.acceptance_rate,
+            )
+        elif target.probe_pending == 0:
+            logger.info(
+                "Acceptance probe for %s: %s/%s kept (rate %.2f); ~%s more raw items "
+                "in ~%s requests needed for %s curated samples",
+                kind,
+                target.accepted,
+                target.judged,
+                target.acceptance_rate,
+                target.needed_raw(),
+                target.projected_requests(),
+                target.target,
+            )
+
+    def summarize(self, label: str, text: str) -> Optional[str]:
+        """Summarize ``text`` once for all generators; ``None`` signals failure."""
+        try:
+            return _summarize_chunk(self.summarizer, text, max_tokens=SUMMARY_MAX_TOKENS)
+        except ChatClientError as exc:
+            logger.error("Summarizer failed for %s: %s", label, exc)
+            note_error()
+            return None
+
+    def generate(
+        self,
+        kind: str,
+        label: str,
+        text: str,
+        summary: str,
+        num_items: int,
+        chunk_meta: Dict[str, Any],
+    ) -> List[GeneratedItem]:
+        """Run one generator request and log what came back."""
+        logger.debug("Requesting up to %s %s items for %s", num_items, kind, label)
+        items = self.generators[kind].generate(
+            chunk=text,
+            summary=summary,
+            num_items=num_items,
+            chunk_meta=chunk_meta,
+        )
+        logger.debug("Generator returned %s %s items for %s", len(items), kind, label)
+        if not items:
+            logger.warning("Generator %s emitted no items for %s", kind, label)
+        return items
+
+    def add_items(self, doc: _DocState, kind: str, items: List[GeneratedItem]) -> None:
+        """Append non-duplicate items to ``doc`` without exceeding its budget."""
+        kept, duplicates = _drop_duplicates(
+            items, doc.indices[kind], max(doc.remaining(kind, self.max_items), 0)
+        )
+        over_budget = len(items) - len(kept) - duplicates
+        doc.dropped[kind] += duplicates
+        doc.over_budget[kind] += over_budget
+        doc.items[kind].extend(kept)
+        note("items", len(kept))
+        note("duplicates", duplicates)
+        if over_budget:
+            note("over_budget", over_budget)
+        if kind in self.targets:
+            self.targets[kind].record_minted(len(kept))
+            self._probe(kind, kept)
+
+    def mint_document(
+        self,
+        txt_file: Path,
+        text: str,
+        spans: Sequence[Tuple[int, int, int]],
+    ) -> _DocState:
+        """Summarize each ``(index, start, end)`` chunk once and feed it to every generator."""
+        doc = self.open_document(txt_file)
+        for idx, start, end in spans:
+            chunk = text[start:end]
+            kinds = self.active_kinds([doc])
+            if not kinds:
+                break
+            label = f"{txt_file.name} chunk {idx}"
+            note("chunks")
+            summary = self.summarize(label, chunk)
+            if summary is None:
+                break
+            for kind in kinds:
+                # Track how many samples we can still emit for the document.
+                remaining = doc.remaining(kind, self.max_items)
+                items = self.generate(
+                    kind,
+                    label,
+                    chunk,
+                    summary,
+                    self.request_size(kind, remaining),
+                    {
+                        "source_file": str(txt_file),
+                        "chunk_index": idx,
+                        "chunk_start": start,
+                        "chunk_end": end,
+                    },
                 )
-                items = generator.generate(
-                    chunk=chunk,
-                    summary=summary,
-                    num_items=min(remaining, 8),
-                    chunk_meta={"source_file": str(txt_file), "chunk_index": idx},
+                self.add_items(doc, kind, items)
+        return doc
+
+    def mint_packed(self, group: Sequence[PackedSource], docs: Dict[str, _DocState]) -> None:
+        """Generate for several short documents in one request and route items back."""
+        label = "packed sources " + ", ".join(source.source_id for source in group)
+        text = render_packed_text(group)
+        kinds = self.active_kinds([docs[source.source_id] for source in group])
+        if not kinds:
+            return
+        summary = self.summarize(label, text)
+        if summary is None:
+            return
+        for kind in kinds:
+            remaining = sum(
+                max(docs[source.source_id].remaining(kind, self.max_items), 0)
+                for source in group
+            )
+            items = self.generate(
+                kind, label, text, summary, self.request_size(kind, remaining), {"packed": True}
+            )
+            routed: Dict[str, List[GeneratedItem]] = {}
+            unrouted = 0
+            for item in items:
+                source_id = item.meta.get("source_id")
+                if source_id is None and len(group) == 1:
+                    source_id = group[0].source_id
+                source = next((s for s in group if s.source_id == source_id), None)
+                if source is None:
+                    unrouted += 1
+                    continue
+                item.meta = {
+                    key: value for key, value in item.meta.items() if key != "packed"
+                } | source.meta | {"source_id": source.source_id}
+                routed.setdefault(source.source_id, []).append(item)
+            if unrouted:
+                logger.warning(
+                    "Dropped %s %s items without a valid source_id from %s", unrouted, kind, label
                 )
+            for source_id, source_items in routed.items():
+                self.add_items(docs[source_id], kind, source_items)
+
+    def write_document(self, doc: _DocState, minted_dir: Path) -> List[Path]:
+        """Persist one minted JSON file per kind and record dedup counts."""
+        outputs: List[Path] = []
+        for kind, items in doc.items.items():
+            dropped = doc.dropped[kind]
+            if dropped:
+                self.dropped[kind] += dropped
+                logger.info(
+                    "Dropped %s duplicate %s items from %s", dropped, kind, doc.txt_file.name
+                )
+            if doc.over_budget[kind]:
                 logger.debug(
-                    "Generator returned %s items for %s chunk %s",
-                    len(items),
-                    txt_file.name,
-                    idx,
+                    "Dropped %s %s items past max_pairs_per_doc from %s",
+                    doc.over_budget[kind],
+                    kind,
+                    doc.txt_file.name,
                 )
-                if not items:
-                    logger.warning(
-                        "Generator emitted no items for %s chunk %s", txt_file.name, idx
-                    )
-                all_items.extend(items)
-                # Track how many samples we can still emit for the document.
-                remaining = cfg.generation.max_pairs_per_doc - len(all_items)
-
-            payload = [item.payload | {"meta": item.meta} for item in all_items]
-            out_path = minted_dir / (txt_file.stem + f".{generator_type}.json")
-            out_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+            payload = [item.payload | {"meta": item.meta} for item in items]
+            out_path = minted_dir / (doc.txt_file.stem + f".{kind}.json")
             outputs.append(out_path)
+            if self.store is not None:
+                self.store.put_items(out_path.name, payload)
+                continue
+            # Write then rename so concurrent audit workers never read a partial file.
+            tmp_path = out_path.with_name(out_path.name + ".tmp")
+            tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+            tmp_path.replace(out_path)
         return outputs
+
+    def remember(self, minted_files: Sequence[Path]) -> None:
+        """Account for items of reused minted files in run-scope filters and targets."""
+        for path in minted_files:
+            kind = path.name.rsplit(".", 2)[-2]
+            if kind not in self.generators:
+                continue
+            payload = read_minted(self.store, path)
+            index = self.run_indices[kind]
+            if index is not None:
+                for item in payload:
+                    question = item.get("question")
+                    if isinstance(question, str) and question:
+                        index.check_and_add(question)
+            if kind in self.targets:
+                self.targets[kind].record_minted(len(payload))
+
+    def log_dedup_totals(self) -> None:
+        """Report how many duplicates each kind lost across the whole run."""
+        if self.dedup_scope == "off":
+            return
+        for kind, dropped in self.dropped.items():
+            logger.info(
+                "Duplicate filter (%s scope) dropped %s %s items in total",
+                self.dedup_scope,
+                dropped,
+                kind,
+            )
+
+
+def _plan_sample(
+    cfg: ForgeConfig,
+    files: Sequence[Path],
+    fraction: Optional[float],
+    count: Optional[int],
+    seed: int,
+    store: Optional[ArtifactStore] = None,
+) -> Dict[Path, Set[int]]:
+    """Choose chunk indices per file, stratified by file and position in document.
+
+    Chunk counts come from document sizes rather than their text, so planning
+    reads no documents. Harvested files are sized in bytes, which overcounts
+    characters for non-ASCII text; indices past a document's last chunk are
+    simply never minted.
+    """
+    units: List[Tuple[Path, int, int]] = []
+    for txt_file in files:
+        length = harvested_size(store, txt_file)
+        spans = chunk_spans(length, cfg.generation.chunk_size, cfg.generation.chunk_overlap)
+        units.extend((txt_file, idx, len(spans)) for idx in range(len(spans)))
+    size = sample_size(len(units), fraction, count)
+    picked = stratified_sample(
+        units,
+        size,
+        stratum=lambda unit: (unit[0], position_bucket(unit[1], unit[2])),
+        seed=seed,
+    )
+    selection: Dict[Path, Set[int]] = {}
+    for txt_file, idx, _ in picked:
+        selection.setdefault(txt_file, set()).add(idx)
+    logger.info(
+        "Sampled %s of %s chunks across %s of %s documents (seed=%s)",
+        len(picked),
+        len(units),
+        len(selection),
+        len(files),
+        seed,
+    )
+    return selection
+
+
+@contextmanager
+def _minter_session(
+    cfg: ForgeConfig,
+    generator_type: Union[str, Sequence[str]],
+    target_curated: Optional[int],
+) -> Iterator[_Minter]:
+    """Build a ``_Minter`` with its clients and close them when the run ends."""
+    kinds = _normalize_kinds(generator_type)
+    dedup_scope = cfg.generation.dedup_scope.lower()
+    if dedup_scope not in _DEDUP_SCOPES:
+        raise ValueError(
+            f"Unknown dedup_scope '{cfg.generation.dedup_scope}'. Available: {', '.join(_DEDUP_SCOPES)}"
+        )
+
+    try:
+        factories = {kind: get_generator_factory(kind) for kind in kinds}
+    except KeyError as exc:
+        raise ValueError(str(exc)) from exc
+
+    router = ModelRouter(cfg)
+    cache = None
+    store = None
+    try:
+        store = open_artifact_store(cfg)
+        gen_client = router.for_stage(cfg.models.mint_generator)
+        summarizer = _build_summarizer(router, cfg)
+        generators = {kind: factory(gen_client, cfg) for kind, factory in factories.items()}
+        if target_curated is None:
+            target_curated = cfg.generation.target_curated
+        judge = None
+        if target_curated is not None:
+            # Probe verdicts land in the shared cache so the audit stage reuses them.
+            cache = open_verdict_cache(cfg)
+            judge = create_judge(
+                router.for_stage(cfg.models.audit_judge),
+                cfg,
+                cache=cache,
+                model_id=cfg.models.audit_judge.key,
+            )
+        with budget_scope(cfg):
+            yield _Minter(cfg, generators, summarizer, dedup_scope, judge, target_curated, store)
     finally:
         router.close_all()
+        if cache is not None:
+            cache.close()
+        if store is not None:
+            store.close()
+
+
+def _mint_file(
+    minter: _Minter,
+    txt_file: Path,
+    minted_dir: Path,
+    packable: List[PackedSource],
+    selected: Optional[Set[int]] = None,
+) -> List[Path]:
+    """Mint one harvested file, or defer it to ``packable`` when it is short enough."""
+    cfg = minter.cfg
+    text = read_harvested(minter.store, txt_file)
+    spans = [
+        (idx, start, end)
+        for idx, (start, end) in enumerate(
+            chunk_spans(
+                len(text),
+                chunk_size=cfg.generation.chunk_size,
+                overlap=cfg.generation.chunk_overlap,
+            )
+        )
+    ]
+    if selected is not None:
+        spans = [span for span in spans if span[0] in selected]
+    if (
+        cfg.generation.pack_small_docs
+        and len(spans) == 1
+        and len(text) <= cfg.generation.pack_max_doc_chars
+    ):
+        packable.append(
+            PackedSource(
+                source_id=f"s{len(packable)}",
+                text=text,
+                meta={
+                    "source_file": str(txt_file),
+                    "chunk_index": 0,
+                    "chunk_start": 0,
+                    "chunk_end": len(text),
+                },
+            )
+        )
+        return []
+    doc = minter.mint_document(txt_file, text, spans)
+    outputs = minter.write_document(doc, minted_dir)
+    advance()
+    return outputs
+
+
+def _mint_packable(
+    minter: _Minter,
+    packable: Sequence[PackedSource],
+    minted_dir: Path,
+) -> Iterator[Path]:
+    """Mint deferred short documents in shared requests, yielding outputs per group."""
+    if not packable:
+        return
+    docs = {
+        source.source_id: minter.open_document(Path(source.meta["source_file"]))
+        for source in packable
+    }
+    groups = pack_sources(packable, minter.cfg.generation.chunk_size)
+    logger.info(
+        "Packed %s short documents into %s generation requests",
+        len(packable),
+        len(groups),
+    )
+    for group in groups:
+        if minter.targets_met:
+            break
+        minter.mint_packed(group, docs)
+        note("chunks")
+        for source in group:
+            yield from minter.write_document(docs[source.source_id], minted_dir)
+        advance(len(group))
+
+
+def run_mint(
+    cfg: ForgeConfig,
+    generator_type: Union[str, Sequence[str]] = "qa",
+    target_curated: Optional[int] = None,
+    sample_fraction: Optional[float] = None,
+    sample_count: Optional[int] = None,
+    sample_seed: Optional[int] = None,
+    graph: Optional[BuildGraph] = None,
+) -> List[Path]:
+    """Generate synthetic data for each harvested document.
+
+    ``generator_type`` may name several kinds (``["qa", "cot"]`` or ``"qa,cot"``);
+    each chunk is then read and summarized once and fed to every generator,
+    producing one minted file per document and kind. With
+    ``generation.pack_small_docs`` enabled, single-chunk documents shorter than
+    ``generation.pack_max_doc_chars`` share generation requests up to
+    ``generation.chunk_size`` characters.
+
+    ``target_curated`` (default ``generation.target_curated``) switches to a
+    target-driven mode: the first ``generation.acceptance_probe_size`` items
+    of each kind are judged with ``models.audit_judge`` to estimate the
+    acceptance rate, request sizes are tuned to the remaining need, and no
+    further chunks are visited once the expected curated yield meets the target.
+
+    ``sample_fraction`` or ``sample_count`` (defaults from ``generation``) mint
+    only a seeded, stratified subset of chunks for quick previews.
+
+    With a build ``graph``, documents whose minted files are up to date for the
+    current generation settings, prompts and models are not minted again; their
+    questions still seed run-scope duplicate filters.
+
+    With ``io.artifact_store_file`` set, documents are read from and items
+    written to the artifact store; the returned paths name its entries.
+    """
+    gen_cfg = cfg.generation
+    if sample_fraction is None and sample_count is None:
+        sample_fraction, sample_count = gen_cfg.sample_fraction, gen_cfg.sample_count
+    if sample_seed is None:
+        sample_seed = gen_cfg.sample_seed
+    # Validate sampling arguments before any client is created.
+    sample_size(0, sample_fraction, sample_count)
+
+    minted_dir = cfg.io.minted_path
+    minted_dir.mkdir(parents=True, exist_ok=True)
+
+    kinds = _normalize_kinds(generator_type)
+    fingerprint = mint_fingerprint(
+        cfg, kinds, target_curated, sample_fraction, sample_count, sample_seed
+    )
+    outputs: List[Path] = []
+    packable: List[PackedSource] = []
+    with _minter_session(cfg, kinds, target_curated) as minter:
+        files = list_harvested(cfg, minter.store)
+        selection: Optional[Dict[Path, Set[int]]] = None
+        if sample_fraction is not None or sample_count is not None:
+            selection = _plan_sample(
+                cfg, files, sample_fraction, sample_count, sample_seed, minter.store
+            )
+            files = [txt_file for txt_file in files if txt_file in selection]
+
+        packed: Set[Path] = set()
+        with track_stage(cfg, "mint", total=len(files)) as progress:
+            try:
+                for txt_file in files:
+                    if minter.targets_met:
+                        logger.info("Curated target reached; skipping remaining documents")
+                        break
+                    node = BuildGraph.node_id("mint", txt_file)
+                    if graph is not None and graph.is_current(node, [txt_file], fingerprint):
+                        reused = graph.reuse(node)
+                        minter.remember(reused)
+                        outputs.extend(reused)
+                        progress.add("reused")
+                        progress.advance()
+                        continue
+                    selected = selection[txt_file] if selection is not None else None
+                    produced = _mint_file(minter, txt_file, minted_dir, packable, selected)
+                    outputs.extend(produced)
+                    if graph is not None and produced:
+                        graph.record(node, [txt_file], fingerprint, produced)
+
+                for out_path in _mint_packable(minter, packable, minted_dir):
+                    packed.add(out_path)
+            except BudgetExceeded as exc:
+                # Documents written so far are complete; the rest are minted next run.
+                logger.warning("Stopping mint: %s", exc)
+        outputs.extend(sorted(packed))
+        if graph is not None:
+            for source in packable:
+                txt_file = Path(source.meta["source_file"])
+                expected = minted_names(cfg, txt_file, kinds)
+                if packed.issuperset(expected):
+                    graph.record(BuildGraph.node_id("mint", txt_file), [txt_file], fingerprint, expected)
+        minter.log_dedup_totals()
+    return outputs
@@ -2,26 +2,358 @@
 
 from __future__ import annotations
 
-import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 
+from ..budget import BudgetExceeded, budget_scope
 from ..config import ForgeConfig
-from ..export.writers import reformat_and_write
+from ..export.dedup import DEDUP_MODES, CorpusDeduplicator, sample_text_key
+from ..export.sharding import ShardWriter, remove_stale_shards, write_shard_index
+from ..export.shuffle import ExternalShuffler
+from ..export.splits import SplitAssigner
+from ..export.validation import VALIDATION_MODES, PackageValidator
+from ..export.writers import make_sink_factory, write_manifest, write_records
+from ..extensions import get_formatter
+from ..models.router import ModelRouter
+from ..progress import advance, note, track_stage
+from .buildgraph import BuildGraph, stage_fingerprint
+from .store import ArtifactStore, list_audited, read_audited, store_session
+
+logger = logging.getLogger(__name__)
+
+
+# Artifact store opened once per formatting worker process.
+_WORKER_STORE: Optional[ArtifactStore] = None
+
+
+def _open_worker_store(store_path: Optional[Path]) -> None:
+    global _WORKER_STORE
+    _WORKER_STORE = ArtifactStore(store_path) if store_path is not None else None
+
+
+def _format_samples(samples: Iterable[Dict[str, Any]], fmt: str) -> List[Tuple[str, Dict[str, Any]]]:
+    formatter = get_formatter(fmt)
+    return [(sample_text_key(sample), formatter(sample)) for sample in samples]
+
+
+def _format_file(audited_file: Path, fmt: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """Load one audited file and return ``(dedup key, formatted record)`` pairs.
+
+    Runs inside worker processes, so keys are normalized here rather than in
+    the writer loop.
+    """
+    return _format_samples(read_audited(_WORKER_STORE, audited_file), fmt)
+
+
+def _iter_formatted(
+    audited_files: Iterable[Path],
+    fmt: str,
+    workers: int,
+    store: Optional[ArtifactStore] = None,
+) -> Iterator[Tuple[Path, List[Tuple[str, Dict[str, Any]]]]]:
+    """Yield each input file with its keyed, formatted records, in input order.
+
+    With one worker inputs are consumed lazily, so ``audited_files`` may be a
+    stream that is still being produced; a process pool reads all of it first.
+    Samples are read from ``store`` when one is given.
+    """
+    if workers <= 1:
+        for audited_file in audited_files:
+            yield audited_file, _format_samples(read_audited(store, audited_file), fmt)
+            advance()
+        return
+    files = list(audited_files)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_open_worker_store,
+        initargs=(store.path if store is not None else None,),
+    ) as pool:
+        for item in zip(files, pool.map(_format_file, files, [fmt] * len(files))):
+            yield item
+            advance()
+
+
+def _open_deduplicator(
+    cfg: ForgeConfig, mode: str, packaged_dir: Path
+) -> Optional[CorpusDeduplicator]:
+    settings = cfg.packaging
+    if mode == "off":
+        return None
+    return CorpusDeduplicator(
+        mode,
+        backend=settings.dedup_backend,
+        max_distance=settings.dedup_max_distance,
+        capacity=settings.dedup_capacity,
+        error_rate=settings.dedup_error_rate,
+        spill_path=packaged_dir / ".dedup-hashes.sqlite",
+    )
+
+
+def _unique(
+    keyed: Iterable[Tuple[str, Dict[str, Any]]],
+    deduper: Optional[CorpusDeduplicator],
+    validator: Optional[PackageValidator] = None,
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Drop duplicates and let the validator observe every record that is kept."""
+    for key, record in keyed:
+        if deduper is None or not deduper.is_duplicate(key):
+            if validator is not None:
+                validator.observe(record)
+            note("records")
+            yield key, record
+        else:
+            note("duplicates")
+
+
+def _spot_check(cfg: ForgeConfig, validator: PackageValidator) -> None:
+    """Review a sample of packaged records with ``models.package_validator``."""
+    router = ModelRouter(cfg)
+    try:
+        with budget_scope(cfg):
+            validator.spot_check(
+                router.for_stage(cfg.models.package_validator),
+                template=cfg.prompts.package_validation,
+                workers=cfg.packaging.validation_workers,
+                max_tokens=cfg.curation.max_tokens,
+            )
+    except BudgetExceeded as exc:
+        # The packaged data is complete; only its review is cut short.
+        logger.warning("Skipping spot check: %s", exc)
+    finally:
+        router.close_all()
 
 
 def run_package(
     cfg: ForgeConfig,
     fmt: str = "alpaca",
+    *,
+    shard_records: Optional[int] = None,
+    shard_bytes: Optional[int] = None,
+    workers: Optional[int] = None,
+    output_format: Optional[str] = None,
+    compression: Optional[str] = None,
+    dedup: Optional[str] = None,
+    splits: Optional[Mapping[str, float]] = None,
+    shuffle: Optional[bool] = None,
+    shuffle_seed: Optional[int] = None,
+    validation: Optional[str] = None,
+    audited_files: Optional[Iterable[Path]] = None,
+    graph: Optional[BuildGraph] = None,
 ) -> List[Path]:
-    """Reformat audited files into JSONL files for downstream consumption."""
+    """Reformat audited files into JSONL or Parquet files for downstream consumption.
+
+    By default every audited file becomes its own output file. When a shard cap
+    is given (``shard_records``/``shard_bytes`` or the ``packaging`` section),
+    inputs are formatted by ``workers`` processes and written to fixed-size
+    shards such as ``train-00000-of-00042.jsonl`` plus an ``index.json``.
+    ``output_format`` (default ``packaging.output_format``) selects ``jsonl``
+    or streaming ``parquet`` for either layout, and ``compression`` (default
+    ``packaging.compression``) gzip- or zstd-compresses JSONL output.
+
+    ``dedup`` (default ``packaging.dedup``) drops samples whose normalized
+    question was already written from any audited file, exactly or, with
+    ``near``, within SimHash distance. ``splits`` (default ``packaging.splits``)
+    assigns each sample to a named split from a seeded hash of its question and
+    writes one shard set per split; duplicates are removed before assignment,
+    so they never appear in two splits.
+
+    ``shuffle`` (default ``packaging.shuffle``) globally shuffles each split
+    with a seeded external-memory shuffle: records are spilled to bucket files
+    in the packaged directory and read back one bucket at a time, so RAM use
+    is bounded by ``packaging.shuffle_max_bucket_records``.
+
+    ``validation`` (default ``packaging.validation``) checks every written
+    record against its formatter's schema (``schema``) and, with ``full``,
+    also has ``models.package_validator`` review a random sample sized by
+    Cochran's formula for ``packaging.validation_confidence`` and
+    ``validation_margin``. Results go to ``validation_report.json``.
+
+    ``audited_files`` overrides the sorted contents of the audited directory
+    (or the audited entries of ``io.artifact_store_file`` when set);
+    the streaming pipeline passes files as the audit stage finishes them.
+    With a build ``graph`` and the default inputs, packaging is skipped when
+    neither the audited files nor the packaging settings changed.
+
+    Record counts, sizes and SHA-256 checksums of every output are computed
+    while writing and listed in ``manifest.json`` (per-file layout) or
+    ``index.json`` (sharded layout).
+    """
+    settings = cfg.packaging
+    overrides = {
+        name: value
+        for name, value in {
+            "shard_records": shard_records,
+            "shard_bytes": shard_bytes,
+            "output_format": output_format,
+            "compression": compression,
+            "dedup": dedup,
+            "splits": splits,
+            "shuffle": shuffle,
+            "shuffle_seed": shuffle_seed,
+            "validation": validation,
+        }.items()
+        if value is not None
+    }
+    if shard_records is None and shard_bytes is None:
+        shard_records, shard_bytes = settings.shard_max_records, settings.shard_max_bytes
+    workers = settings.workers if workers is None else workers
+    output_format = (output_format or settings.output_format).lower()
+    if shard_bytes is not None and output_format == "parquet":
+        raise ValueError("shard_bytes applies to jsonl output; cap parquet shards with shard_records")
+    compression = compression or settings.compression
+    dedup_mode = (dedup or settings.dedup).lower()
+    if dedup_mode not in DEDUP_MODES:
+        raise ValueError(f"Unknown dedup mode '{dedup_mode}'. Available: {', '.join(DEDUP_MODES)}")
+    split_ratios = dict(settings.splits if splits is None else splits)
+    assigner = SplitAssigner(split_ratios, seed=settings.split_seed) if split_ratios else None
+    shuffle = settings.shuffle if shuffle is None else shuffle
+    shuffle_seed = settings.shuffle_seed if shuffle_seed is None else shuffle_seed
+    validation = (validation or settings.validation).lower()
+    if validation not in VALIDATION_MODES:
+        raise ValueError(
+            f"Unknown validation mode '{validation}'. Available: {', '.join(VALIDATION_MODES)}"
+        )
+    sink_factory = make_sink_factory(
+        output_format,
+        compression=compression,
+        compression_level=settings.compression_level,
+        parquet_compression=settings.parquet_compression,
+        parquet_row_group_size=settings.parquet_row_group_size,
+    )
+    suffix = sink_factory.suffix  # type: ignore[attr-defined]
+    try:
+        get_formatter(fmt)
+    except KeyError as exc:
+        raise ValueError(str(exc)) from exc
+
     packaged_dir = cfg.io.packaged_path
     packaged_dir.mkdir(parents=True, exist_ok=True)
+    fingerprint = ""
+    if audited_files is None:
+        with store_session(cfg) as store:
+            audited_files = list_audited(cfg, store)
+        if graph is not None:
+            fingerprint = stage_fingerprint(cfg, "package", fmt=fmt, overrides=overrides)
+            if graph.is_current(BuildGraph.node_id("package"), audited_files, fingerprint):
+                logger.info("Packaged outputs are up to date; skipping package")
+                return graph.reuse(BuildGraph.node_id("package"))
+    input_count = 0
+    details: Dict[str, Any] = {
+        "format": fmt,
+        "output_format": output_format,
+        "compression": compression,
+    }
+
+    total = len(audited_files) if isinstance(audited_files, list) else None
+    with store_session(cfg) as store, track_stage(cfg, "package", total=total, unit="file"):
+        deduper = _open_deduplicator(cfg, dedup_mode, packaged_dir)
+        validator = (
+            PackageValidator(
+                fmt,
+                confidence=settings.validation_confidence,
+                margin=settings.validation_margin,
+                seed=settings.validation_seed,
+            )
+            if validation != "off"
+            else None
+        )
+        shufflers: Dict[str, ExternalShuffler] = {}
+        writers: Dict[str, ShardWriter] = {}
+        try:
+            sharded = shard_records is not None or shard_bytes is not None
+            if not (sharded or assigner is not None or shuffle):
+                outputs: List[Path] = []
+                infos = []
+                for audited_file, keyed in _iter_formatted(audited_files, fmt, workers, store):
+                    input_count += 1
+                    out_path = packaged_dir / audited_file.name.replace(
+                        ".audited.json", f".{fmt}{suffix}"
+                    )
+                    records = (record for _, record in _unique(keyed, deduper, validator))
+                    infos.append(write_records(records, sink_factory(out_path)))
+                    outputs.append(out_path)
+                if deduper is not None:
+                    details["dedup"] = deduper.stats()
+                write_manifest(packaged_dir, infos, **details)
+            else:
+                prefixes = assigner.names if assigner is not None else [settings.shard_prefix]
+                for prefix in prefixes:
+                    remove_stale_shards(packaged_dir, prefix)
+                    writers[prefix] = ShardWriter(
+                        packaged_dir,
+                        prefix,
+                        max_records=shard_records,
+                        max_bytes=shard_bytes,
+                        sink_factory=sink_factory,
+                        suffix=suffix,
+                    )
+                if shuffle:
+                    shufflers = {
+                        prefix: ExternalShuffler(
+                            packaged_dir,
+                            seed=f"{shuffle_seed}:{prefix}",
+                            num_buckets=settings.shuffle_buckets,
+                            max_bucket_records=settings.shuffle_max_bucket_records,
+                        )
+                        for prefix in prefixes
+                    }
+                for _, keyed in _iter_formatted(audited_files, fmt, workers, store):
+                    input_count += 1
+                    for key, record in _unique(keyed, deduper, validator):
+                        prefix = assigner.assign(key) if assigner is not None else prefixes[0]
+                        if shufflers:
+                            shufflers[prefix].add(record)
+                        else:
+                            writers[prefix].write(record)
+                for prefix, shuffler in shufflers.items():
+                    for record in shuffler:
+                        writers[prefix].write(record)
+                shards = {prefix: writer.close() for prefix, writer in writers.items()}
+        except BaseException:
+            # Release open sinks and drop ``.partial`` shards instead of leaving them for the next run.
+            for writer in writers.values():
+                writer.abort()
+            raise
+        finally:
+            if deduper is not None:
+                deduper.close()
+            for shuffler in shufflers.values():
+                shuffler.close()
 
-    outputs: List[Path] = []
-    for audited_file in cfg.io.audited_path.glob("*.audited.json"):
-        samples = json.loads(audited_file.read_text(encoding="utf-8"))
-        out_path = packaged_dir / audited_file.name.replace(".audited.json", f".{fmt}.jsonl")
-        reformat_and_write(samples, fmt=fmt, out_path=out_path)
-        outputs.append(out_path)
+        if writers:
+            if deduper is not None:
+                details["dedup"] = deduper.stats()
+            if assigner is not None:
+                details["split_seed"] = assigner.seed
+                details["split_ratios"] = split_ratios
+            if shuffle:
+                details["shuffle_seed"] = shuffle_seed
+            index_path = write_shard_index(packaged_dir, shards, **details)
+            logger.info(
+                "Packaged %s records from %s audited files into %s shards (index: %s)",
+                sum(shard.records for group in shards.values() for shard in group),
+                input_count,
+                sum(len(group) for group in shards.values()),
+                index_path,
+            )
+            outputs = [packaged_dir / shard.file for group in shards.values() for shard in group]
+        if deduper is not None:
+            logger.info(
+                "Dropped %s exact and %s near duplicates",
+                deduper.exact_hits,
+                deduper.near_hits,
+            )
+        if validator is not None:
+            if validation == "full":
+                _spot_check(cfg, validator)
+            validator.write_report(packaged_dir)
+    if fingerprint and graph is not None:
+        graph.record(
+            BuildGraph.node_id("package"),
+            list(audited_files),  # a list whenever a fingerprint was computed
+            fingerprint,
+            outputs,
+        )
     return outputs
@@ -1,28 +1,82 @@
-﻿"""Convenience helper that executes the full pipeline sequentially."""
+﻿"""Convenience helper that executes the full pipeline, sequentially or streaming."""
 
 from __future__ import annotations
 
+from typing import Optional, Sequence, Union
+
+from ..budget import budget_scope
 from ..config import ForgeConfig
 from .harvest import run_harvest
 from .mint import run_mint
 from .audit import run_audit
 from .package import run_package
+from .buildgraph import BuildGraph
+from .streaming import run_streaming_pipeline
 
 
 def run_pipeline(
     cfg: ForgeConfig,
-    generator_type: str = "qa",
+    generator_type: Union[str, Sequence[str]] = "qa",
     export_fmt: str = "alpaca",
+    target_curated: Optional[int] = None,
+    sample_fraction: Optional[float] = None,
+    sample_count: Optional[int] = None,
+    sample_seed: Optional[int] = None,
+    streaming: Optional[bool] = None,
+    incremental: Optional[bool] = None,
 ) -> None:
-    """Execute each stage in order, surfacing progress on stdout."""
-    print("-> Stage 1: harvest")
-    run_harvest(cfg)
+    """Execute each stage in order, surfacing progress on stdout.
+
+    With ``streaming`` (default ``pipeline.streaming``) the stages instead run
+    concurrently, handing documents downstream as soon as they are ready; see
+    :func:`run_streaming_pipeline`.
+
+    With ``incremental`` (default ``pipeline.incremental``) each stage
+    consults the build graph and only recomputes artifacts whose inputs,
+    config, prompts or model refs changed since the last run.
+    """
+    streaming = cfg.pipeline.streaming if streaming is None else streaming
+    incremental = cfg.pipeline.incremental if incremental is None else incremental
+    if streaming and incremental:
+        raise ValueError("Incremental builds are not supported by the streaming pipeline")
+    if streaming:
+        if sample_fraction is not None or sample_count is not None:
+            raise ValueError("Chunk sampling is not supported by the streaming pipeline")
+        print("-> Streaming harvest -> mint -> audit -> package")
+        run_streaming_pipeline(
+            cfg,
+            generator_type=generator_type,
+            export_fmt=export_fmt,
+            target_curated=target_curated,
+        )
+        return
+
+    graph = BuildGraph.for_config(cfg) if incremental else None
+    # One ledger spans every stage so ``budget`` limits apply to the whole run.
+    with budget_scope(cfg):
+        try:
+            print("-> Stage 1: harvest")
+            run_harvest(cfg, graph=graph)
 
-    print("-> Stage 2: mint")
-    run_mint(cfg, generator_type=generator_type)
+            print("-> Stage 2: mint")
+            run_mint(
+                cfg,
+                generator_type=generator_type,
+                target_curated=target_curated,
+                sample_fraction=sample_fraction,
+                sample_count=sample_count,
+                sample_seed=sample_seed,
+                graph=graph,
+            )
 
-    print("-> Stage 3: audit")
-    run_audit(cfg)
+            print("-> Stage 3: audit")
+            run_audit(cfg, graph=graph)
 
-    print("-> Stage 4: package")
-    run_package(cfg, fmt=export_fmt)
+            print("-> Stage 4: package")
+            run_package(cfg, fmt=export_fmt, graph=graph)
+        finally:
+            # Persist what finished even if a later stage fails.
+            if graph is not None:
+                graph.save()
+    if graph is not None:
+        graph.log_summary()
@@ -0,0 +1,324 @@
+"""Optional SQLite store for harvested text, minted items and audit verdicts."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from ..config import ForgeConfig, IOSettings
+
+logger = logging.getLogger(__name__)
+
+_VERDICT_FIELDS = ("score", "label", "judge_rationale")
+
+
+def _split_minted(name: str) -> Tuple[str, str]:
+    """Map ``<doc>.<kind>.json`` (or ``.audited.json``) to ``(<doc>.txt, kind)``."""
+    base = name[: -len(".audited.json")] if name.endswith(".audited.json") else name[: -len(".json")]
+    stem, kind = base.rsplit(".", 1)
+    return stem + ".txt", kind
+
+
+def _minted_name(document: str, kind: str) -> str:
+    return f"{Path(document).stem}.{kind}.json"
+
+
+def _audited_name(document: str, kind: str) -> str:
+    return f"{Path(document).stem}.{kind}.audited.json"
+
+
+class ArtifactStore:
+    """Keep stage artifacts as rows instead of one file per document and stage.
+
+    Artifacts are addressed by the file names the directory layout would use
+    (``doc.txt``, ``doc.qa.json``, ``doc.qa.audited.json``), so stages pass
+    the same paths around either way. Minted items are stored one row each
+    with their chunk index, and audit decisions update those rows in place;
+    lookups by document, chunk and status are indexed. Writes commit per
+    document, so an interrupted stage keeps everything it finished. Several
+    processes on one host may share the store.
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), timeout=60.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            " name TEXT PRIMARY KEY,"
+            " source TEXT,"
+            " text TEXT NOT NULL,"
+            " updated_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS minted ("
+            " document TEXT NOT NULL,"
+            " kind TEXT NOT NULL,"
+            " digest TEXT NOT NULL,"
+            " minted_at REAL NOT NULL,"
+            " audited_at REAL,"
+            " PRIMARY KEY (document, kind));"
+            "CREATE TABLE IF NOT EXISTS items ("
+            " document TEXT NOT NULL,"
+            " kind TEXT NOT NULL,"
+            " idx INTEGER NOT NULL,"
+            " chunk INTEGER,"
+            " payload TEXT NOT NULL,"
+            " status TEXT,"
+            " score REAL,"
+            " label TEXT,"
+            " rationale TEXT,"
+            " PRIMARY KEY (document, kind, idx));"
+            "CREATE INDEX IF NOT EXISTS items_chunk ON items (document, chunk);"
+            "CREATE INDEX IF NOT EXISTS items_status ON items (status, kind);"
+            "CREATE INDEX IF NOT EXISTS minted_audited ON minted (audited_at);"
+        )
+        self._conn.commit()
+
+    def _query(self, sql: str, params: Sequence = ()) -> List[Tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # Harvest -------------------------------------------------------------
+
+    def put_document(self, name: str, text: str, source: Optional[str] = None) -> None:
+        """Store the normalized text of harvested document ``name``."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO documents (name, source, text, updated_at) VALUES (?, ?, ?, ?)",
+                (name, source, text, time.time()),
+            )
+
+    def documents(self) -> List[str]:
+        return [row[0] for row in self._query("SELECT name FROM documents ORDER BY name")]
+
+    def document_length(self, name: str) -> Optional[int]:
+        """Length in characters of document ``name`` without loading its text."""
+        rows = self._query("SELECT length(text) FROM documents WHERE name = ?", (name,))
+        return rows[0][0] if rows else None
+
+    def document_text(self, name: str) -> Optional[str]:
+        rows = self._query("SELECT text FROM documents WHERE name = ?", (name,))
+        return rows[0][0] if rows else None
+
+    # Mint ----------------------------------------------------------------
+
+    def put_items(self, name: str, payloads: Sequence[Dict[str, Any]]) -> None:
+        """Replace the items of minted file ``name``, clearing earlier audit decisions."""
+        document, kind = _split_minted(name)
+        blobs = [json.dumps(payload, ensure_ascii=False) for payload in payloads]
+        digest = hashlib.sha256("\n".join(blobs).encode("utf-8")).hexdigest()
+        rows = []
+        for idx, (payload, blob) in enumerate(zip(payloads, blobs)):
+            meta = payload.get("meta") if isinstance(payload, dict) else None
+            chunk = meta.get("chunk_index") if isinstance(meta, dict) else None
+            rows.append((document, kind, idx, chunk if isinstance(chunk, int) else None, blob))
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM items WHERE document = ? AND kind = ?", (document, kind))
+            self._conn.executemany(
+                "INSERT INTO items (document, kind, idx, chunk, payload) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO minted (document, kind, digest, minted_at, audited_at)"
+                " VALUES (?, ?, ?, ?, NULL)",
+                (document, kind, digest, time.time()),
+            )
+
+    def minted(self) -> List[str]:
+        """Return the names of all minted files, audited or not."""
+        rows = self._query("SELECT document, kind FROM minted ORDER BY document, kind")
+        return [_minted_name(document, kind) for document, kind in rows]
+
+    def items(self, name: str) -> List[Dict[str, Any]]:
+        document, kind = _split_minted(name)
+        rows = self._query(
+            "SELECT payload FROM items WHERE document = ? AND kind = ? ORDER BY idx", (document, kind)
+        )
+        return [json.loads(row[0]) for row in rows]
+
+    def minted_digest(self, name: str) -> Optional[str]:
+        """Content hash of minted file ``name``, the store's counterpart of ``file_digest``."""
+        rows = self._query(
+            "SELECT digest FROM minted WHERE document = ? AND kind = ?", _split_minted(name)
+        )
+        return rows[0][0] if rows else None
+
+    # Audit ---------------------------------------------------------------
+
+    def record_audit(
+        self, name: str, decisions: Iterable[Tuple[int, str, Dict[str, Any]]]
+    ) -> None:
+        """Store ``(index, status, verdict)`` for the items of ``name`` and mark it audited."""
+        document, kind = _split_minted(name)
+        rows = [
+            (status, *(verdict.get(field) for field in _VERDICT_FIELDS), document, kind, idx)
+            for idx, status, verdict in decisions
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE items SET status = ?, score = ?, label = ?, rationale = ?"
+                " WHERE document = ? AND kind = ? AND idx = ?",
+                rows,
+            )
+            self._conn.execute(
+                "UPDATE minted SET audited_at = ? WHERE document = ? AND kind = ?",
+                (time.time(), document, kind),
+            )
+
+    def is_audited(self, name: str) -> bool:
+        """Whether minted file ``name`` has been audited since it was last minted."""
+        rows = self._query(
+            "SELECT 1 FROM minted WHERE document = ? AND kind = ? AND audited_at IS NOT NULL",
+            _split_minted(name),
+        )
+        return bool(rows)
+
+    def audited(self) -> List[str]:
+        """Return the names of curated outputs, one per audited minted file."""
+        rows = self._query(
+            "SELECT document, kind FROM minted WHERE audited_at IS NOT NULL ORDER BY document, kind"
+        )
+        return [_audited_name(document, kind) for document, kind in rows]
+
+    def curated(self, name: str) -> List[Dict[str, Any]]:
+        """Return the kept samples of ``name`` with their verdict fields, as audit writes them."""
+        document, kind = _split_minted(name)
+        rows = self._query(
+            "SELECT payload, score, label, rationale FROM items"
+            " WHERE document = ? AND kind = ? AND status = 'kept' ORDER BY idx",
+            (document, kind),
+        )
+        return [
+            json.loads(payload) | dict(zip(_VERDICT_FIELDS, verdict)) for payload, *verdict in rows
+        ]
+
+    def status_counts(self) -> Dict[str, int]:
+        """Number of items per audit status; ``pending`` counts items not audited yet."""
+        rows = self._query("SELECT COALESCE(status, 'pending'), COUNT(*) FROM items GROUP BY 1")
+        return dict(rows)
+
+    # Export --------------------------------------------------------------
+
+    def export(self, io: IOSettings) -> Dict[str, int]:
+        """Write every artifact back to the directory layout and return counts per stage."""
+        counts = {"harvested": 0, "minted": 0, "audited": 0}
+        io.harvested_path.mkdir(parents=True, exist_ok=True)
+        for name in self.documents():
+            (io.harvested_path / name).write_text(self.document_text(name) or "", encoding="utf-8")
+            counts["harvested"] += 1
+        io.minted_path.mkdir(parents=True, exist_ok=True)
+        for name in self.minted():
+            payload = self.items(name)
+            (io.minted_path / name).write_text(
+                json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8"
+            )
+            counts["minted"] += 1
+        io.audited_path.mkdir(parents=True, exist_ok=True)
+        for name in self.audited():
+            (io.audited_path / name).write_text(
+                json.dumps(self.curated(name), ensure_ascii=False, indent=2), encoding="utf-8"
+            )
+            counts["audited"] += 1
+        logger.info(
+            "Exported %s harvested, %s minted and %s audited files from %s",
+            counts["harvested"],
+            counts["minted"],
+            counts["audited"],
+            self.path,
+        )
+        return counts
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def open_artifact_store(cfg: ForgeConfig) -> Optional[ArtifactStore]:
+    """Return the project's artifact store, or ``None`` when artifacts live in directories."""
+    path = cfg.io.artifact_store_path
+    if path is None:
+        return None
+    return ArtifactStore(path)
+
+
+@contextmanager
+def store_session(cfg: ForgeConfig) -> Iterator[Optional[ArtifactStore]]:
+    """Open the artifact store (``None`` without one) for the block and close it afterwards."""
+    store = open_artifact_store(cfg)
+    try:
+        yield store
+    finally:
+        if store is not None:
+            store.close()
+
+
+def list_harvested(cfg: ForgeConfig, store: Optional[ArtifactStore]) -> List[Path]:
+    """Harvested documents, from ``store`` or the harvested directory, sorted by name."""
+    if store is not None:
+        return [cfg.io.harvested_path / name for name in store.documents()]
+    return sorted(cfg.io.harvested_path.glob("*.txt"))
+
+
+def list_minted(cfg: ForgeConfig, store: Optional[ArtifactStore]) -> List[Path]:
+    if store is not None:
+        return [cfg.io.minted_path / name for name in store.minted()]
+    return sorted(cfg.io.minted_path.glob("*.json"))
+
+
+def list_audited(cfg: ForgeConfig, store: Optional[ArtifactStore]) -> List[Path]:
+    if store is not None:
+        return [cfg.io.audited_path / name for name in store.audited()]
+    return sorted(cfg.io.audited_path.glob("*.audited.json"))
+
+
+def read_harvested(store: Optional[ArtifactStore], path: Path) -> str:
+    """Return the text of harvested document ``path``; missing documents raise ``FileNotFoundError``."""
+    if store is None:
+        return path.read_text(encoding="utf-8")
+    text = store.document_text(path.name)
+    if text is None:
+        raise FileNotFoundError(f"{path.name} is not in the artifact store {store.path}")
+    return text
+
+
+def harvested_size(store: Optional[ArtifactStore], path: Path) -> int:
+    """Size of harvested document ``path`` without reading it.
+
+    The store reports characters; on disk this is the file size in bytes, an
+    upper bound on characters for non-ASCII text.
+    """
+    if store is None:
+        return path.stat().st_size
+    length = store.document_length(path.name)
+    if length is None:
+        raise FileNotFoundError(f"{path.name} is not in the artifact store {store.path}")
+    return length
+
+
+def read_minted(store: Optional[ArtifactStore], path: Path) -> Any:
+    """Return the payload of minted file ``path``."""
+    if store is None:
+        return json.loads(path.read_text(encoding="utf-8"))
+    return store.items(path.name)
+
+
+def read_audited(store: Optional[ArtifactStore], path: Path) -> List[Dict[str, Any]]:
+    """Return the curated samples of audited file ``path``."""
+    if store is None:
+        return json.loads(path.read_text(encoding="utf-8"))
+    return store.curated(path.name)
+
+
+def export_store(cfg: ForgeConfig) -> Dict[str, int]:
+    """Write the configured artifact store back to the harvested, minted and audited directories."""
+    with store_session(cfg) as store:
+        if store is None:
+            raise ValueError("No artifact store configured; set io.artifact_store_file")
+        return store.export(cfg.io)
@@ -0,0 +1,246 @@
+"""Streaming pipeline: stages run concurrently and hand items over bounded queues."""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+from ..budget import BudgetExceeded, budget_scope
+from ..config import ForgeConfig
+from ..generation.packing import PackedSource
+from ..io.loaders import iter_harvested
+from ..metrics import QUEUE_DEPTH
+from ..progress import track_stage
+from .audit import _auditor_session
+from .harvest import _write_harvested
+from .mint import _mint_file, _mint_packable, _minter_session
+from .package import run_package
+from .store import store_session
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+_POLL_SECONDS = 0.1
+
+
+class _Cancelled(Exception):
+    """Raised inside a stage when another stage failed and the run is aborting."""
+
+
+class _Channel:
+    """Bounded hand-off between two stages; blocking calls give up once the run is cancelled."""
+
+    def __init__(self, maxsize: int, cancel: threading.Event, name: str = "stream"):
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=maxsize)
+        self._cancel = cancel
+        self.name = name
+
+    def _publish_depth(self) -> None:
+        QUEUE_DEPTH.set(self._queue.qsize(), queue=self.name, status="pending")
+
+    def put(self, item: Any) -> None:
+        while True:
+            if self._cancel.is_set():
+                raise _Cancelled()
+            try:
+                self._queue.put(item, timeout=_POLL_SECONDS)
+                self._publish_depth()
+                return
+            except queue.Full:
+                continue
+
+    def close(self) -> None:
+        """Signal the end of the stream to the consuming stage."""
+        self.put(_DONE)
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            if self._cancel.is_set():
+                raise _Cancelled()
+            try:
+                item = self._queue.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+            self._publish_depth()
+            if item is _DONE:
+                return
+            yield item
+
+
+@dataclass
+class StageTiming:
+    """Wall-clock span and item count of one stage in a streaming run."""
+
+    items: int = 0
+    started: Optional[float] = None
+    first_item: Optional[float] = None
+    finished: Optional[float] = None
+
+    def mark(self) -> None:
+        self.items += 1
+        if self.first_item is None:
+            self.first_item = time.monotonic()
+
+
+@dataclass
+class StreamingResult:
+    """Packaged outputs plus per-stage timings of a streaming run."""
+
+    outputs: List[Path] = field(default_factory=list)
+    timings: Dict[str, StageTiming] = field(default_factory=dict)
+    wall_seconds: float = 0.0
+
+
+def run_streaming_pipeline(
+    cfg: ForgeConfig,
+    generator_type: Union[str, Sequence[str]] = "qa",
+    export_fmt: str = "alpaca",
+    target_curated: Optional[int] = None,
+    queue_size: Optional[int] = None,
+) -> StreamingResult:
+    """Run harvest -> mint -> audit -> package as concurrent stages.
+
+    Each stage runs in its own thread and passes file paths downstream through
+    a queue holding at most ``queue_size`` items (default
+    ``pipeline.queue_size``), so a document is being judged while later ones
+    are still minted and memory stays bounded when a stage falls behind.
+    Wall time therefore approaches that of the slowest stage instead of the
+    sum. Only documents harvested in this run flow through; short documents
+    deferred for packing are minted once harvest finishes. Chunk sampling
+    needs the full corpus up front and is only available in the batch pipeline.
+
+    If any stage fails the others are cancelled and the first error is raised.
+    """
+    queue_size = cfg.pipeline.queue_size if queue_size is None else queue_size
+    if queue_size <= 0:
+        raise ValueError(f"queue_size must be positive, got {queue_size}")
+    cancel = threading.Event()
+    harvested = _Channel(queue_size, cancel, "stream:harvested")
+    minted = _Channel(queue_size, cancel, "stream:minted")
+    audited = _Channel(queue_size, cancel, "stream:audited")
+    result = StreamingResult(
+        timings={name: StageTiming() for name in ("harvest", "mint", "audit", "package")}
+    )
+    errors: List[BaseException] = []
+
+    def harvest_stage() -> None:
+        cfg.io.harvested_path.mkdir(parents=True, exist_ok=True)
+        with store_session(cfg) as store, track_stage(cfg, "harvest") as progress:
+            for doc in iter_harvested(cfg.io.input_root):
+                harvested.put(_write_harvested(cfg, doc, store))
+                result.timings["harvest"].mark()
+                progress.advance()
+        harvested.close()
+
+    def mint_stage() -> None:
+        minted_dir = cfg.io.minted_path
+        minted_dir.mkdir(parents=True, exist_ok=True)
+        packable: List[PackedSource] = []
+        exhausted = False
+        with _minter_session(cfg, generator_type, target_curated) as minter, track_stage(
+            cfg, "mint"
+        ):
+            for txt_file in harvested:
+                # Keep draining once the target or budget is spent so harvest never blocks.
+                if minter.targets_met or exhausted:
+                    continue
+                try:
+                    for out_path in _mint_file(minter, txt_file, minted_dir, packable):
+                        minted.put(out_path)
+                        result.timings["mint"].mark()
+                except BudgetExceeded as exc:
+                    logger.warning("Stopping mint: %s", exc)
+                    exhausted = True
+            try:
+                for out_path in _mint_packable(minter, [] if exhausted else packable, minted_dir):
+                    minted.put(out_path)
+                    result.timings["mint"].mark()
+            except BudgetExceeded as exc:
+                logger.warning("Stopping mint: %s", exc)
+            minter.log_dedup_totals()
+        minted.close()
+
+    def audit_stage() -> None:
+        exhausted = False
+        with _auditor_session(cfg) as auditor, track_stage(cfg, "audit", unit="file"):
+            for minted_file in minted:
+                if exhausted:
+                    continue
+                try:
+                    out_path = auditor.audit_file(minted_file)
+                except BudgetExceeded as exc:
+                    logger.warning("Stopping audit: %s", exc)
+                    exhausted = True
+                    continue
+                if out_path is not None:
+                    audited.put(out_path)
+                    result.timings["audit"].mark()
+            auditor.write_report()
+        audited.close()
+
+    def package_stage() -> None:
+        def counted() -> Iterator[Path]:
+            for audited_file in audited:
+                result.timings["package"].mark()
+                yield audited_file
+
+        # Formatting workers would read the whole stream first; stay lazy here.
+        result.outputs = run_package(cfg, fmt=export_fmt, workers=1, audited_files=counted())
+
+    # A stage closes its output channel only on success; on failure it cancels
+    # the run instead, so downstream stages never mistake a crash for the end.
+    def run_stage(name: str, body: Callable[[], None]) -> None:
+        timing = result.timings[name]
+        timing.started = time.monotonic()
+        try:
+            body()
+        except _Cancelled:
+            logger.info("Stage %s cancelled", name)
+        except BaseException as exc:  # noqa: BLE001 - re-raised by the caller
+            logger.error("Stage %s failed: %s", name, exc)
+            errors.append(exc)
+            cancel.set()
+        finally:
+            timing.finished = time.monotonic()
+
+    stages = {
+        "harvest": harvest_stage,
+        "mint": mint_stage,
+        "audit": audit_stage,
+        "package": package_stage,
+    }
+    started = time.monotonic()
+    with budget_scope(cfg):
+        # Stage threads share the run's budget ledger through a copy of this context.
+        threads = [
+            threading.Thread(
+                target=contextvars.copy_context().run,
+                args=(run_stage, name, body),
+                name=f"synthkit-{name}",
+                daemon=True,
+            )
+            for name, body in stages.items()
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    result.wall_seconds = time.monotonic() - started
+
+    if errors:
+        raise errors[0]
+    for name, timing in result.timings.items():
+        logger.info(
+            "Stage %s processed %s items in %.1fs",
+            name,
+            timing.items,
+            (timing.finished or started) - (timing.started or started),
+        )
+    logger.info("Streaming pipeline finished in %.1fs", result.wall_seconds)
+    return result
@@ -0,0 +1,212 @@
+"""Worker mode: several processes mint or audit documents claimed from a shared queue."""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import socket
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Set, Union
+
+from ..budget import BudgetExceeded
+from ..config import ForgeConfig
+from ..generation.packing import PackedSource
+from ..metrics import record_queue_depth
+from .audit import _auditor_session
+from .buildgraph import minted_names
+from .mint import _mint_file, _mint_packable, _minter_session, _normalize_kinds
+from ..progress import track_stage
+from .store import ArtifactStore, list_harvested, list_minted
+from .workqueue import TASK_STATUSES, WORKER_STAGES, LeaseHeartbeat, WorkQueue
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WorkerResult:
+    """What one worker did before the queue drained or it hit ``max_items``."""
+
+    worker_id: str
+    stage: str
+    completed: int = 0
+    failed: int = 0
+    outputs: List[Path] = field(default_factory=list)
+    queue: Dict[str, int] = field(default_factory=dict)
+
+
+def default_worker_id() -> str:
+    """Return ``<hostname>-<pid>``, unique across hosts sharing the working root."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def _stage_inputs(cfg: ForgeConfig, stage: str, store: Optional[ArtifactStore]) -> List[str]:
+    paths = list_harvested(cfg, store) if stage == "mint" else list_minted(cfg, store)
+    return [path.name for path in paths]
+
+
+def _publish_depth(queue: WorkQueue, stage: str) -> None:
+    # Statuses without items are absent from ``counts``; report them as empty.
+    counts = dict.fromkeys(TASK_STATUSES, 0) | queue.counts(stage)
+    record_queue_depth(f"work:{stage}", counts)
+
+
+def run_worker(
+    cfg: ForgeConfig,
+    stage: str,
+    generator_type: Union[str, Sequence[str]] = "qa",
+    *,
+    worker_id: Optional[str] = None,
+    max_items: Optional[int] = None,
+    idle_timeout: float = 0.0,
+) -> WorkerResult:
+    """Claim and process documents of ``stage`` until no work is left.
+
+    Any number of workers may run against the same ``io.working_root``, on one
+    machine or on hosts sharing the filesystem. Each one enqueues the stage's
+    inputs it can see (harvested text for ``mint``, minted files for
+    ``audit``) into ``io.work_queue_path`` and then leases documents one at a
+    time, renewing the lease in the background while it works. Documents of a
+    crashed worker become claimable again once ``pipeline.lease_seconds``
+    pass; a document failing ``pipeline.max_attempts`` times is marked failed.
+
+    With ``idle_timeout`` a worker that finds no claimable work keeps polling
+    for new inputs for that many seconds, so audit workers can run alongside
+    mint workers. Run-scope dedup and curated targets are tracked per worker;
+    chunk sampling is only available in ``run_mint``. Audit workers keep their
+    own journal and ``audit_report.<worker>.json``.
+    """
+    if stage not in WORKER_STAGES:
+        raise ValueError(f"Unknown worker stage '{stage}'. Available: {', '.join(WORKER_STAGES)}")
+    worker_id = worker_id or default_worker_id()
+    # Worker ids end up in file names.
+    file_id = re.sub(r"[^A-Za-z0-9_.-]", "-", worker_id)
+    settings = cfg.pipeline
+    result = WorkerResult(worker_id=worker_id, stage=stage)
+    input_dir = cfg.io.harvested_path if stage == "mint" else cfg.io.minted_path
+    minted_dir = cfg.io.minted_path
+    minted_dir.mkdir(parents=True, exist_ok=True)
+    # Short documents deferred for packing stay leased until their group is minted.
+    packable: List[PackedSource] = []
+    deferred: Dict[str, str] = {}
+
+    with ExitStack() as stack:
+        queue = WorkQueue(
+            cfg.io.work_queue_path,
+            worker_id,
+            lease_seconds=settings.lease_seconds,
+            max_attempts=settings.max_attempts,
+        )
+        stack.callback(queue.close)
+        process: Callable[[Path], List[Path]]
+        if stage == "mint":
+            kinds = _normalize_kinds(generator_type)
+            minter = stack.enter_context(_minter_session(cfg, kinds, None))
+
+            def mint_one(path: Path) -> List[Path]:
+                before = len(packable)
+                outputs = _mint_file(minter, path, minted_dir, packable)
+                if len(packable) > before:
+                    deferred[packable[-1].meta["source_file"]] = path.name
+                return outputs
+
+            process = mint_one
+            store = minter.store
+        else:
+            journal = cfg.io.audit_journal_path
+            auditor = stack.enter_context(
+                _auditor_session(
+                    cfg, journal_path=journal.with_name(f"{journal.stem}.{file_id}{journal.suffix}")
+                )
+            )
+
+            def audit_one(path: Path) -> List[Path]:
+                out_path = auditor.audit_file(path)
+                return [out_path] if out_path is not None else []
+
+            process = audit_one
+            store = auditor.store
+
+        stack.enter_context(track_stage(cfg, stage, unit="doc" if stage == "mint" else "file"))
+        heartbeat = stack.enter_context(LeaseHeartbeat(queue, stage))
+        # Hand back whatever is still leased if the worker stops abruptly.
+        stack.callback(lambda: queue.release(stage, list(heartbeat.held)))
+
+        queue.enqueue(stage, _stage_inputs(cfg, stage, store))
+        idle_since: Optional[float] = None
+        exhausted = False
+        while max_items is None or result.completed + result.failed < max_items:
+            if stage == "mint" and minter.targets_met:
+                logger.info("Curated target reached; worker %s stops claiming", worker_id)
+                break
+            item = queue.claim(stage)
+            _publish_depth(queue, stage)
+            if item is None:
+                if queue.enqueue(stage, _stage_inputs(cfg, stage, store)):
+                    continue
+                idle_since = idle_since or time.monotonic()
+                if time.monotonic() - idle_since >= idle_timeout:
+                    break
+                time.sleep(min(settings.poll_seconds, idle_timeout))
+                continue
+            idle_since = None
+            heartbeat.hold(item)
+            try:
+                outputs = process(input_dir / item)
+            except BudgetExceeded as exc:
+                # Not the document's fault: hand it back for a worker with budget left.
+                logger.warning("Worker %s stops: %s", worker_id, exc)
+                queue.release(stage, [item])
+                heartbeat.drop(item)
+                exhausted = True
+                break
+            except Exception as exc:  # noqa: BLE001 - recorded in the queue and retried
+                logger.exception("Worker %s failed on %s", worker_id, item)
+                queue.fail(stage, item, f"{type(exc).__name__}: {exc}")
+                heartbeat.drop(item)
+                result.failed += 1
+                continue
+            if item in deferred.values():
+                continue
+            if queue.complete(stage, item, outputs):
+                result.completed += 1
+                result.outputs.extend(outputs)
+            heartbeat.drop(item)
+
+        if stage == "mint":
+            if packable and not exhausted:
+                produced: Set[Path] = set()
+                try:
+                    for out_path in _mint_packable(minter, packable, minted_dir):
+                        produced.add(out_path)
+                except BudgetExceeded as exc:
+                    logger.warning("Worker %s stops packing: %s", worker_id, exc)
+                for source in packable:
+                    txt_file = Path(source.meta["source_file"])
+                    item = deferred[str(txt_file)]
+                    outputs = [path for path in minted_names(cfg, txt_file, kinds) if path in produced]
+                    if not outputs:
+                        # Packing stopped early at the curated target or budget.
+                        continue
+                    if queue.complete(stage, item, outputs):
+                        result.completed += 1
+                        result.outputs.extend(outputs)
+                    heartbeat.drop(item)
+            minter.log_dedup_totals()
+        else:
+            auditor.write_report(f"audit_report.{file_id}.json")
+        result.queue = queue.counts(stage)
+        _publish_depth(queue, stage)
+
+    logger.info(
+        "Worker %s finished %s: %s completed, %s failed; queue %s",
+        worker_id,
+        stage,
+        result.completed,
+        result.failed,
+        result.queue,
+    )
+    return result
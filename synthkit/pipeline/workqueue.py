@@ -0,0 +1,227 @@
+"""SQLite work queue with expiring leases shared by ``synthkit worker`` processes."""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+logger = logging.getLogger(__name__)
+
+TASK_STATUSES = ("pending", "leased", "done", "failed")
+WORKER_STAGES = ("mint", "audit")
+
+
+class WorkQueue:
+    """Hand out work items to concurrent workers through leases stored in SQLite.
+
+    Items are keyed by ``(stage, item)`` and enqueued idempotently, so every
+    worker may seed the queue from the directory it reads. A claim leases one
+    item for ``lease_seconds``; holders renew leases while they work, and an
+    expired lease (a crashed or stalled worker) makes the item claimable again
+    until it has been attempted ``max_attempts`` times. All state changes run
+    in ``BEGIN IMMEDIATE`` transactions, so processes on one host, or on hosts
+    sharing a filesystem with working POSIX locks, never claim the same item.
+    The rollback journal is kept because WAL mode needs shared memory that
+    network filesystems do not provide.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        worker_id: str,
+        *,
+        lease_seconds: float = 600.0,
+        max_attempts: int = 3,
+    ):
+        if lease_seconds <= 0:
+            raise ValueError(f"lease_seconds must be positive, got {lease_seconds}")
+        if max_attempts <= 0:
+            raise ValueError(f"max_attempts must be positive, got {max_attempts}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(path), timeout=60.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            " stage TEXT NOT NULL,"
+            " item TEXT NOT NULL,"
+            " status TEXT NOT NULL DEFAULT 'pending',"
+            " worker TEXT,"
+            " lease_expires REAL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " outputs TEXT,"
+            " error TEXT,"
+            " updated_at REAL NOT NULL,"
+            " PRIMARY KEY (stage, item))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS tasks_status ON tasks (stage, status)")
+
+    def _write(self, sql: str, params: Sequence) -> int:
+        with self._lock:
+            return self._conn.execute(sql, params).rowcount
+
+    def enqueue(self, stage: str, items: Iterable[str]) -> int:
+        """Add ``items`` that are not queued yet and return how many were new."""
+        now = time.time()
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO tasks (stage, item, updated_at) VALUES (?, ?, ?)",
+                    [(stage, item, now) for item in items],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            return self._conn.total_changes - before
+
+    def claim(self, stage: str) -> Optional[str]:
+        """Lease the next pending or expired item of ``stage``; ``None`` if none is claimable."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "UPDATE tasks SET status = 'failed', worker = NULL, lease_expires = NULL,"
+                    " error = 'lease expired on final attempt', updated_at = ?"
+                    " WHERE stage = ? AND status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                    (now, stage, now, self.max_attempts),
+                )
+                row = self._conn.execute(
+                    "SELECT item, status, worker FROM tasks WHERE stage = ?"
+                    " AND (status = 'pending' OR (status = 'leased' AND lease_expires < ?))"
+                    " ORDER BY attempts, item LIMIT 1",
+                    (stage, now),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE tasks SET status = 'leased', worker = ?, lease_expires = ?,"
+                        " attempts = attempts + 1, updated_at = ? WHERE stage = ? AND item = ?",
+                        (self.worker_id, now + self.lease_seconds, now, stage, row[0]),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        if row[1] == "leased":
+            logger.warning("Reclaiming %s %s from expired lease of %s", stage, row[0], row[2])
+        return row[0]
+
+    def renew(self, stage: str, items: Iterable[str]) -> int:
+        """Extend this worker's leases on ``items``; returns how many are still held."""
+        now = time.time()
+        held = 0
+        for item in items:
+            held += self._write(
+                "UPDATE tasks SET lease_expires = ?, updated_at = ?"
+                " WHERE stage = ? AND item = ? AND worker = ? AND status = 'leased'",
+                (now + self.lease_seconds, now, stage, item, self.worker_id),
+            )
+        return held
+
+    def complete(self, stage: str, item: str, outputs: Sequence[Path] = ()) -> bool:
+        """Mark ``item`` done; ``False`` when the lease was lost to another worker."""
+        done = self._write(
+            "UPDATE tasks SET status = 'done', lease_expires = NULL, outputs = ?, error = NULL,"
+            " updated_at = ? WHERE stage = ? AND item = ? AND worker = ? AND status = 'leased'",
+            (json.dumps([str(path) for path in outputs]), time.time(), stage, item, self.worker_id),
+        )
+        if not done:
+            logger.warning("Lease on %s %s was lost before it completed", stage, item)
+        return bool(done)
+
+    def fail(self, stage: str, item: str, error: str) -> None:
+        """Record a failed attempt; the item is retried until ``max_attempts`` is reached."""
+        self._write(
+            "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,"
+            " worker = NULL, lease_expires = NULL, error = ?, updated_at = ?"
+            " WHERE stage = ? AND item = ? AND worker = ? AND status = 'leased'",
+            (self.max_attempts, error, time.time(), stage, item, self.worker_id),
+        )
+
+    def release(self, stage: str, items: Iterable[str]) -> None:
+        """Return unfinished ``items`` to the queue without counting the attempt."""
+        for item in items:
+            self._write(
+                "UPDATE tasks SET status = 'pending', worker = NULL, lease_expires = NULL,"
+                " attempts = MAX(attempts - 1, 0), updated_at = ?"
+                " WHERE stage = ? AND item = ? AND worker = ? AND status = 'leased'",
+                (time.time(), stage, item, self.worker_id),
+            )
+
+    def counts(self, stage: str) -> Dict[str, int]:
+        """Return the number of items of ``stage`` in each status."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM tasks WHERE stage = ? GROUP BY status", (stage,)
+            ).fetchall()
+        counts = {status: 0 for status in TASK_STATUSES}
+        counts.update(dict(rows))
+        return counts
+
+    def failures(self, stage: str) -> List[Dict[str, str]]:
+        """Return items of ``stage`` that exhausted their attempts, with the last error."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT item, error FROM tasks WHERE stage = ? AND status = 'failed' ORDER BY item",
+                (stage,),
+            ).fetchall()
+        return [{"item": item, "error": error or ""} for item, error in rows]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class LeaseHeartbeat:
+    """Renew the leases a worker holds from a background thread while it works."""
+
+    def __init__(self, queue: WorkQueue, stage: str, interval: Optional[float] = None):
+        self.queue = queue
+        self.stage = stage
+        self.interval = interval if interval is not None else queue.lease_seconds / 3
+        self.held: Set[str] = set()
+        self._held_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="synthkit-lease-heartbeat", daemon=True
+        )
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            with self._held_lock:
+                items = list(self.held)
+            if items:
+                try:
+                    self.queue.renew(self.stage, items)
+                except sqlite3.Error as exc:
+                    logger.warning("Could not renew leases: %s", exc)
+
+    def hold(self, item: str) -> None:
+        with self._held_lock:
+            self.held.add(item)
+
+    def drop(self, item: str) -> None:
+        with self._held_lock:
+            self.held.discard(item)
+
+    def __enter__(self) -> "LeaseHeartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
@@ -0,0 +1,262 @@
+"""Per-stage progress: console bars plus a JSON-lines progress file for monitoring."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple
+
+from tqdm import tqdm
+
+from . import metrics
+from .config import ForgeConfig
+from .models.client_base import ChatClient, ChatClientError
+
+_ACTIVE: ContextVar[Optional["StageProgress"]] = ContextVar("synthkit_stage_progress", default=None)
+# Stages running in parallel threads share one progress file.
+_WRITE_LOCK = threading.Lock()
+
+
+class StageProgress:
+    """Counters for one running stage, with throughput over a rolling window and an ETA.
+
+    ``done`` counts the stage's unit of work (documents or files) against an
+    optional ``total``; ``counters`` hold secondary tallies such as chunks or
+    kept samples. Model requests made while the stage is active are counted and
+    timed (``request_seconds`` sums their individual durations) by
+    :class:`TrackedClient`. Snapshots are appended to ``path`` at most every
+    ``interval`` seconds, and always when the stage starts and finishes.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        total: Optional[int] = None,
+        unit: str = "doc",
+        path: Optional[Path] = None,
+        bar: bool = True,
+        interval: float = 5.0,
+        window: float = 60.0,
+    ):
+        self.name = name
+        self.total = total
+        self.unit = unit
+        self.path = path
+        self.interval = interval
+        self.window = window
+        self.done = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.requests = 0
+        self.request_errors = 0
+        self.request_seconds = 0.0
+        self.counters: Counter = Counter()
+        self.started = time.monotonic()
+        self._events: Deque[Tuple[float, int]] = deque()
+        self._lock = threading.Lock()
+        self._last_write = 0.0
+        self._bar = tqdm(total=total, desc=name, unit=unit, disable=not bar, dynamic_ncols=True)
+
+    def advance(self, n: int = 1) -> None:
+        """Record ``n`` finished units of work."""
+        now = time.monotonic()
+        with self._lock:
+            self.done += n
+            self._events.append((now, n))
+        metrics.STAGE_DONE.inc(n, stage=self.name)
+        self._bar.update(n)
+        self._refresh(now)
+
+    def add(self, counter: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[counter] += n
+        metrics.STAGE_ITEMS.inc(n, stage=self.name, outcome=counter)
+
+    def error(self, n: int = 1) -> None:
+        with self._lock:
+            self.errors += n
+        metrics.STAGE_ERRORS.inc(n, stage=self.name)
+        self._refresh(time.monotonic())
+
+    def set_total(self, total: int) -> None:
+        self.total = total
+        self._bar.total = total
+        self._bar.refresh()
+
+    def track_request(self, call: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run one model request, counting it in flight and as an error if it fails."""
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+        metrics.IN_FLIGHT.inc(stage=self.name)
+        started = time.monotonic()
+        try:
+            return call(*args, **kwargs)
+        except ChatClientError:
+            with self._lock:
+                self.request_errors += 1
+                self.errors += 1
+            metrics.STAGE_ERRORS.inc(stage=self.name)
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.request_seconds += time.monotonic() - started
+            metrics.IN_FLIGHT.inc(-1, stage=self.name)
+
+    def rate(self, now: Optional[float] = None) -> float:
+        """Units per second over the last ``window`` seconds."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            while self._events and self._events[0][0] < now - self.window:
+                self._events.popleft()
+            recent = sum(n for _, n in self._events)
+        span = min(self.window, now - self.started)
+        return recent / span if span > 0 else 0.0
+
+    def eta(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until ``total`` is reached at the current rate, if both are known."""
+        if self.total is None:
+            return None
+        rate = self.rate(now)
+        if rate <= 0:
+            return None
+        return max(self.total - self.done, 0) / rate
+
+    def snapshot(self, event: str = "update") -> Dict[str, Any]:
+        now = time.monotonic()
+        rate = self.rate(now)
+        eta = self.eta(now)
+        return {
+            "time": time.time(),
+            "stage": self.name,
+            "event": event,
+            "unit": self.unit,
+            "done": self.done,
+            "total": self.total,
+            "elapsed_seconds": round(now - self.started, 3),
+            "rate_per_second": round(rate, 4),
+            "eta_seconds": None if eta is None else round(eta, 1),
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "request_errors": self.request_errors,
+            "request_seconds": round(self.request_seconds, 3),
+            "counters": dict(self.counters),
+        }
+
+    def _refresh(self, now: float) -> None:
+        self._bar.set_postfix(
+            rate=f"{self.rate(now):.2f}/s",
+            errors=self.errors,
+            in_flight=self.in_flight,
+            refresh=False,
+        )
+        if now - self._last_write >= self.interval:
+            self.write()
+
+    def write(self, event: str = "update") -> None:
+        self._last_write = time.monotonic()
+        if self.path is None:
+            return
+        line = json.dumps(self.snapshot(event), ensure_ascii=False)
+        with _WRITE_LOCK:
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+
+    def close(self) -> None:
+        self.write("finish")
+        self._bar.close()
+
+
+@contextmanager
+def track_stage(
+    cfg: ForgeConfig,
+    name: str,
+    total: Optional[int] = None,
+    unit: str = "doc",
+) -> Iterator[StageProgress]:
+    """Report progress of stage ``name`` while the block runs in this thread.
+
+    Bars follow ``pipeline.progress_bars``; snapshots go to ``io.progress_path``
+    every ``pipeline.progress_interval`` seconds unless ``io.progress_file`` is
+    unset.
+    """
+    path = cfg.io.progress_path
+    if path is not None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    progress = StageProgress(
+        name,
+        total=total,
+        unit=unit,
+        path=path,
+        bar=cfg.pipeline.progress_bars,
+        interval=cfg.pipeline.progress_interval,
+    )
+    progress.write("start")
+    token = _ACTIVE.set(progress)
+    try:
+        yield progress
+    finally:
+        _ACTIVE.reset(token)
+        progress.close()
+
+
+def current_stage() -> Optional[StageProgress]:
+    """Return the progress of the stage running in this thread, if any."""
+    return _ACTIVE.get()
+
+
+class TrackedClient:
+    """Chat client wrapper that reports each request to the active stage's progress."""
+
+    def __init__(self, client: ChatClient):
+        self._client = client
+
+    def _call(self, call: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        progress = _ACTIVE.get()
+        if progress is None:
+            return call(*args, **kwargs)
+        return progress.track_request(call, *args, **kwargs)
+
+    def chat(self, messages, temperature, max_tokens):
+        return self._call(self._client.chat, messages, temperature=temperature, max_tokens=max_tokens)
+
+    def __getattr__(self, name: str) -> Any:
+        # Optional capabilities such as ``chat_logprobs`` stay optional.
+        attr = getattr(self._client, name)
+        if name.startswith("chat") and callable(attr):
+            return lambda *args, **kwargs: self._call(attr, *args, **kwargs)
+        return attr
+
+    def close(self) -> None:
+        close = getattr(self._client, "close", None)
+        if callable(close):
+            close()
+
+
+def advance(n: int = 1) -> None:
+    """Count ``n`` finished units for the active stage; a no-op outside tracked stages."""
+    progress = _ACTIVE.get()
+    if progress is not None:
+        progress.advance(n)
+
+
+def note(counter: str, n: int = 1) -> None:
+    """Add ``n`` to a secondary counter of the active stage, if any."""
+    progress = _ACTIVE.get()
+    if progress is not None:
+        progress.add(counter, n)
+
+
+def note_error(n: int = 1) -> None:
+    """Count ``n`` errors for the active stage, if any."""
+    progress = _ACTIVE.get()
+    if progress is not None:
+        progress.error(n)
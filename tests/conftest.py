@@ -1,7 +1,163 @@
-﻿import sys
+﻿import json
+import sys
+import threading
+import time
 from pathlib import Path
 
+import pytest
+
 # Ensure the source package is importable without installation.
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:  # pragma: no cover - defensive
     sys.path.insert(0, str(ROOT))
+
+from synthkit.config import (
+    CurationSettings,
+    ForgeConfig,
+    GenerationSettings,
+    IOSettings,
+    ModelRef,
+    PromptSet,
+    ProviderConfig,
+    StageModels,
+)
+from synthkit.models import router as router_module
+from synthkit.models.client_base import ChatClientError
+
+
+class ScriptedClient:
+    """Answer summarize prompts with a fixed summary and generation prompts with JSON."""
+
+    def __init__(self, questions):
+        self.questions = questions
+        self.calls = []
+
+    def chat(self, messages, temperature, max_tokens):
+        content = messages[-1].content
+        self.calls.append(content)
+        if content.startswith("Summarize"):
+            return "summary"
+        return json.dumps([{"question": q, "answer": "yes"} for q in self.questions])
+
+    def close(self):
+        pass
+
+
+class PipelineClient:
+    """Summarize, generate one question per document, and judge everything as good."""
+
+    def __init__(self, fail_judge=False):
+        self.fail_judge = fail_judge
+        self.lock = threading.Lock()
+
+    def chat(self, messages, temperature, max_tokens):
+        content = messages[-1].content
+        if content.startswith("Summarize"):
+            return "summary"
+        if content.startswith("summary\n"):
+            time.sleep(0.05)
+            text = content.split("\n")[1]
+            return json.dumps([{"question": f"What is in {text}?", "answer": "yes"}])
+        if self.fail_judge:
+            raise ChatClientError("http", "dummy", "judge down")
+        return json.dumps({"score": 9, "label": "ok", "reason": "fine"})
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def scripted_client():
+    """Factory for clients that answer every generation prompt with fixed questions."""
+    return ScriptedClient
+
+
+@pytest.fixture
+def pipeline_client():
+    """Factory for clients that serve every stage of the pipeline."""
+    return PipelineClient
+
+
+@pytest.fixture
+def make_cfg(tmp_path):
+    """Build a config rooted at ``tmp_path`` with generation settings overridden by keyword."""
+
+    def build(**generation) -> ForgeConfig:
+        model_ref = ModelRef(provider="default", name="dummy")
+        return ForgeConfig(
+            io=IOSettings(input_root=tmp_path / "input", working_root=tmp_path / "work"),
+            models=StageModels(
+                harvest_summarizer=model_ref,
+                mint_generator=model_ref,
+                audit_judge=model_ref,
+                package_validator=model_ref,
+            ),
+            prompts=PromptSet(
+                qa_generation="{summary}\n{text}\n{num_pairs}",
+                cot_generation="{summary}\n{text}\n{num_pairs}",
+                qa_rating="{question}\n{answer}",
+            ),
+            generation=GenerationSettings(**generation),
+            curation=CurationSettings(),
+            providers={"default": ProviderConfig(type="http", api_base="https://example.com")},
+        )
+
+    return build
+
+
+@pytest.fixture
+def install_client(monkeypatch):
+    """Route every model the pipeline builds to the given client."""
+
+    def install(client):
+        monkeypatch.setattr(router_module, "_build_client", lambda provider_cfg, model_name: client)
+
+    return install
+
+
+@pytest.fixture
+def write_docs():
+    """Write harvested documents, by file name, for the mint stage."""
+
+    def write(cfg: ForgeConfig, docs):
+        cfg.io.harvested_path.mkdir(parents=True, exist_ok=True)
+        for name, text in docs.items():
+            (cfg.io.harvested_path / name).write_text(text, encoding="utf-8")
+
+    return write
+
+
+@pytest.fixture
+def write_inputs():
+    """Write ``count`` small input documents for a full pipeline run."""
+
+    def write(cfg: ForgeConfig, count):
+        cfg.io.input_root.mkdir(parents=True, exist_ok=True)
+        for i in range(count):
+            (cfg.io.input_root / f"doc{i}.txt").write_text(f"document {i}", encoding="utf-8")
+
+    return write
+
+
+@pytest.fixture
+def write_audited():
+    """Write audited sample files, by stem, for the package stage."""
+
+    def write(cfg: ForgeConfig, files):
+        cfg.io.audited_path.mkdir(parents=True, exist_ok=True)
+        for name, samples in files.items():
+            (cfg.io.audited_path / f"{name}.audited.json").write_text(json.dumps(samples), encoding="utf-8")
+
+    return write
+
+
+@pytest.fixture
+def make_samples():
+    """Build ``count`` distinct question/answer samples tagged with ``prefix``."""
+
+    def build(prefix, count):
+        return [
+            {"question": f"{prefix} question {i}?", "answer": f"{prefix} answer {i}."} for i in range(count)
+        ]
+
+    return build
@@ -0,0 +1,152 @@
+import json
+
+import pytest
+
+from synthkit.config import ModelRef
+from synthkit.models.client_base import ChatClientError
+from synthkit.models import router as router_module
+from synthkit.pipeline.audit import run_audit
+
+
+class ScoreByModelClient:
+    """Return a fixed judge score per model and record how often it was called."""
+
+    def __init__(self, model_name, scores, calls):
+        self.model_name = model_name
+        self.scores = scores
+        self.calls = calls
+
+    def chat(self, messages, temperature, max_tokens):
+        self.calls[self.model_name] = self.calls.get(self.model_name, 0) + 1
+        question = messages[-1].content.split("\n", 1)[0]
+        score = self.scores[self.model_name][question]
+        return json.dumps({"score": score, "label": "ok", "reason": self.model_name})
+
+    def close(self):
+        pass
+
+
+def _install_judges(monkeypatch, scores):
+    calls = {}
+    monkeypatch.setattr(
+        router_module,
+        "_build_client",
+        lambda provider_cfg, model_name: ScoreByModelClient(model_name, scores, calls),
+    )
+    return calls
+
+
+def _write_minted(cfg, samples):
+    cfg.io.minted_path.mkdir(parents=True, exist_ok=True)
+    (cfg.io.minted_path / "doc.qa.json").write_text(json.dumps(samples), encoding="utf-8")
+
+
+SAMPLES = [
+    {"question": "What is clearly good here?", "answer": "A solid, complete answer."},
+    {"question": "What is clearly bad here?", "answer": "A wrong, unhelpful answer."},
+    {"question": "What is borderline here?", "answer": "A partially useful answer."},
+]
+
+
+def test_cascade_escalates_only_borderline_samples(monkeypatch, make_cfg):
+    cfg = make_cfg()
+    cfg.prompts.qa_rating = "{question}\n{answer}"
+    cfg.models.audit_screener = ModelRef(provider="default", name="fast")
+    cfg.curation.prefilter.enabled = False
+    calls = _install_judges(
+        monkeypatch,
+        {
+            "fast": {s["question"]: score for s, score in zip(SAMPLES, (9.5, 2.0, 7.2))},
+            "dummy": {SAMPLES[2]["question"]: 8.0},
+        },
+    )
+    _write_minted(cfg, SAMPLES)
+
+    outputs = run_audit(cfg)
+
+    kept = json.loads(outputs[0].read_text(encoding="utf-8"))
+    assert [s["judge_rationale"] for s in kept] == ["fast", "dummy"]
+    assert calls == {"fast": 3, "dummy": 1}
+    report = json.loads((cfg.io.audited_path / "audit_report.json").read_text(encoding="utf-8"))
+    assert report["judge_calls"] == {"screener": 3, "judge": 1}
+    assert report["cascade"]["escalated"] == 1
+    assert report["cascade"]["agreement_rate"] == 1.0
+
+
+def test_offline_audit_rethresholds_cached_verdicts(monkeypatch, make_cfg):
+    cfg = make_cfg()
+    cfg.prompts.qa_rating = "{question}\n{answer}"
+    cfg.curation.prefilter.enabled = False
+    calls = _install_judges(
+        monkeypatch, {"dummy": {s["question"]: score for s, score in zip(SAMPLES, (9.0, 3.0, 6.0))}}
+    )
+    _write_minted(cfg, SAMPLES)
+    run_audit(cfg)
+    assert calls == {"dummy": 3}
+
+    cfg.curation.min_score = 5.0
+    outputs = run_audit(cfg, offline=True)
+
+    kept = json.loads(outputs[0].read_text(encoding="utf-8"))
+    assert len(kept) == 2
+    assert calls == {"dummy": 3}
+
+
+class CrashingJudgeClient:
+    """Approve samples but fail once a given number of calls has been made."""
+
+    def __init__(self, fail_after):
+        self.fail_after = fail_after
+        self.calls = 0
+
+    def chat(self, messages, temperature, max_tokens):
+        self.calls += 1
+        if self.fail_after is not None and self.calls > self.fail_after:
+            raise ChatClientError(provider="default", model="dummy", message="boom")
+        return json.dumps({"score": 9.0, "label": "ok", "reason": "fine"})
+
+    def close(self):
+        pass
+
+
+def test_resume_skips_journaled_samples_and_finished_files(monkeypatch, make_cfg):
+    cfg = make_cfg()
+    cfg.curation.verdict_cache = False
+    cfg.curation.prefilter.enabled = False
+    _write_minted(cfg, SAMPLES)
+    (cfg.io.minted_path / "other.qa.json").write_text(json.dumps(SAMPLES[:1]), encoding="utf-8")
+
+    crashing = CrashingJudgeClient(fail_after=2)
+    monkeypatch.setattr(router_module, "_build_client", lambda provider_cfg, model_name: crashing)
+    with pytest.raises(ChatClientError):
+        run_audit(cfg)
+    assert crashing.calls == 3
+
+    healthy = CrashingJudgeClient(fail_after=None)
+    monkeypatch.setattr(router_module, "_build_client", lambda provider_cfg, model_name: healthy)
+    outputs = run_audit(cfg, resume=True)
+
+    # Two samples were journaled before the crash; the remaining calls cover the rest.
+    assert healthy.calls == len(SAMPLES) + 1 - 2
+    assert sorted(len(json.loads(path.read_text(encoding="utf-8"))) for path in outputs) == [1, 3]
+
+    again = CrashingJudgeClient(fail_after=0)
+    monkeypatch.setattr(router_module, "_build_client", lambda provider_cfg, model_name: again)
+    assert len(run_audit(cfg, resume=True)) == 2
+    assert again.calls == 0
+
+
+def test_resume_ignores_decisions_made_under_other_curation_settings(monkeypatch, make_cfg):
+    cfg = make_cfg()
+    cfg.curation.verdict_cache = False
+    _write_minted(cfg, SAMPLES)
+    first = CrashingJudgeClient(fail_after=None)
+    monkeypatch.setattr(router_module, "_build_client", lambda provider_cfg, model_name: first)
+    run_audit(cfg)
+
+    cfg.curation.min_score += 1
+    rethresholded = CrashingJudgeClient(fail_after=None)
+    monkeypatch.setattr(router_module, "_build_client", lambda provider_cfg, model_name: rethresholded)
+    run_audit(cfg, resume=True)
+
+    assert rethresholded.calls == len(SAMPLES)
@@ -0,0 +1,145 @@
+import pytest
+
+from synthkit import budget as budget_module
+from synthkit.budget import BudgetExceeded, budget_scope
+from synthkit.config import BudgetLimits, ModelRef
+from synthkit.curation.llm_judge import create_judge
+from synthkit.curation.verdict_cache import VerdictCache, verdict_key
+from synthkit.models import router as router_module
+from synthkit.models.client_base import ChatMessage
+from synthkit.models.router import ModelRouter
+from synthkit.pipeline.mint import run_mint
+
+
+def _docs(n):
+    return {f"doc{i}.txt": f"text number {i}" for i in range(n)}
+
+
+def _cfg(make_cfg, **budget):
+    cfg = make_cfg()
+    cfg.pipeline.progress_bars = False
+    for key, value in budget.items():
+        setattr(cfg.budget, key, value)
+    return cfg
+
+
+def test_mint_stops_cleanly_when_run_budget_is_spent(install_client, write_docs, scripted_client, make_cfg):
+    cfg = _cfg(make_cfg, max_requests=4)
+    client = scripted_client(["Q?"])
+    install_client(client)
+    write_docs(cfg, _docs(3))
+
+    outputs = run_mint(cfg, "qa")
+
+    # Two requests per document: the third document is left for the next run.
+    assert len(outputs) == 2
+    assert len(client.calls) == 4
+    assert sorted(cfg.io.minted_path.glob("*.json")) == sorted(outputs)
+
+
+def test_stage_limit_applies_only_to_that_stage(install_client, write_docs, scripted_client, make_cfg):
+    cfg = _cfg(
+        make_cfg,
+        stages={"mint": BudgetLimits(max_requests=2), "audit": BudgetLimits(max_requests=1)},
+    )
+    install_client(scripted_client(["Q?"]))
+    write_docs(cfg, _docs(3))
+
+    assert len(run_mint(cfg, "qa")) == 1
+
+
+def test_degrade_routes_to_fallback_past_soft_limit(monkeypatch, write_docs, scripted_client, make_cfg):
+    cheap_ref = ModelRef(provider="default", name="cheap")
+    cfg = _cfg(
+        make_cfg,
+        max_requests=4,
+        soft_limit=0.5,
+        soft_action="degrade",
+        fallback_models={"default:dummy": cheap_ref},
+    )
+    clients = {"dummy": scripted_client(["Q?"]), "cheap": scripted_client(["Q?"])}
+    monkeypatch.setattr(
+        router_module, "_build_client", lambda provider_cfg, model_name: clients[model_name]
+    )
+    write_docs(cfg, _docs(2))
+
+    assert len(run_mint(cfg, "qa")) == 2
+    assert len(clients["dummy"].calls) == 2
+    assert len(clients["cheap"].calls) == 2
+
+
+def test_throttle_ramps_delay_towards_hard_limit(
+    monkeypatch, install_client, write_docs, scripted_client, make_cfg
+):
+    cfg = _cfg(make_cfg, max_requests=4, soft_limit=0.5, soft_action="throttle", throttle_seconds=2.0)
+    install_client(scripted_client(["Q?"]))
+    delays = []
+    monkeypatch.setattr(budget_module.time, "sleep", delays.append)
+    write_docs(cfg, _docs(2))
+
+    run_mint(cfg, "qa")
+
+    assert delays == [0.0, 1.0]
+
+
+def test_cost_limit_uses_provider_prices(install_client, scripted_client, make_cfg):
+    cfg = _cfg(make_cfg, max_cost=0.001)
+    cfg.providers["default"].prices = {"dummy": {"input": 1000.0, "output": 0.0}}
+    install_client(scripted_client(["Q?"]))
+    router = ModelRouter(cfg)
+    client = router.for_stage(cfg.models.mint_generator)
+    messages = [ChatMessage(role="user", content="x" * 4)]
+
+    with budget_scope(cfg) as ledger:
+        client.chat(messages, temperature=0.0, max_tokens=1)
+        assert ledger.run.cost == pytest.approx(0.001)
+        with pytest.raises(BudgetExceeded, match="cost"):
+            client.chat(messages, temperature=0.0, max_tokens=1)
+    # Outside a budget scope nothing is enforced.
+    client.chat(messages, temperature=0.0, max_tokens=1)
+
+
+def test_unknown_soft_action_is_rejected(make_cfg):
+    cfg = _cfg(make_cfg, soft_action="pause")
+    with pytest.raises(ValueError, match="soft_action"):
+        with budget_scope(cfg):
+            pass
+
+
+def test_degraded_verdicts_are_cached_under_the_fallback_model(monkeypatch, tmp_path, make_cfg):
+    cheap_ref = ModelRef(provider="default", name="cheap")
+    cfg = _cfg(
+        make_cfg,
+        max_requests=2,
+        soft_limit=0.5,
+        soft_action="degrade",
+        fallback_models={"default:dummy": cheap_ref},
+    )
+    answered = []
+
+    class VerdictClient:
+        def __init__(self, name):
+            self.name = name
+
+        def chat(self, messages, temperature, max_tokens):
+            answered.append(self.name)
+            return '{"score": 9, "label": "ok", "reason": "fine"}'
+
+    monkeypatch.setattr(
+        router_module, "_build_client", lambda provider_cfg, model_name: VerdictClient(model_name)
+    )
+    samples = [{"question": f"Q{i}?", "answer": "A."} for i in range(2)]
+    cache = VerdictCache(tmp_path / "verdicts.sqlite")
+    ref = cfg.models.audit_judge
+    judge = create_judge(ModelRouter(cfg).for_stage(ref), cfg, cache=cache, model_id=ref.key)
+
+    with budget_scope(cfg):
+        for sample in samples:
+            judge.judge(sample)
+
+    assert answered == ["dummy", "cheap"]
+    assert judge.cached_verdict(samples[0]) is not None
+    # The fallback's verdict must not pass for the configured judge's.
+    assert judge.cached_verdict(samples[1]) is None
+    assert cache.get(verdict_key(samples[1], cfg.prompts.qa_rating, cheap_ref.key)) is not None
+    cache.close()
@@ -0,0 +1,76 @@
+import json
+import threading
+
+from synthkit.pipeline.buildgraph import plan_build
+from synthkit.pipeline.run_all import run_pipeline
+
+
+class CountingClient:
+    def __init__(self, inner):
+        self.inner = inner
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def chat(self, messages, temperature, max_tokens):
+        with self.lock:
+            self.calls += 1
+        return self.inner.chat(messages, temperature, max_tokens)
+
+    def close(self):
+        self.inner.close()
+
+
+def _packaged_instructions(cfg):
+    records = []
+    for path in sorted(cfg.io.packaged_path.glob("*.jsonl")):
+        records.extend(json.loads(line) for line in path.read_text(encoding="utf-8").splitlines())
+    return sorted(record["instruction"] for record in records)
+
+
+def test_incremental_run_reuses_unchanged_artifacts(make_cfg, install_client, write_inputs, pipeline_client):
+    cfg = make_cfg()
+    client = CountingClient(pipeline_client())
+    install_client(client)
+    write_inputs(cfg, 3)
+
+    run_pipeline(cfg, "qa", "alpaca", incremental=True)
+    first_calls = client.calls
+    assert first_calls > 0
+    assert plan_build(cfg, ["qa"], "alpaca") == {
+        "harvest": [],
+        "mint": [],
+        "audit": [],
+        "package": [],
+    }
+
+    run_pipeline(cfg, "qa", "alpaca", incremental=True)
+    assert client.calls == first_calls
+
+    (cfg.io.input_root / "doc3.txt").write_text("document 3", encoding="utf-8")
+    plan = plan_build(cfg, ["qa"], "alpaca")
+    assert plan == {
+        "harvest": ["doc3.txt.txt"],
+        "mint": ["doc3.txt.txt"],
+        "audit": ["doc3.txt.qa.json"],
+        "package": ["alpaca"],
+    }
+
+    run_pipeline(cfg, "qa", "alpaca", incremental=True)
+    # One summary, one generation and one judgement for the new document only.
+    assert client.calls == first_calls + 3
+    assert _packaged_instructions(cfg) == [f"What is in document {i}?" for i in range(4)]
+
+
+def test_plan_marks_stage_dirty_when_prompt_changes(make_cfg, install_client, write_inputs, pipeline_client):
+    cfg = make_cfg()
+    install_client(CountingClient(pipeline_client()))
+    write_inputs(cfg, 2)
+    run_pipeline(cfg, "qa", "alpaca", incremental=True)
+
+    cfg.prompts.qa_generation += "\nBe concise."
+    plan = plan_build(cfg, ["qa"], "alpaca")
+
+    assert plan["harvest"] == []
+    assert sorted(plan["mint"]) == ["doc0.txt.txt", "doc1.txt.txt"]
+    assert sorted(plan["audit"]) == ["doc0.txt.qa.json", "doc1.txt.qa.json"]
+    assert plan["package"] == ["alpaca"]
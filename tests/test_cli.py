@@ -0,0 +1,64 @@
+import subprocess
+import sys
+from pathlib import Path
+
+CONFIG = str(Path(__file__).parents[1] / "config" / "project.example.yaml")
+
+# Modules only the pipeline commands need; none may load with the CLI itself.
+HEAVY_MODULES = (
+    "requests",
+    "pdfminer",
+    "yaml",
+    "tqdm",
+    "http.server",
+    "synthkit.pipeline.mint",
+    "synthkit.generation.qa_pairs",
+    "synthkit.export.formats",
+)
+# Generous bound on importing the CLI (typer alone takes a few tens of ms);
+# it catches a heavy import creeping back in, not small regressions.
+IMPORT_BUDGET_SECONDS = 0.5
+
+
+def _import_cli():
+    script = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "import synthkit.cli\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print(elapsed, *[name for name in {HEAVY_MODULES!r} if name in sys.modules])\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True)
+    elapsed, *loaded = result.stdout.split()
+    return float(elapsed), loaded
+
+
+def test_cli_import_skips_pipeline_dependencies():
+    _, loaded = _import_cli()
+    assert loaded == []
+
+
+def test_cli_import_time_stays_within_budget():
+    # Best of three, so a busy machine does not fail the check.
+    elapsed = min(_import_cli()[0] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_SECONDS, f"importing synthkit.cli took {elapsed:.3f}s"
+
+
+def test_help_runs_without_loading_the_config(tmp_path):
+    result = subprocess.run(
+        [sys.executable, "-m", "synthkit.cli", "-c", str(tmp_path / "missing.yaml"), "--help"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    assert "run-all" in result.stdout
+
+
+def test_zero_sample_fraction_is_a_usage_error(tmp_path):
+    result = subprocess.run(
+        [sys.executable, "-m", "synthkit.cli", "-c", CONFIG, "mint", "--sample-fraction", "0"],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 2
+    assert "must be greater than 0" in result.stderr
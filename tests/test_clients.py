@@ -6,6 +6,7 @@ import requests
 from synthkit.config import ProviderConfig
 from synthkit.models.client_base import ChatMessage, ChatClientError
 from synthkit.models.openai_client import OpenAIChatClient
+from synthkit.models.http_client import HTTPChatClient
 from synthkit.models.ollama_client import OllamaChatClient
 
 
@@ -78,3 +79,38 @@ def test_ollama_client_success():
 
     client.close()
     assert session.closed
+
+
+def test_http_client_chat_logprobs_requests_top_tokens():
+    provider = ProviderConfig(type="http", api_base="http://localhost:8000/v1")
+    payload = {
+        "choices": [
+            {
+                "message": {"content": "7"},
+                "logprobs": {
+                    "content": [
+                        {
+                            "token": "7",
+                            "logprob": -0.1,
+                            "top_logprobs": [
+                                {"token": "7", "logprob": -0.1},
+                                {"token": "8", "logprob": -2.5},
+                            ],
+                        }
+                    ]
+                },
+            }
+        ]
+    }
+    session = RecordingSession(payload)
+    client = HTTPChatClient(provider, "judge", session=session)
+
+    text, positions = client.chat_logprobs(
+        [ChatMessage(role="user", content="rate")], temperature=0.0, max_tokens=1, top_logprobs=5
+    )
+
+    assert text == "7"
+    assert positions == [{"7": -0.1, "8": -2.5}]
+    _, sent_payload, _ = session.last_request
+    assert sent_payload["logprobs"] is True
+    assert sent_payload["top_logprobs"] == 5
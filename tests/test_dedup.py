@@ -0,0 +1,32 @@
+import pytest
+
+from synthkit.curation.dedup import NearDuplicateIndex, hamming_distance, normalize_text, simhash
+
+
+def test_normalize_text_strips_case_and_punctuation():
+    assert normalize_text("  What is  SynthKit?!  ") == "what is synthkit"
+
+
+def test_simhash_is_stable_and_close_for_similar_text():
+    base = "What command harvests raw documents into the working directory before minting"
+    variant = "What command harvests raw documents into the working directory prior to minting"
+    unrelated = "How many judge calls are made per sample during the audit stage"
+    assert simhash(base) == simhash(base)
+    assert hamming_distance(simhash(base), simhash(variant)) < hamming_distance(
+        simhash(base), simhash(unrelated)
+    )
+
+
+def test_index_flags_exact_and_near_duplicates():
+    index = NearDuplicateIndex(max_distance=3)
+    assert not index.check_and_add("What does the audit stage do?")
+    assert index.check_and_add("what does the AUDIT stage do")
+    assert not index.check_and_add("Which providers are supported by the router?")
+    assert index.exact_hits == 1
+    assert index.dropped == 1
+    assert len(index) == 2
+
+
+def test_index_rejects_invalid_distance():
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(max_distance=64)
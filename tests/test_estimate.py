@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from synthkit.config import ModelRef
+from synthkit.pipeline.estimate import estimate_pipeline
+from synthkit.pipeline.mint import run_mint
+
+
+def _write_harvested(cfg, texts):
+    cfg.io.harvested_path.mkdir(parents=True, exist_ok=True)
+    for name, text in texts.items():
+        (cfg.io.harvested_path / name).write_text(text, encoding="utf-8")
+
+
+def _roles(estimate):
+    return {(row.stage, row.role): row for row in estimate.rows}
+
+
+def test_estimate_matches_requests_of_a_real_mint(make_cfg, install_client, scripted_client):
+    cfg = make_cfg(chunk_size=100, chunk_overlap=0, max_items_per_request=2)
+    _write_harvested(cfg, {"a.txt": "a" * 250, "b.txt": "b" * 80})
+    client = scripted_client(["q1", "q2"])
+    install_client(client)
+
+    estimate = estimate_pipeline(cfg, "qa")
+    run_mint(cfg, "qa")
+
+    roles = _roles(estimate)
+    assert estimate.documents == 2
+    assert estimate.chunks == 4
+    assert roles[("mint", "summarize")].requests + roles[("mint", "generate:qa")].requests == len(
+        client.calls
+    )
+    assert estimate.items == {"qa": 8}
+    assert roles[("audit", "judge")].requests == 8
+    assert estimate.cost is None
+
+
+def test_estimate_prices_tokens_and_divides_wall_time(make_cfg):
+    cfg = make_cfg(chunk_size=400, chunk_overlap=0, max_items_per_request=4)
+    cfg.models.audit_judge = ModelRef(provider="default", name="judge")
+    cfg.providers["default"].prices = {"judge": {"input": 1.0, "output": 2.0}}
+    cfg.estimate.latency_seconds = 2.0
+    _write_harvested(cfg, {"a.txt": "word " * 80})
+
+    estimate = estimate_pipeline(cfg, "qa", concurrency=2)
+
+    judge = _roles(estimate)[("audit", "judge")]
+    assert judge.requests == 4
+    assert estimate.cost == pytest.approx(
+        (judge.input_tokens * 1.0 + judge.output_tokens * 2.0) / 1_000_000
+    )
+    assert estimate.wall_seconds == pytest.approx(estimate.requests * 2.0 / 2)
+    assert estimate.latency_sources == {"mint": "assumed", "audit": "assumed"}
+
+    # Four requests of 0.5 s each, overlapped by a concurrent run into 1 s of stage time.
+    finish = {"stage": "mint", "event": "finish", "requests": 4, "elapsed_seconds": 1.0}
+    cfg.io.progress_path.write_text(
+        json.dumps({**finish, "request_seconds": 2.0}) + "\n"
+        + json.dumps({"stage": "audit", "event": "finish", "requests": 4, "elapsed_seconds": 9.0})
+        + "\n",
+        encoding="utf-8",
+    )
+    measured = estimate_pipeline(cfg, "qa")
+    assert _roles(measured)[("mint", "summarize")].latency_seconds == 0.5
+    assert measured.latency_sources == {"mint": "measured", "audit": "assumed"}
+
+
+def test_estimate_requires_harvested_documents(make_cfg):
+    with pytest.raises(ValueError, match="run `synthkit harvest` first"):
+        estimate_pipeline(make_cfg(), "qa")
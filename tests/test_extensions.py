@@ -1,4 +1,8 @@
-﻿import pytest
+﻿import subprocess
+import sys
+from importlib.metadata import EntryPoint
+
+import pytest
 
 from synthkit import extensions
 
@@ -33,3 +37,31 @@ def test_register_and_get_formatter(monkeypatch):
 
     with pytest.raises(KeyError):
         extensions.get_formatter("missing")
+
+
+def test_builtin_plugins_are_imported_on_first_lookup():
+    script = (
+        "import sys\n"
+        "from synthkit import extensions\n"
+        "assert 'qa' in extensions.available_generator_types()\n"
+        "assert 'alpaca' in extensions.available_formatter_names()\n"
+        "assert 'synthkit.generation.qa_pairs' not in sys.modules\n"
+        "assert 'synthkit.export.formats' not in sys.modules\n"
+        "assert extensions.get_generator_factory('QA')\n"
+        "assert extensions.get_formatter_validator('alpaca')\n"
+        "assert 'synthkit.generation.cot_pairs' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+
+def test_entry_point_plugins_are_registered_by_name(monkeypatch):
+    monkeypatch.setattr(extensions, "_formatter_registry", {})
+    entry_point = EntryPoint(name="plain", value="builtins:dict", group=extensions.FORMATTER_ENTRY_POINTS)
+    monkeypatch.setattr(
+        extensions, "_entry_point_cache", {extensions.FORMATTER_ENTRY_POINTS: {"plain": entry_point}}
+    )
+
+    assert "plain" in extensions.available_formatter_names()
+    assert "plain" not in extensions._formatter_registry
+    assert extensions.get_formatter("Plain") is dict
+    assert extensions.get_formatter_validator("plain") is None
@@ -0,0 +1,96 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from synthkit import metrics
+from synthkit.metrics import MetricsExporter, MetricsRegistry, metrics_scope
+from synthkit.models.client_base import ChatClientError
+from synthkit.pipeline.mint import run_mint
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    requests = registry.counter("demo_requests_total", "Requests.", ("model",))
+    latency = registry.histogram("demo_seconds", "Latency.", ("model",), buckets=(0.5, 1.0))
+    requests.inc(model='gpt "4"')
+    requests.inc(2, model="small")
+    latency.observe(0.7, model="small")
+    latency.observe(3.0, model="small")
+
+    lines = registry.render().splitlines()
+
+    assert lines[:2] == ["# HELP demo_requests_total Requests.", "# TYPE demo_requests_total counter"]
+    assert 'demo_requests_total{model="gpt \\"4\\""} 1' in lines
+    assert 'demo_requests_total{model="small"} 2' in lines
+    assert lines[-5:] == [
+        'demo_seconds_bucket{model="small",le="0.5"} 0',
+        'demo_seconds_bucket{model="small",le="1"} 1',
+        'demo_seconds_bucket{model="small",le="+Inf"} 2',
+        'demo_seconds_sum{model="small"} 3.7',
+        'demo_seconds_count{model="small"} 2',
+    ]
+    with pytest.raises(ValueError, match="expects labels model"):
+        requests.inc(stage="mint")
+
+
+def test_router_clients_and_stages_feed_metrics(make_cfg, install_client, write_docs, scripted_client):
+    cfg = make_cfg()
+    cfg.pipeline.progress_bars = False
+    install_client(scripted_client(["Q1?", "Q2?"]))
+    write_docs(cfg, {"one.txt": "alpha", "two.txt": "beta"})
+    labels = {"provider": "default", "model": "dummy"}
+    before = {
+        "ok": metrics.REQUESTS.value(status="ok", **labels),
+        "latency": metrics.REQUEST_SECONDS.count(**labels),
+        "output": metrics.TOKENS.value(direction="output", **labels),
+        "items": metrics.STAGE_ITEMS.value(stage="mint", outcome="items"),
+        "done": metrics.STAGE_DONE.value(stage="mint"),
+    }
+
+    run_mint(cfg, "qa")
+
+    assert metrics.REQUESTS.value(status="ok", **labels) - before["ok"] == 4
+    assert metrics.REQUEST_SECONDS.count(**labels) - before["latency"] == 4
+    assert metrics.TOKENS.value(direction="output", **labels) > before["output"]
+    assert metrics.STAGE_ITEMS.value(stage="mint", outcome="items") - before["items"] == 4
+    assert metrics.STAGE_DONE.value(stage="mint") - before["done"] == 2
+    assert metrics.IN_FLIGHT.value(stage="mint") == 0
+
+
+def test_failed_requests_are_counted_by_status(make_cfg):
+    class Down:
+        def chat(self, messages, temperature, max_tokens):
+            raise ChatClientError("http", "down-model", "unavailable")
+
+    ref = make_cfg().models.mint_generator
+    client = metrics.MeteredClient(Down(), ref)
+    before = metrics.REQUESTS.value(provider="default", model="dummy", status="error")
+
+    with pytest.raises(ChatClientError):
+        client.chat([], temperature=0.0, max_tokens=1)
+
+    assert metrics.REQUESTS.value(provider="default", model="dummy", status="error") == before + 1
+
+
+def test_exporter_serves_http_and_writes_textfile(tmp_path):
+    registry = MetricsRegistry()
+    registry.counter("demo_total", "Demo.").inc(5)
+    textfile = tmp_path / "metrics" / "synthkit.prom"
+    exporter = MetricsExporter(port=0, textfile=textfile, interval=60.0, registry=registry)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{exporter.port}/metrics") as response:
+            body = response.read().decode("utf-8")
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert "demo_total 5" in body.splitlines()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"http://127.0.0.1:{exporter.port}/other")
+    finally:
+        exporter.close()
+
+    assert textfile.read_text(encoding="utf-8") == registry.render()
+
+
+def test_metrics_scope_is_disabled_by_default(make_cfg):
+    with metrics_scope(make_cfg()) as exporter:
+        assert exporter is None
@@ -0,0 +1,169 @@
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+from synthkit.models.client_base import ChatClientError
+from synthkit.pipeline import mint as mint_module
+from synthkit.pipeline.mint import run_mint
+
+
+def test_mint_drops_duplicate_questions_across_run(make_cfg, install_client, write_docs, scripted_client):
+    cfg = make_cfg(dedup_scope="run")
+    install_client(scripted_client(["What is A?", "what is a", "What is B?"]))
+    write_docs(cfg, {"one.txt": "alpha", "two.txt": "beta"})
+
+    outputs = run_mint(cfg, generator_type="qa")
+
+    minted = {path.name: json.loads(path.read_text(encoding="utf-8")) for path in outputs}
+    kept = [item["question"] for payload in minted.values() for item in payload]
+    assert sorted(kept) == ["What is A?", "What is B?"]
+
+
+def test_mint_document_scope_keeps_cross_document_repeats(
+    make_cfg, install_client, write_docs, scripted_client
+):
+    cfg = make_cfg(dedup_scope="document")
+    install_client(scripted_client(["What is A?", "What is A?"]))
+    write_docs(cfg, {"one.txt": "alpha", "two.txt": "beta"})
+
+    outputs = run_mint(cfg, generator_type="qa")
+
+    for path in outputs:
+        assert len(json.loads(path.read_text(encoding="utf-8"))) == 1
+
+
+def test_mint_multiple_kinds_share_summaries(make_cfg, install_client, write_docs, scripted_client):
+    cfg = make_cfg()
+    client = scripted_client(["What is A?"])
+    install_client(client)
+    write_docs(cfg, {"one.txt": "alpha"})
+
+    outputs = run_mint(cfg, generator_type="qa,cot")
+
+    assert sorted(path.name for path in outputs) == ["one.cot.json", "one.qa.json"]
+    summaries = [call for call in client.calls if call.startswith("Summarize")]
+    assert len(summaries) == 1
+    assert len(client.calls) == 3
+
+
+class PackingClient:
+    """Emit one item per ``[source_id: ...]`` block found in the prompt."""
+
+    def __init__(self):
+        self.calls = []
+
+    def chat(self, messages, temperature, max_tokens):
+        content = messages[-1].content
+        self.calls.append(content)
+        if content.startswith("Summarize"):
+            return "summary"
+        ids = re.findall(r"\[source_id: (\w+)\]", content)
+        return json.dumps(
+            [{"question": f"About {sid}?", "answer": "yes", "source_id": sid} for sid in ids]
+            + [{"question": "Orphan?", "answer": "no", "source_id": "missing"}]
+        )
+
+    def close(self):
+        pass
+
+
+def test_mint_packs_short_documents_and_routes_items(make_cfg, install_client, write_docs):
+    cfg = make_cfg(pack_small_docs=True, pack_max_doc_chars=100, chunk_size=400)
+    client = PackingClient()
+    install_client(client)
+    write_docs(cfg, {"a.txt": "alpha facts", "b.txt": "beta facts", "c.txt": "gamma facts"})
+
+    outputs = run_mint(cfg, generator_type="qa")
+
+    assert len(client.calls) == 2  # one summary + one generation for all three docs
+    for path in outputs:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        assert len(payload) == 1
+        meta = payload[0]["meta"]
+        assert Path(meta["source_file"]).stem == path.name.split(".")[0]
+        assert payload[0]["question"] == f"About {meta['source_id']}?"
+
+
+class JudgingClient:
+    """Generate distinct questions and approve every judge request."""
+
+    def __init__(self):
+        self.calls = []
+
+    def chat(self, messages, temperature, max_tokens):
+        content = messages[-1].content
+        self.calls.append(content)
+        if content.startswith("Summarize"):
+            return "summary"
+        if content.startswith("Q:"):
+            return json.dumps({"score": 9.0, "label": "excellent", "reason": "ok"})
+        count = int(content.rsplit("\n", 1)[-1])
+        start = len(self.calls)
+        return json.dumps(
+            [{"question": f"Distinct question number {start + i}?", "answer": "yes"} for i in range(count)]
+        )
+
+    def close(self):
+        pass
+
+
+def test_mint_stops_once_curated_target_is_expected(make_cfg, install_client, write_docs):
+    cfg = make_cfg(acceptance_probe_size=2, max_items_per_request=4, chunk_size=10, chunk_overlap=0)
+    cfg.prompts.qa_rating = "Q: {question}\n{answer}"
+    client = JudgingClient()
+    install_client(client)
+    write_docs(cfg, {"a.txt": "x" * 100, "b.txt": "y" * 100})
+
+    outputs = run_mint(cfg, generator_type="qa", target_curated=5)
+
+    minted = [item for path in outputs for item in json.loads(path.read_text(encoding="utf-8"))]
+    assert 5 <= len(minted) < 8
+    assert len(outputs) == 1
+
+
+def test_mint_target_completes_when_probe_judge_is_down(make_cfg, install_client, write_docs):
+    class JudgeDownClient(JudgingClient):
+        def chat(self, messages, temperature, max_tokens):
+            if messages[-1].content.startswith("Q:"):
+                self.calls.append(messages[-1].content)
+                raise ChatClientError("http", "dummy", "unavailable")
+            return super().chat(messages, temperature, max_tokens)
+
+    cfg = make_cfg(acceptance_probe_size=2, max_items_per_request=4, chunk_size=10, chunk_overlap=0)
+    cfg.generation.acceptance_probe_max_failures = 2
+    cfg.prompts.qa_rating = "Q: {question}\n{answer}"
+    client = JudgeDownClient()
+    install_client(client)
+    write_docs(cfg, {"a.txt": "x" * 100, "b.txt": "y" * 100})
+
+    outputs = run_mint(cfg, generator_type="qa", target_curated=3)
+
+    minted = [item for path in outputs for item in json.loads(path.read_text(encoding="utf-8"))]
+    assert len([call for call in client.calls if call.startswith("Q:")]) == 2
+    assert 6 <= len(minted) < 10
+
+
+def test_mint_sample_count_limits_generation_requests(make_cfg, install_client, write_docs, scripted_client):
+    cfg = make_cfg(chunk_size=10, chunk_overlap=0, dedup_scope="off")
+    client = scripted_client(["What is A?"])
+    install_client(client)
+    write_docs(cfg, {"a.txt": "x" * 100, "b.txt": "y" * 100})
+
+    outputs = run_mint(cfg, generator_type="qa", sample_count=4, sample_seed=3)
+
+    generation_calls = [call for call in client.calls if not call.startswith("Summarize")]
+    assert len(generation_calls) == 4
+    assert len(outputs) == 2
+
+
+def test_sample_plan_sizes_documents_without_reading_them(monkeypatch, make_cfg, write_docs):
+    cfg = make_cfg(chunk_size=10, chunk_overlap=0)
+    write_docs(cfg, {"a.txt": "x" * 100, "b.txt": "y" * 30})
+    monkeypatch.setattr(mint_module, "read_harvested", lambda store, path: pytest.fail("read"))
+    files = sorted(cfg.io.harvested_path.glob("*.txt"))
+
+    selection = mint_module._plan_sample(cfg, files, 1.0, None, seed=0)
+
+    assert {path.name: len(indices) for path, indices in selection.items()} == {"a.txt": 10, "b.txt": 3}
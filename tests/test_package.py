@@ -0,0 +1,294 @@
+import gzip
+import hashlib
+import json
+
+import pytest
+
+from synthkit.export.dedup import CorpusDeduplicator
+from synthkit.export.sharding import ShardWriter
+from synthkit.export.shuffle import ExternalShuffler
+from synthkit.export.splits import SplitAssigner, parse_splits
+from synthkit.export.writers import (
+    JsonlSink,
+    ParquetSink,
+    make_sink_factory,
+    reformat_and_write,
+    write_jsonl,
+)
+from synthkit.pipeline.package import run_package
+
+
+def test_shard_writer_caps_records_and_names_shards(tmp_path):
+    writer = ShardWriter(tmp_path, "train", max_records=2)
+    for i in range(5):
+        writer.write({"i": i})
+    shards = writer.close()
+
+    assert [shard.file for shard in shards] == [
+        "train-00000-of-00003.jsonl",
+        "train-00001-of-00003.jsonl",
+        "train-00002-of-00003.jsonl",
+    ]
+    assert [shard.records for shard in shards] == [2, 2, 1]
+    assert not list(tmp_path.glob("*.partial"))
+
+
+def test_shard_writer_rolls_on_bytes(tmp_path):
+    writer = ShardWriter(tmp_path, "train", max_bytes=20)
+    for i in range(4):
+        writer.write({"value": i})  # 13 bytes per line
+    assert [shard.records for shard in writer.close()] == [2, 2]
+
+
+def test_shard_byte_cap_counts_uncompressed_bytes(tmp_path):
+    factory = make_sink_factory("jsonl", compression="gzip")
+    writer = ShardWriter(tmp_path, "train", max_bytes=20, sink_factory=factory)
+    for i in range(4):
+        writer.write({"value": i})
+    assert [shard.records for shard in writer.close()] == [2, 2]
+
+
+def test_shard_byte_cap_is_rejected_for_parquet(tmp_path, make_cfg, write_audited, make_samples):
+    pytest.importorskip("pyarrow")
+    cfg = make_cfg()
+    write_audited(cfg, {"a.qa": make_samples("a", 2)})
+    with pytest.raises(ValueError, match="shard_records"):
+        run_package(cfg, fmt="alpaca", shard_bytes=1000, output_format="parquet")
+    writer = ShardWriter(tmp_path / "out", "train", max_bytes=20, sink_factory=make_sink_factory("parquet"))
+    with pytest.raises(ValueError, match="max_records"):
+        writer.write({"value": 1})
+    assert not list((tmp_path / "out").iterdir())
+
+
+def test_parquet_sink_keeps_fields_that_vary_between_records(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    sink = ParquetSink(tmp_path / "rows.parquet", row_group_size=2)
+    sink.write({"a": 1})
+    sink.write({"a": 2, "b": "x"})
+    sink.write({"b": "y"})
+    sink.close()
+    assert pq.read_table(tmp_path / "rows.parquet").to_pylist() == [
+        {"a": 1, "b": None},
+        {"a": 2, "b": "x"},
+        {"a": None, "b": "y"},
+    ]
+
+    sink = ParquetSink(tmp_path / "extra.parquet", row_group_size=1)
+    sink.write({"a": 1})
+    with pytest.raises(ValueError, match=r"\['c'\]"):
+        sink.write({"a": 2, "c": True})
+
+
+def test_parquet_sink_defers_columns_that_start_all_null(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    sink = ParquetSink(tmp_path / "rows.parquet", row_group_size=2)
+    for i in range(5):
+        sink.write({"a": i, "b": None if i < 3 else f"x{i}"})
+    sink.close()
+    parquet = pq.ParquetFile(tmp_path / "rows.parquet")
+    assert str(parquet.schema_arrow.field("b").type) == "string"
+    assert parquet.metadata.num_row_groups == 3
+    assert [row["b"] for row in parquet.read().to_pylist()] == [None, None, None, "x3", "x4"]
+
+    sink = ParquetSink(tmp_path / "capped.parquet", row_group_size=1, max_deferred_row_groups=2)
+    for i in range(3):
+        sink.write({"a": i, "b": None})
+    with pytest.raises(ValueError, match=r"\['b'\]"):
+        sink.write({"a": 3, "b": "late"})
+
+
+def test_package_legacy_layout_is_one_file_per_input(make_cfg, write_audited, make_samples):
+    cfg = make_cfg()
+    write_audited(cfg, {"a.qa": make_samples("a", 2), "b.qa": make_samples("b", 1)})
+
+    outputs = run_package(cfg, fmt="alpaca")
+
+    assert sorted(path.name for path in outputs) == ["a.qa.alpaca.jsonl", "b.qa.alpaca.jsonl"]
+
+
+def test_package_sharded_parallel_output_with_index(make_cfg, write_audited, make_samples):
+    cfg = make_cfg()
+    write_audited(cfg, {"a.qa": make_samples("a", 3), "b.qa": make_samples("b", 4)})
+
+    outputs = run_package(cfg, fmt="alpaca", shard_records=3, workers=2)
+
+    assert [path.name for path in outputs] == [
+        "train-00000-of-00003.jsonl",
+        "train-00001-of-00003.jsonl",
+        "train-00002-of-00003.jsonl",
+    ]
+    lines = [json.loads(line) for path in outputs for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [line["instruction"] for line in lines][:4] == [
+        "a question 0?",
+        "a question 1?",
+        "a question 2?",
+        "b question 0?",
+    ]
+    index = json.loads((cfg.io.packaged_path / "index.json").read_text(encoding="utf-8"))
+    assert index["total_records"] == 7
+    assert [shard["records"] for shard in index["splits"]["train"]["shards"]] == [3, 3, 1]
+    assert all(len(shard["sha256"]) == 64 for shard in index["splits"]["train"]["shards"])
+
+
+def test_package_failure_aborts_partial_shards(make_cfg, write_audited, make_samples):
+    cfg = make_cfg()
+    write_audited(cfg, {"a.qa": make_samples("a", 3)})
+    (cfg.io.audited_path / "b.qa.audited.json").write_text("{not json", encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        run_package(cfg, fmt="alpaca", shard_records=2)
+
+    assert not list(cfg.io.packaged_path.glob("*.partial"))
+    assert not list(cfg.io.packaged_path.glob("train-*"))
+
+
+def test_package_parquet_shards_stream_row_groups(make_cfg, write_audited, make_samples):
+    pq = pytest.importorskip("pyarrow.parquet")
+    cfg = make_cfg()
+    cfg.packaging.parquet_row_group_size = 2
+    write_audited(cfg, {"a.qa": make_samples("a", 5)})
+
+    outputs = run_package(cfg, fmt="chatml", shard_records=10, output_format="parquet")
+
+    assert [path.name for path in outputs] == ["train-00000-of-00001.parquet"]
+    parquet_file = pq.ParquetFile(outputs[0])
+    assert parquet_file.metadata.num_rows == 5
+    assert parquet_file.metadata.num_row_groups == 3
+    rows = parquet_file.read().to_pylist()
+    assert rows[0]["messages"][0] == {"role": "user", "content": "a question 0?"}
+
+
+def test_package_parquet_per_file_layout(make_cfg, write_audited, make_samples):
+    pytest.importorskip("pyarrow")
+    cfg = make_cfg()
+    write_audited(cfg, {"a.qa": make_samples("a", 1)})
+
+    outputs = run_package(cfg, fmt="alpaca", output_format="parquet")
+
+    assert [path.name for path in outputs] == ["a.qa.alpaca.parquet"]
+
+
+def test_write_jsonl_infers_gzip_and_checksums_in_one_pass(tmp_path):
+    out_path = tmp_path / "data.jsonl.gz"
+
+    info = write_jsonl(({"i": i} for i in range(3)), out_path)
+
+    raw = out_path.read_bytes()
+    assert info.records == 3
+    assert info.bytes == len(raw)
+    assert info.sha256 == hashlib.sha256(raw).hexdigest()
+    assert gzip.decompress(raw).decode("utf-8").splitlines() == ['{"i": 0}', '{"i": 1}', '{"i": 2}']
+
+
+def test_reformat_and_write_takes_compression_flag(tmp_path, make_samples):
+    out_path = tmp_path / "data.jsonl"
+
+    info = reformat_and_write(make_samples("a", 2), "alpaca", out_path, compression="gzip")
+
+    lines = gzip.decompress(out_path.read_bytes()).decode("utf-8").splitlines()
+    assert info.records == 2
+    assert json.loads(lines[1])["instruction"] == "a question 1?"
+    with pytest.raises(ValueError, match="not both"):
+        reformat_and_write([], "alpaca", out_path, sink_factory=JsonlSink, compression="gzip")
+
+
+def test_package_compressed_output_writes_manifest(make_cfg, write_audited, make_samples):
+    cfg = make_cfg()
+    write_audited(cfg, {"a.qa": make_samples("a", 2)})
+
+    outputs = run_package(cfg, fmt="alpaca", compression="gzip")
+
+    assert [path.name for path in outputs] == ["a.qa.alpaca.jsonl.gz"]
+    manifest = json.loads((cfg.io.packaged_path / "manifest.json").read_text(encoding="utf-8"))
+    assert manifest["compression"] == "gzip"
+    assert manifest["total_records"] == 2
+    entry = manifest["files"][0]
+    assert entry["file"] == "a.qa.alpaca.jsonl.gz"
+    assert entry["sha256"] == hashlib.sha256(outputs[0].read_bytes()).hexdigest()
+
+
+def test_package_zstd_shards(make_cfg, write_audited, make_samples):
+    zstandard = pytest.importorskip("zstandard")
+    cfg = make_cfg()
+    write_audited(cfg, {"a.qa": make_samples("a", 3)})
+
+    outputs = run_package(cfg, fmt="alpaca", shard_records=2, compression="zstd")
+
+    assert [path.name for path in outputs] == [
+        "train-00000-of-00002.jsonl.zst",
+        "train-00001-of-00002.jsonl.zst",
+    ]
+    text = zstandard.ZstdDecompressor().stream_reader(outputs[1].open("rb")).read().decode("utf-8")
+    assert json.loads(text)["instruction"] == "a question 2?"
+
+
+def test_corpus_deduplicator_backends_agree(tmp_path):
+    keys = ["what is x", "what is y", "what is x", "what is z", "what is y"]
+    for backend in ("memory", "bloom", "sqlite"):
+        deduper = CorpusDeduplicator(
+            "exact", backend=backend, capacity=100, spill_path=tmp_path / f"{backend}.sqlite"
+        )
+        assert [deduper.is_duplicate(key) for key in keys] == [False, False, True, False, True]
+        deduper.close()
+    assert not list(tmp_path.glob("*.sqlite"))
+
+
+def test_split_assignment_is_deterministic_and_proportional():
+    assigner = SplitAssigner({"train": 0.8, "val": 0.1, "test": 0.1}, seed=7)
+    first = [assigner.assign(f"question {i}") for i in range(2000)]
+    assert first == [assigner.assign(f"question {i}") for i in range(2000)]
+    assert 1500 < first.count("train") < 1700
+    assert parse_splits("train=0.9, val=0.1") == [("train", 0.9), ("val", 0.1)]
+
+
+def test_package_dedups_across_files_and_splits_without_leaks(make_cfg, write_audited, make_samples):
+    cfg = make_cfg()
+    shared = [{"question": f"Shared question {i}?", "answer": "x"} for i in range(20)]
+    variants = [{"question": f"shared  QUESTION {i}", "answer": "y"} for i in range(20)]
+    write_audited(cfg, {"a.qa": shared + make_samples("a", 30), "b.qa": variants + make_samples("b", 30)})
+
+    outputs = run_package(cfg, fmt="alpaca", dedup="exact", splits={"train": 0.7, "val": 0.3})
+
+    by_split = {}
+    for path in outputs:
+        split = path.name.split("-")[0]
+        lines = path.read_text(encoding="utf-8").splitlines()
+        by_split.setdefault(split, []).extend(json.loads(line)["instruction"] for line in lines)
+    assert set(by_split) == {"train", "val"}
+    questions = by_split["train"] + by_split["val"]
+    assert len(questions) == 80
+    assert not set(by_split["train"]) & set(by_split["val"])
+    index = json.loads((cfg.io.packaged_path / "index.json").read_text(encoding="utf-8"))
+    assert index["dedup"]["exact_duplicates"] == 20
+    assert index["total_records"] == 80
+
+
+def test_external_shuffler_is_seeded_permutation_with_nested_buckets(tmp_path):
+    def run(seed):
+        shuffler = ExternalShuffler(tmp_path, seed=seed, num_buckets=4, max_bucket_records=5)
+        for i in range(100):
+            shuffler.add({"i": i})
+        order = [record["i"] for record in shuffler]
+        shuffler.close()
+        return order
+
+    first = run(3)
+    assert sorted(first) == list(range(100))
+    assert first != list(range(100))
+    assert first == run(3)
+    assert first != run(4)
+    assert not list(tmp_path.iterdir())
+
+
+def test_package_shuffle_writes_shuffled_shards(make_cfg, write_audited, make_samples):
+    cfg = make_cfg()
+    write_audited(cfg, {"a.qa": make_samples("a", 30), "b.qa": make_samples("b", 30)})
+
+    outputs = run_package(cfg, fmt="alpaca", shuffle=True, shuffle_seed=1)
+
+    assert [path.name for path in outputs] == ["train-00000-of-00001.jsonl"]
+    questions = [json.loads(line)["instruction"] for line in outputs[0].read_text(encoding="utf-8").splitlines()]
+    expected = [sample["question"] for sample in make_samples("a", 30) + make_samples("b", 30)]
+    assert sorted(questions) == sorted(expected)
+    assert questions != expected
+    assert not list(cfg.io.packaged_path.glob(".shuffle-*"))
@@ -0,0 +1,34 @@
+from synthkit.generation.packing import (
+    PACKING_INSTRUCTION,
+    PackedSource,
+    pack_sources,
+    packed_length,
+    render_packed_text,
+)
+
+
+def _source(idx: int, size: int) -> PackedSource:
+    return PackedSource(source_id=f"s{idx}", text="x" * size, meta={})
+
+
+def test_pack_sources_respects_budget_and_order():
+    sources = [_source(i, 100) for i in range(5)]
+    budget = len(PACKING_INSTRUCTION) + 2 * packed_length(sources[0])
+    groups = pack_sources(sources, budget)
+    assert [[s.source_id for s in group] for group in groups] == [
+        ["s0", "s1"],
+        ["s2", "s3"],
+        ["s4"],
+    ]
+
+
+def test_oversized_source_gets_its_own_group():
+    groups = pack_sources([_source(0, 10), _source(1, 1000)], budget=200)
+    assert [len(group) for group in groups] == [1, 1]
+
+
+def test_render_packed_text_labels_each_source():
+    text = render_packed_text([_source(0, 3), _source(1, 3)])
+    assert text.startswith(PACKING_INSTRUCTION)
+    assert "[source_id: s0]\nxxx" in text
+    assert "[source_id: s1]\nxxx" in text
@@ -0,0 +1,80 @@
+import pytest
+
+from synthkit.config import PrefilterSettings
+from synthkit.curation.prefilter import HeuristicPrefilter
+
+SOURCE = (
+    "The harvest stage normalizes PDF and text files into UTF-8 copies under the "
+    "working directory so later stages can chunk them."
+)
+
+
+def _check(sample, source=SOURCE, **settings):
+    return HeuristicPrefilter(PrefilterSettings(**{"enabled": True, **settings})).check(sample, source)
+
+
+def test_plausible_sample_passes():
+    sample = {
+        "question": "What does the harvest stage produce?",
+        "answer": "It writes normalized UTF-8 copies of PDF and text files into the working directory.",
+    }
+    assert _check(sample) is None
+
+
+@pytest.mark.parametrize(
+    "sample, rule",
+    [
+        ({"question": "Why?", "answer": "Because it does."}, "question_length"),
+        ({"question": "What does harvest do?", "answer": ""}, "answer_length"),
+        ({"question": "What does harvest do?", "answer": "It normalizes files and"}, "truncated"),
+        ({"question": "What does harvest do?", "answer": "It writes (UTF-8 copies"}, "truncated"),
+        (
+            {"question": "What does harvest do?", "answer": "As an AI language model, I refuse."},
+            "banned_phrase",
+        ),
+        (
+            {"question": "What does the harvest stage do?", "answer": "The harvest stage does do that."},
+            "restates_question",
+        ),
+        (
+            {"question": "What does harvest do?", "answer": "Она нормализует файлы в кодировку UTF-8."},
+            "language",
+        ),
+        (
+            {
+                "question": "What does harvest do?",
+                "answer": "It trains neural reward models using gradient boosting ensembles overnight.",
+            },
+            "source_overlap",
+        ),
+    ],
+)
+def test_rules_reject_implausible_samples(sample, rule):
+    assert _check(sample) == rule
+
+
+def test_code_answers_pass_the_language_check():
+    question = "How do I list a directory sorted by name?"
+    for answer in (
+        "sorted(os.listdir(path), key=lambda name: name.lower(), reverse=False)",
+        "```python\nfor entry in sorted(os.scandir(root)): print(entry.path)\n```",
+    ):
+        assert _check({"question": question, "answer": answer}, min_source_overlap=0.0) is None
+
+
+def test_prefilter_is_opt_in():
+    assert not PrefilterSettings().enabled
+
+
+def test_rejections_are_counted_per_rule():
+    prefilter = HeuristicPrefilter(PrefilterSettings(language=None))
+    prefilter.check({"question": "Why?", "answer": "ok"})
+    prefilter.check({"question": "Why?", "answer": "ok"})
+    prefilter.check({"question": "What is it about?", "answer": ""})
+    assert prefilter.rejections == {"question_length": 2, "answer_length": 1}
+    assert prefilter.checked == 3
+
+
+def test_unknown_language_is_rejected():
+    with pytest.raises(ValueError):
+        HeuristicPrefilter(PrefilterSettings(language="xx"))
@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from synthkit.models.client_base import ChatClientError
+from synthkit.pipeline.harvest import run_harvest
+from synthkit.pipeline.mint import run_mint
+from synthkit.progress import StageProgress, TrackedClient, track_stage
+
+
+def _events(cfg, stage):
+    lines = cfg.io.progress_path.read_text(encoding="utf-8").splitlines()
+    return [event for event in map(json.loads, lines) if event["stage"] == stage]
+
+
+def test_stages_append_progress_snapshots(make_cfg, install_client, write_inputs, pipeline_client):
+    cfg = make_cfg()
+    cfg.pipeline.progress_bars = False
+    install_client(pipeline_client())
+    write_inputs(cfg, 3)
+
+    run_harvest(cfg)
+    run_mint(cfg, "qa")
+
+    events = _events(cfg, "mint")
+    assert events[0]["event"] == "start"
+    assert events[0]["total"] == 3
+    final = events[-1]
+    assert final["event"] == "finish"
+    assert final["done"] == 3
+    # One summary and one generation request per single-chunk document.
+    assert final["requests"] == 6
+    assert final["in_flight"] == 0
+    assert final["request_seconds"] >= 0
+    assert final["counters"] == {"chunks": 3, "items": 3, "duplicates": 0}
+    assert _events(cfg, "harvest")[-1]["done"] == 3
+
+
+def test_items_past_doc_budget_are_not_counted_or_indexed_as_duplicates(
+    make_cfg, install_client, write_docs, scripted_client
+):
+    cfg = make_cfg(dedup_scope="run", max_pairs_per_doc=1)
+    cfg.pipeline.progress_bars = False
+    install_client(scripted_client(["Q1?", "Q2?"]))
+    write_docs(cfg, {"one.txt": "alpha", "two.txt": "beta"})
+
+    outputs = run_mint(cfg, "qa")
+
+    # Q2 is cut from the first document by the budget, so it is still new for the second.
+    questions = [json.loads(path.read_text(encoding="utf-8"))[0]["question"] for path in outputs]
+    assert questions == ["Q1?", "Q2?"]
+    final = _events(cfg, "mint")[-1]
+    assert final["counters"] == {"chunks": 2, "items": 2, "duplicates": 1, "over_budget": 1}
+
+
+def test_tracked_client_counts_failures_and_keeps_optional_methods(make_cfg):
+    class Flaky:
+        def chat(self, messages, temperature, max_tokens):
+            raise ChatClientError("http", "dummy", "down")
+
+    cfg = make_cfg()
+    cfg.pipeline.progress_bars = False
+    client = TrackedClient(Flaky())
+    assert getattr(client, "chat_logprobs", None) is None
+
+    with track_stage(cfg, "audit", total=1) as progress:
+        with pytest.raises(ChatClientError):
+            client.chat([], temperature=0.0, max_tokens=1)
+    assert (progress.requests, progress.request_errors, progress.in_flight) == (1, 1, 0)
+
+
+def test_rate_and_eta_use_rolling_window():
+    progress = StageProgress("mint", total=10, bar=False, window=10.0)
+    progress.started -= 5.0
+    progress.advance(5)
+    now = progress.started + 5.0
+    assert progress.rate(now) == pytest.approx(1.0)
+    assert progress.eta(now) == pytest.approx(5.0)
+    # Events older than the window no longer count.
+    assert progress.rate(now + 20.0) == 0.0
+    assert progress.eta(now + 20.0) is None
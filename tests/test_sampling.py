@@ -0,0 +1,43 @@
+from collections import Counter
+
+import pytest
+
+from synthkit.io.chunking import chunk_spans, chunk_text
+from synthkit.io.sampling import position_bucket, sample_size, stratified_sample
+
+
+def test_chunk_spans_match_chunk_text():
+    text = "abcdefghij" * 25
+    spans = chunk_spans(len(text), chunk_size=60, overlap=10)
+    assert [text[start:end] for start, end in spans] == chunk_text(text, 60, 10)
+
+
+def test_sample_size_resolution():
+    assert sample_size(1000, 0.02, None) == 20
+    assert sample_size(10, 0.01, None) == 1
+    assert sample_size(10, None, 50) == 10
+    assert sample_size(10, None, None) == 10
+    with pytest.raises(ValueError):
+        sample_size(10, 0.5, 2)
+    with pytest.raises(ValueError):
+        sample_size(10, 1.5, None)
+
+
+def test_position_bucket_spans_document():
+    assert [position_bucket(i, 9) for i in range(9)] == [0, 0, 0, 1, 1, 1, 2, 2, 2]
+    assert position_bucket(0, 1) == 0
+
+
+def test_stratified_sample_is_seeded_and_proportional():
+    units = [(doc, idx) for doc in ("a", "b", "c", "d") for idx in range(30)]
+
+    def stratum(unit):
+        return unit[0], position_bucket(unit[1], 30)
+
+    first = stratified_sample(units, 12, stratum, seed=7)
+    assert first == stratified_sample(units, 12, stratum, seed=7)
+    assert len(first) == 12
+    counts = Counter(stratum(unit) for unit in first)
+    # 12 picks over 12 equal strata -> one from each.
+    assert len(counts) == 12
+    assert first == sorted(first, key=units.index)
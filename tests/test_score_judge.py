@@ -0,0 +1,103 @@
+import math
+
+import pytest
+
+from synthkit.curation.llm_judge import LLMJudge, ScoreOnlyJudge, create_judge
+from synthkit.curation.verdict_cache import VerdictCache
+
+
+SAMPLE = {"question": "What is A?", "answer": "A is the first letter."}
+
+
+class LogprobClient:
+    def __init__(self, distribution):
+        self.distribution = distribution
+        self.requests = []
+
+    def chat_logprobs(self, messages, temperature, max_tokens, top_logprobs=10):
+        self.requests.append(max_tokens)
+        top = {token: math.log(p) for token, p in self.distribution.items()}
+        return max(self.distribution, key=self.distribution.get), [top]
+
+    def chat(self, messages, temperature, max_tokens):
+        self.requests.append(max_tokens)
+        return '{"score": 2, "reason": "too vague"}'
+
+
+class TextClient:
+    def __init__(self, reply):
+        self.reply = reply
+        self.requests = []
+
+    def chat(self, messages, temperature, max_tokens):
+        self.requests.append(max_tokens)
+        return self.reply
+
+
+def _cfg(make_cfg, **curation):
+    cfg = make_cfg()
+    cfg.curation.judge_mode = "score"
+    for key, value in curation.items():
+        setattr(cfg.curation, key, value)
+    return cfg
+
+
+def test_logprobs_produce_expected_score(make_cfg):
+    client = LogprobClient({"8": 0.5, "6": 0.5, "hello": 0.2})
+    judged = ScoreOnlyJudge(client, _cfg(make_cfg)).judge(SAMPLE)
+    assert judged.score == pytest.approx(8.0)  # expected digit 7 -> score 8
+    assert judged.keep
+    assert client.requests == [1]
+
+
+def test_strict_parser_without_logprobs(make_cfg):
+    client = TextClient(" 4 ")
+    judged = ScoreOnlyJudge(client, _cfg(make_cfg, score_max_tokens=2)).judge(SAMPLE)
+    assert judged.score == 5.0
+    assert not judged.keep
+    assert client.requests == [2]
+
+    bad = ScoreOnlyJudge(TextClient("eight"), _cfg(make_cfg)).judge(SAMPLE)
+    assert bad.label == "parse_error"
+    assert not bad.keep
+
+
+def test_rationale_requested_only_for_rejects(make_cfg):
+    cfg = _cfg(make_cfg, rationale_for_rejects=True)
+    client = LogprobClient({"1": 1.0})
+    judged = ScoreOnlyJudge(client, cfg).judge(SAMPLE)
+    assert not judged.keep
+    assert judged.rationale == "too vague"
+    assert client.requests == [1, cfg.curation.max_tokens]
+
+
+def test_create_judge_selects_mode(make_cfg):
+    cfg = make_cfg()
+    assert type(create_judge(None, cfg)) is LLMJudge
+    cfg.curation.judge_mode = "score"
+    assert isinstance(create_judge(None, cfg), ScoreOnlyJudge)
+    cfg.curation.judge_mode = "verbose"
+    with pytest.raises(ValueError):
+        create_judge(None, cfg)
+
+
+def test_cached_scores_are_relabelled_for_the_current_threshold(tmp_path, make_cfg):
+    cfg = _cfg(make_cfg, rationale_for_rejects=True, min_score=4.0)
+    cache = VerdictCache(tmp_path / "verdicts.sqlite")
+    client = LogprobClient({"4": 1.0})
+    judge = ScoreOnlyJudge(client, cfg, cache=cache, model_id="default:dummy")
+
+    kept = judge.judge(SAMPLE)
+    assert (kept.keep, kept.label, kept.rationale) == (True, "ok", "")
+    assert client.requests == [1]
+
+    cfg.curation.min_score = 7.0
+    rejected = judge.judge(SAMPLE)
+    assert (rejected.keep, rejected.label, rejected.rationale) == (False, "bad", "too vague")
+    assert client.requests == [1, cfg.curation.max_tokens]
+    assert judge.judge(SAMPLE).rationale == "too vague"
+    assert len(client.requests) == 2
+
+    cfg.curation.min_score = 4.0
+    assert judge.cached_verdict(SAMPLE).label == "ok"
+    cache.close()
@@ -0,0 +1,107 @@
+import json
+from pathlib import Path
+
+import pytest
+import yaml
+
+from synthkit.config import load_config
+from synthkit.pipeline.audit import run_audit
+from synthkit.pipeline.harvest import run_harvest
+from synthkit.pipeline.mint import run_mint
+from synthkit.pipeline.package import run_package
+from synthkit.pipeline.run_all import run_pipeline
+from synthkit.pipeline.store import ArtifactStore, export_store
+from synthkit.pipeline.streaming import run_streaming_pipeline
+
+
+def _store_cfg(make_cfg):
+    cfg = make_cfg()
+    cfg.io.artifact_store_file = "artifacts.sqlite"
+    cfg.pipeline.progress_bars = False
+    return cfg
+
+
+def _instructions(outputs):
+    return sorted(
+        json.loads(line)["instruction"]
+        for path in outputs
+        for line in path.read_text(encoding="utf-8").splitlines()
+    )
+
+
+def test_stages_keep_artifacts_in_store(install_client, write_inputs, pipeline_client, make_cfg):
+    cfg = _store_cfg(make_cfg)
+    install_client(pipeline_client())
+    write_inputs(cfg, 3)
+
+    run_harvest(cfg)
+    minted = run_mint(cfg, "qa")
+    audited = run_audit(cfg)
+    outputs = run_package(cfg)
+
+    assert [path.name for path in minted] == [f"doc{i}.txt.qa.json" for i in range(3)]
+    assert len(audited) == 3
+    for path in [*minted, *audited]:
+        assert not path.exists()
+    assert _instructions(outputs) == [f"What is in document {i}?" for i in range(3)]
+    store = ArtifactStore(cfg.io.artifact_store_path)
+    assert store.status_counts() == {"kept": 3}
+    store.close()
+
+    counts = export_store(cfg)
+
+    assert counts == {"harvested": 3, "minted": 3, "audited": 3}
+    curated = json.loads(audited[0].read_text(encoding="utf-8"))
+    assert curated[0]["score"] == 9
+    assert curated[0]["meta"]["chunk_index"] == 0
+
+
+def test_store_is_enabled_from_project_file(tmp_path):
+    example = Path(__file__).parents[1] / "config" / "project.example.yaml"
+    data = yaml.safe_load(example.read_text(encoding="utf-8"))
+    data["io"]["working_root"] = str(tmp_path)
+    path = tmp_path / "project.yaml"
+    path.write_text(yaml.safe_dump(data), encoding="utf-8")
+    assert load_config(path).io.artifact_store_path is None
+
+    data["io"]["artifact_store_file"] = "artifacts.sqlite"
+    path.write_text(yaml.safe_dump(data), encoding="utf-8")
+
+    assert load_config(path).io.artifact_store_path == tmp_path / "artifacts.sqlite"
+
+
+def test_reminting_clears_audit_decisions(tmp_path):
+    store = ArtifactStore(tmp_path / "artifacts.sqlite")
+    items = [{"question": "A?", "meta": {"chunk_index": 2}}, {"question": "B?"}]
+    store.put_items("doc.txt.qa.json", items)
+    store.record_audit(
+        "doc.txt.qa.json", [(0, "kept", {"score": 8.0, "label": "good"}), (1, "rejected", {})]
+    )
+
+    assert store.audited() == ["doc.txt.qa.audited.json"]
+    assert store.curated("doc.txt.qa.audited.json") == [
+        items[0] | {"score": 8.0, "label": "good", "judge_rationale": None}
+    ]
+
+    store.put_items("doc.txt.qa.json", items[:1])
+
+    assert not store.is_audited("doc.txt.qa.json")
+    assert store.status_counts() == {"pending": 1}
+    store.close()
+
+
+def test_streaming_pipeline_uses_store(install_client, write_inputs, pipeline_client, make_cfg):
+    cfg = _store_cfg(make_cfg)
+    install_client(pipeline_client())
+    write_inputs(cfg, 4)
+
+    result = run_streaming_pipeline(cfg, "qa", "alpaca", queue_size=2)
+
+    assert _instructions(result.outputs) == [f"What is in document {i}?" for i in range(4)]
+    assert not list(cfg.io.minted_path.glob("*.json"))
+
+
+def test_incremental_runs_need_directory_layout(make_cfg):
+    cfg = _store_cfg(make_cfg)
+    with pytest.raises(ValueError, match="artifact_store_file"):
+        run_pipeline(cfg, incremental=True)
@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+from synthkit.models.client_base import ChatClientError
+from synthkit.pipeline.streaming import run_streaming_pipeline
+
+
+def test_streaming_pipeline_overlaps_stages(make_cfg, install_client, write_inputs, pipeline_client):
+    cfg = make_cfg()
+    install_client(pipeline_client())
+    write_inputs(cfg, 6)
+
+    result = run_streaming_pipeline(cfg, "qa", "alpaca", queue_size=2)
+
+    assert len(result.outputs) == 6
+    records = [json.loads(path.read_text(encoding="utf-8")) for path in result.outputs]
+    assert sorted(record["instruction"] for record in records) == [
+        f"What is in document {i}?" for i in range(6)
+    ]
+    timings = result.timings
+    assert [timings[name].items for name in ("harvest", "mint", "audit", "package")] == [6, 6, 6, 6]
+    # The judge started on the first document while later ones were still minted.
+    assert timings["audit"].first_item < timings["mint"].finished
+
+
+def test_streaming_pipeline_stops_all_stages_on_failure(
+    make_cfg, install_client, write_inputs, pipeline_client
+):
+    cfg = make_cfg()
+    install_client(pipeline_client(fail_judge=True))
+    write_inputs(cfg, 20)
+
+    with pytest.raises(ChatClientError):
+        run_streaming_pipeline(cfg, "qa", "alpaca", queue_size=1)
+    assert not list(cfg.io.packaged_path.glob("*.jsonl"))
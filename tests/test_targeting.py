@@ -0,0 +1,38 @@
+import pytest
+
+from synthkit.generation.targeting import AcceptanceTargeter
+
+
+def test_probe_requests_full_batches_until_judged():
+    targeter = AcceptanceTargeter(target=10, max_items_per_request=8, probe_size=4)
+    assert targeter.probe_pending == 4
+    assert targeter.items_for_request(budget=100) == 8
+    assert not targeter.done
+
+
+def test_request_size_shrinks_to_remaining_need():
+    targeter = AcceptanceTargeter(target=10, max_items_per_request=8, probe_size=4, prior_weight=0)
+    targeter.record_minted(16)
+    targeter.record_judged(accepted=2, total=4)  # 50% acceptance -> 8 expected
+    assert targeter.acceptance_rate == pytest.approx(0.5)
+    assert targeter.needed_raw() == 4
+    assert targeter.items_for_request(budget=100) == 4
+    assert targeter.items_for_request(budget=3) == 3
+
+    targeter.record_minted(4)
+    assert targeter.done
+
+
+def test_probe_falls_back_to_prior_after_repeated_failures():
+    targeter = AcceptanceTargeter(target=4, probe_size=4, prior=0.5, max_probe_failures=2)
+    targeter.record_probe_failure()
+    assert targeter.probe_pending == 4
+    targeter.record_probe_failure()
+    assert targeter.probe_abandoned and targeter.probe_pending == 0
+    targeter.record_minted(8)
+    assert targeter.done
+
+
+def test_rejects_invalid_target():
+    with pytest.raises(ValueError):
+        AcceptanceTargeter(target=0)
@@ -0,0 +1,61 @@
+import json
+
+from synthkit.export.validation import PackageValidator, Reservoir, cochran_sample_size
+from synthkit.pipeline.package import run_package
+
+
+class ReviewClient:
+    def __init__(self):
+        self.calls = 0
+
+    def chat(self, messages, temperature, max_tokens):
+        self.calls += 1
+        record = json.loads(messages[-1].content.split("Record:\n", 1)[1].split("\n\nCheck", 1)[0])
+        passed = not record["instruction"].startswith("b")
+        return json.dumps({"pass": passed, "reason": "ok" if passed else "off topic"})
+
+    def close(self):
+        pass
+
+
+def test_cochran_sample_size_applies_finite_population_correction():
+    assert cochran_sample_size() == 385
+    assert cochran_sample_size(1_000_000) == 384
+    assert cochran_sample_size(1000) == 278
+    assert cochran_sample_size(50) == 45
+    assert cochran_sample_size(0) == 0
+
+
+def test_reservoir_keeps_uniform_fixed_size_sample():
+    reservoir = Reservoir(10, seed=1)
+    for i in range(1000):
+        reservoir.add({"i": i})
+    assert reservoir.seen == 1000
+    assert len(reservoir.items) == 10
+    assert max(item["i"] for item in reservoir.items) > 100
+
+
+def test_validator_reports_schema_failures():
+    validator = PackageValidator("chatml")
+    validator.observe({"messages": [{"role": "user", "content": "q"}, {"role": "assistant", "content": "a"}]})
+    validator.observe({"messages": [{"role": "user", "content": "q"}]})
+    report = validator.report()
+    assert report["schema"]["failures"] == 1
+    assert report["schema"]["problems"] == {"last message must come from the assistant": 1}
+
+
+def test_package_full_validation_spot_checks_a_sample(make_cfg, install_client, write_audited, make_samples):
+    cfg = make_cfg()
+    client = ReviewClient()
+    install_client(client)
+    write_audited(cfg, {"a.qa": make_samples("a", 300), "b.qa": make_samples("b", 300)})
+
+    run_package(cfg, fmt="alpaca", validation="full")
+
+    report = json.loads((cfg.io.packaged_path / "validation_report.json").read_text(encoding="utf-8"))
+    spot = report["spot_check"]
+    assert report["records"] == 600
+    assert report["schema"]["failures"] == 0
+    assert spot["sample_size"] == client.calls == cochran_sample_size(600)
+    assert abs(spot["pass_rate"] - 0.5) < 0.1
+    assert spot["margin_of_error"] < 0.05
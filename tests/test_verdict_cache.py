@@ -0,0 +1,53 @@
+import json
+
+from synthkit.curation.llm_judge import LLMJudge
+from synthkit.curation.verdict_cache import Verdict, VerdictCache, verdict_key
+
+
+class CountingJudgeClient:
+    def __init__(self, score):
+        self.score = score
+        self.calls = 0
+
+    def chat(self, messages, temperature, max_tokens):
+        self.calls += 1
+        return json.dumps({"score": self.score, "label": "ok", "reason": "fine"})
+
+
+def test_verdict_key_ignores_bookkeeping_fields():
+    sample = {"question": "Q?", "answer": "A."}
+    annotated = sample | {"meta": {"chunk_index": 3}, "score": 9.0}
+    assert verdict_key(sample, "tmpl", "m") == verdict_key(annotated, "tmpl", "m")
+    assert verdict_key(sample, "tmpl", "m") != verdict_key(sample, "tmpl2", "m")
+    assert verdict_key(sample, "tmpl", "m") != verdict_key(sample, "tmpl", "other")
+
+
+def test_cache_round_trip_persists(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    cache = VerdictCache(path)
+    cache.put("k", Verdict(score=6.5, label="ok", rationale="meh"), "m")
+    cache.close()
+
+    reopened = VerdictCache(path)
+    assert reopened.get("k") == Verdict(score=6.5, label="ok", rationale="meh")
+    assert reopened.get("missing") is None
+    assert (reopened.hits, reopened.misses) == (1, 1)
+    reopened.close()
+
+
+def test_judge_reuses_cached_verdicts_and_rethresholds(tmp_path, make_cfg):
+    cfg = make_cfg()
+    cache = VerdictCache(tmp_path / "cache.sqlite")
+    client = CountingJudgeClient(score=6.0)
+    judge = LLMJudge(client, cfg, cache=cache, model_id="default:dummy")
+    sample = {"question": "What is A?", "answer": "A is a letter."}
+
+    assert not judge.judge(sample).keep
+    assert client.calls == 1
+
+    cfg.curation.min_score = 5.0
+    again = judge.judge(sample | {"meta": {"chunk_index": 1}})
+    assert again.keep
+    assert again.score == 6.0
+    assert client.calls == 1
+    cache.close()
@@ -0,0 +1,67 @@
+import threading
+import time
+
+from synthkit.pipeline.harvest import run_harvest
+from synthkit.pipeline.worker import run_worker
+from synthkit.pipeline.workqueue import WorkQueue
+
+
+def test_expired_lease_is_reclaimed_and_attempts_are_capped(tmp_path):
+    path = tmp_path / "queue.sqlite"
+    first = WorkQueue(path, "a", lease_seconds=0.05, max_attempts=2)
+    second = WorkQueue(path, "b", lease_seconds=0.05, max_attempts=2)
+    assert first.enqueue("mint", ["x", "y"]) == 2
+    assert second.enqueue("mint", ["x", "y"]) == 0
+
+    assert first.claim("mint") == "x"
+    assert second.claim("mint") == "y"
+    assert second.claim("mint") is None
+    assert second.complete("mint", "y")
+
+    time.sleep(0.1)
+    # Worker "a" stalled: its lease on "x" expired and "b" takes over.
+    assert second.claim("mint") == "x"
+    assert not first.complete("mint", "x")
+    second.fail("mint", "x", "boom")
+    assert second.counts("mint") == {"pending": 0, "leased": 0, "done": 1, "failed": 1}
+    assert second.failures("mint") == [{"item": "x", "error": "boom"}]
+    first.close()
+    second.close()
+
+
+def test_concurrent_workers_mint_each_document_once(make_cfg, install_client, write_inputs, pipeline_client):
+    cfg = make_cfg()
+    client = pipeline_client()
+    generated = []
+    original_chat = client.chat
+
+    def chat(messages, temperature, max_tokens):
+        if messages[-1].content.startswith("summary\n"):
+            with client.lock:
+                generated.append(messages[-1].content.split("\n")[1])
+        return original_chat(messages, temperature, max_tokens)
+
+    client.chat = chat
+    install_client(client)
+    write_inputs(cfg, 8)
+    run_harvest(cfg)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda name=name: results.append(run_worker(cfg, "mint", worker_id=name)))
+        for name in ("w1", "w2")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(generated) == [f"document {i}" for i in range(8)]
+    assert sum(result.completed for result in results) == 8
+    assert len(list(cfg.io.minted_path.glob("*.qa.json"))) == 8
+
+    audit = run_worker(cfg, "audit", worker_id="host/1")
+    assert audit.completed == 8
+    assert audit.queue["done"] == 8
+    assert len(list(cfg.io.audited_path.glob("*.audited.json"))) == 8
+    assert (cfg.io.audited_path / "audit_report.host-1.json").exists()